@@ -0,0 +1,366 @@
+"""Benchmarks for the Weller protocol hot paths and the web request path.
+
+Usage:
+    python benchmark.py                    # run and compare with the stored baseline
+    python benchmark.py --save-baseline    # run and store the results as the new baseline
+    python benchmark.py --quick            # shorter runs, e.g. for a pre-deploy check
+    python benchmark.py --emulator         # also drive a real WellerStation over the pty emulator
+
+Exits with status 1 if any benchmark is slower than the baseline by more
+than --threshold (default 20%).
+"""
+import argparse
+import http.client
+import json
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+from unittest import mock
+
+import serial
+from werkzeug.serving import make_server
+
+import weller
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+
+# Responses of a healthy station, keyed by the query command
+SIMULATED_RESPONSES = {
+    b'R': weller.WellerResponse.build_frame('R', '2500', '2000'),
+    b'S': weller.WellerResponse.build_frame('S', '2500', '2000'),
+    b'T': weller.WellerResponse.build_frame('T', '2000', '2000'),
+    b'U': weller.WellerResponse.build_frame('U', '3000', '3000'),
+    b'Q': weller.WellerResponse.build_frame('Q', '1200'),
+    b'Y': weller.WellerResponse.build_frame('Y', '1000', '3000'),
+    b'V': weller.WellerResponse.build_frame('V', '0064'),
+    b'?': weller.WellerResponse.build_frame('?', '2000'),
+    b'remote1': weller.WellerResponse.build_frame('?', '2000'),
+    b'remote2': weller.WellerResponse.build_frame('?', '2000'),
+}
+
+
+class SimulatedSerial:
+    """In-memory stand-in for serial.Serial that answers queries instantly"""
+    def __init__(self, *args, **kwargs):
+        self.port = kwargs.get('port')
+        self.timeout = kwargs.get('timeout')
+        self.is_open = True
+        self._pending = b''
+        self._lock = threading.Lock()
+
+    def write(self, data):
+        data = bytes(data)
+        response = SIMULATED_RESPONSES.get(data)
+        if response is None and all(data[i:i + 1] in SIMULATED_RESPONSES for i in range(len(data))):
+            # A pipelined burst of single-byte queries
+            response = b''.join(SIMULATED_RESPONSES[data[i:i + 1]] for i in range(len(data)))
+        with self._lock:
+            if response:
+                self._pending += response
+        return len(data)
+
+    def read(self, size=1):
+        with self._lock:
+            data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+    def readline(self):
+        with self._lock:
+            data, self._pending = self._pending, b''
+        return data
+
+    @property
+    def in_waiting(self):
+        return len(self._pending)
+
+    def reset_input_buffer(self):
+        with self._lock:
+            self._pending = b''
+
+    def close(self):
+        self.is_open = False
+
+
+def open_simulated_station(**kwargs):
+    """Create a real WellerStation talking to a SimulatedSerial port"""
+    with mock.patch.object(serial, 'Serial', SimulatedSerial):
+        return weller.WellerStation(port='SIMULATED', **kwargs)
+
+
+def time_callable(func, min_time=0.2, repeat=5):
+    """Return per-call timings (seconds) of func, one per repeat"""
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time / 10:
+            break
+        loops *= 10
+    loops = max(1, int(loops * (min_time / max(elapsed, 1e-9))))
+
+    results = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        results.append((time.perf_counter() - started) / loops)
+    return results
+
+
+def micro_result(func, min_time):
+    timings = time_callable(func, min_time=min_time)
+    best = min(timings)
+    return {'unit': 'us/op', 'value': best * 1e6, 'ops_per_sec': 1.0 / best}
+
+
+def bench_protocol(station, min_time):
+    """Encode/decode primitives"""
+    command = weller.WellerCommand.build_temp_command('s', 1, 250)
+    temperature = SIMULATED_RESPONSES[b'R'].decode('latin-1')
+    status = SIMULATED_RESPONSES[b'Q'].decode('latin-1')
+    temperature_frame = SIMULATED_RESPONSES[b'R']
+    status_frame = SIMULATED_RESPONSES[b'Q']
+    return {
+        'protocol.calculate_checksum': micro_result(lambda: station.calculate_checksum(command), min_time),
+        'protocol.temp_frame': micro_result(lambda: weller.WellerCommand.temp_frame(b's', 1, 250), min_time),
+        'protocol.verify_checksum': micro_result(lambda: station.verify_checksum(temperature), min_time),
+        'protocol.parse_temperature_response':
+            micro_result(lambda: weller.WellerResponse.parse_temperature_response(temperature), min_time),
+        'protocol.parse_response.R1': micro_result(lambda: weller.ResponseParser.parse_response(temperature, 'R1'), min_time),
+        'protocol.parse_response.Q1': micro_result(lambda: weller.ResponseParser.parse_response(status, 'Q1'), min_time),
+        # The bytes decoder replaces decode('latin-1') + verify_checksum + parse on the read path
+        'protocol.str_path.R': micro_result(
+            lambda: weller.WellerResponse.parse_temperature_response(
+                station.verify_checksum(temperature_frame.decode('latin-1')) and temperature_frame.decode('latin-1')
+            ), min_time
+        ),
+        'protocol.decode_fields.R': micro_result(lambda: weller.WellerResponse.decode_fields(temperature_frame), min_time),
+        'protocol.decode_channel_pair.R':
+            micro_result(lambda: weller.WellerResponse.decode_channel_pair(temperature_frame), min_time),
+        'protocol.decode_status.Q': micro_result(lambda: weller.WellerResponse.decode_status(status_frame), min_time),
+    }
+
+
+def bench_statistics(station, sizes, min_time):
+    """get_temperature_statistics at various history sizes"""
+    results = {}
+    original = station.temperature_history['channel1']
+    try:
+        for size in sizes:
+            history = weller.TemperatureRingBuffer(size)
+            now_ms = weller.to_epoch_ms(weller.datetime.now())
+            for i in range(size):
+                history.append(now_ms - (size - i) * 100, 2500 + (i % 50))
+            station.temperature_history['channel1'] = history
+            results[f'statistics.size_{size}'] = micro_result(
+                lambda: station.get_temperature_statistics('channel1'), min_time
+            )
+    finally:
+        station.temperature_history['channel1'] = original
+    return results
+
+
+def bench_history_formats(size, min_time):
+    """Size and client-side decode cost of one channel's history in each wire format"""
+    now_ms = weller.to_epoch_ms(weller.datetime.now())
+    timestamps = [now_ms - (size - i) * 250 for i in range(size)]
+    values = [2500 + (i % 50) for i in range(size)]
+    payloads = {'json': json.dumps({
+        'success': True,
+        'temperatures': [weller.TemperatureConverter.from_internal(value) for value in values],
+        'timestamps': [weller.from_epoch_ms(timestamp_ms).isoformat() for timestamp_ms in timestamps],
+        'cursor': size
+    }, separators=(',', ':')).encode('utf-8')}
+    for fmt in weller.COLUMNAR_FORMATS:
+        if fmt != 'msgpack' or weller.msgpack is not None:
+            payloads[fmt] = weller.encode_history(fmt, timestamps, values, size)
+
+    def decode_json(data):
+        # What a consumer does with the JSON form: parse it and turn the timestamps back into numbers
+        payload = json.loads(data)
+        return [weller.datetime.fromisoformat(t) for t in payload['timestamps']], payload['temperatures']
+
+    results = {}
+    for fmt, data in payloads.items():
+        decode = decode_json if fmt == 'json' else weller.decode_history
+        results[f'history_format.{fmt}.bytes'] = {'unit': 'B', 'value': float(len(data))}
+        results[f'history_format.{fmt}.decode'] = micro_result(lambda: decode(data), min_time)
+    return results
+
+
+def run_clients(port, path, clients, duration):
+    """Hammer path from N keep-alive clients; return latencies and request count"""
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client():
+        local = []
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+        try:
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                connection.request('GET', path)
+                response = connection.getresponse()
+                response.read()
+                local.append(time.perf_counter() - started)
+                if response.status != 200:
+                    errors.append(response.status)
+        except Exception as e:
+            errors.append(str(e))
+        finally:
+            connection.close()
+            with lock:
+                latencies.extend(local)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors
+
+
+def bench_http(name, station, client_counts, duration, server='waitress'):
+    """End-to-end /api/status latency and throughput under concurrent clients"""
+    app = station.create_web_app()
+    web_config = weller.WebConfig(port=0, host='127.0.0.1', server=server)
+    if server == 'development':
+        # app.run cannot report its port or be stopped; use the same werkzeug server directly
+        web_server = make_server('127.0.0.1', 0, app, threaded=True)
+        threading.Thread(target=web_server.serve_forever, daemon=True).start()
+        port = web_server.server_port
+    else:
+        web_server = weller.WebServer(app, web_config).start()
+        port = web_server.port
+    results = {}
+    try:
+        for clients in client_counts:
+            latencies, errors = run_clients(port, '/api/status', clients, duration)
+            if not latencies:
+                raise RuntimeError(f"No successful requests for {name} with {clients} clients: {errors[:3]}")
+            latencies.sort()
+            results[f'http.{name}.clients_{clients}.p50'] = {
+                'unit': 'ms', 'value': statistics.median(latencies) * 1000
+            }
+            results[f'http.{name}.clients_{clients}.p99'] = {
+                'unit': 'ms', 'value': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+            }
+            results[f'http.{name}.clients_{clients}.throughput'] = {
+                'unit': 'req/s', 'value': len(latencies) / duration, 'higher_is_better': True,
+                'errors': len(errors)
+            }
+    finally:
+        web_server.shutdown() if server == 'development' else web_server.stop()
+    return results
+
+
+def bench_emulator(client_counts, duration, iterations, baudrate):
+    """Real WellerStation against the byte-level pty emulator at line speed"""
+    import emulator
+
+    results = {}
+    with emulator.StationEmulator(baudrate=baudrate) as emulated:
+        station = weller.WellerStation(port=emulated.port)
+        try:
+            timings = []
+            for _ in range(iterations):
+                started = time.perf_counter()
+                station.read_all_status()
+                timings.append(time.perf_counter() - started)
+            results['emulator.read_all_status'] = {'unit': 'ms', 'value': statistics.median(timings) * 1000}
+            station.start_poller()
+            time.sleep(0.5)
+            results.update(bench_http('emulated', station, client_counts, duration))
+        finally:
+            if station.poller:
+                station.poller.stop()
+            station.close()
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print a report; return the names of regressed benchmarks"""
+    regressions = []
+    print(f"\n{'benchmark':<52} {'value':>12} {'unit':<6} {'baseline':>12} {'change':>8}")
+    print('-' * 96)
+    for name, result in results.items():
+        value = result['value']
+        line = f"{name:<52} {value:>12.3f} {result['unit']:<6}"
+        previous = baseline.get(name)
+        if previous:
+            base = previous['value']
+            change = (value - base) / base if base else 0.0
+            worse = -change if result.get('higher_is_better') else change
+            flag = '  REGRESSION' if worse > threshold else ''
+            if flag:
+                regressions.append(name)
+            line += f" {base:>12.3f} {change:>+7.1%}{flag}"
+        print(line)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline JSON file')
+    parser.add_argument('--save-baseline', action='store_true', help='Store results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Allowed slowdown before failing (0.2 = 20%%)')
+    parser.add_argument('--clients', default='1,4,16', help='Comma-separated concurrent client counts')
+    parser.add_argument('--duration', type=float, default=2.0, help='Seconds per HTTP load run')
+    parser.add_argument('--quick', action='store_true', help='Shorter runs')
+    parser.add_argument('--emulator', action='store_true', help='Include end-to-end runs over the pty emulator')
+    parser.add_argument('--baud', type=int, default=1200, help='Emulator baud rate')
+    args = parser.parse_args(argv)
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    min_time = 0.05 if args.quick else 0.2
+    duration = 0.5 if args.quick else args.duration
+    client_counts = [int(c) for c in args.clients.split(',')]
+    sizes = [100, 1000, 10000] if args.quick else [100, 1000, 10000, 100000, 288000]
+
+    demo = weller.DemoWellerStation()
+    simulated = open_simulated_station()
+    simulated.start_poller()
+    time.sleep(0.5)  # Let both pollers publish a first snapshot
+
+    results = {}
+    results.update(bench_protocol(simulated, min_time))
+    results.update(bench_statistics(demo, sizes, min_time))
+    results.update(bench_history_formats(1000, min_time))
+    results.update(bench_http('demo', demo, client_counts, duration))
+    results.update(bench_http('simulated', simulated, client_counts, duration))
+    results.update(bench_http('simulated_dev_server', simulated, client_counts, duration, server='development'))
+    if args.emulator:
+        results.update(bench_emulator(client_counts, duration, 3 if args.quick else 10, args.baud))
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f).get('results', {})
+
+    regressions = compare(results, baseline, args.threshold)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({
+                'created': weller.datetime.now().isoformat(),
+                'python': sys.version.split()[0],
+                'results': results
+            }, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+    elif regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    elif not baseline:
+        print("\nNo baseline found; run with --save-baseline to create one")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,286 @@
+"""Byte-level Weller WX station emulator on a pseudo-terminal (Linux/macOS).
+
+The emulator speaks the real serial protocol, including checksums, so an
+unmodified WellerStation can be driven end to end without hardware:
+
+    python emulator.py --baud 1200 --noise 0.01
+    # then connect WellerStation(port=<printed pty path>)
+
+It paces replies to the configured baud rate, can inject line noise,
+checksum errors and dropped replies, and simulates heating and cooling
+of both channels.
+"""
+import argparse
+import os
+import random
+import select
+import threading
+import time
+import tty
+
+from weller import StationStatus, ToolType, WellerResponse
+
+QUERY_COMMANDS = b'RSTUQYV?'
+SET_COMMANDS = b'stuxq'
+BITS_PER_BYTE = 10  # Start bit, 8 data bits, stop bit
+
+
+class ChannelModel:
+    """First-order thermal model of one channel"""
+    def __init__(self, set_temp, status, tool, ambient=25.0, standby_temp=150.0, time_constant=8.0):
+        self.set_temp = set_temp
+        self.status = status
+        self.tool = tool
+        self.ambient = ambient
+        self.standby_temp = standby_temp
+        self.time_constant = time_constant
+        self.temperature = ambient
+        self.preset1 = 200.0
+        self.preset2 = 300.0
+        self.fingerswitch_until = 0.0
+
+    def effective_status(self, now):
+        if now < self.fingerswitch_until:
+            return StationStatus.ON
+        return self.status
+
+    def step(self, dt, now, noise):
+        if self.tool == ToolType.NOTOOL:
+            target = self.ambient
+        else:
+            status = self.effective_status(now)
+            if status == StationStatus.ON:
+                target = self.set_temp
+            elif status == StationStatus.STANDBY:
+                target = min(self.standby_temp, self.set_temp)
+            else:
+                target = self.ambient
+        # Exponential approach to the target plus a little sensor noise
+        alpha = min(1.0, dt / self.time_constant)
+        self.temperature += (target - self.temperature) * alpha
+        if noise:
+            self.temperature += random.uniform(-noise, noise)
+
+
+class StationEmulator:
+    """Weller station emulator bound to the slave side of a pty"""
+    def __init__(self, baudrate=1200, pace=True, turnaround=0.005, noise_rate=0.0,
+                 checksum_error_rate=0.0, drop_rate=0.0, terminator=b'', unit_id='2',
+                 firmware='0064', tools=(ToolType.WXP120, ToolType.WXMP), sensor_noise=0.3, seed=None):
+        self.baudrate = baudrate
+        self.pace = pace
+        self.turnaround = turnaround
+        self.noise_rate = noise_rate
+        self.checksum_error_rate = checksum_error_rate
+        self.drop_rate = drop_rate
+        self.terminator = terminator
+        self.unit_id = unit_id
+        self.firmware = firmware
+        self.sensor_noise = sensor_noise
+        self.random = random.Random(seed)
+        self.channels = [
+            ChannelModel(250.0, StationStatus.ON, tools[0]),
+            ChannelModel(200.0, StationStatus.STANDBY, tools[1])
+        ]
+        self.remote_mode = 0
+        self.stats = {'commands': 0, 'replies': 0, 'corrupted': 0, 'dropped': 0, 'rejected': 0}
+
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._slave)
+        self.port = os.ttyname(self._slave)
+        self._buffer = bytearray()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._last_step = time.monotonic()
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='StationEmulator', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(2.0)
+            self._thread = None
+        for fd in (self._master, self._slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def transmission_time(self, byte_count):
+        return byte_count * BITS_PER_BYTE / self.baudrate if self.pace else 0.0
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                readable, _, _ = select.select([self._master], [], [], 0.05)
+                if readable:
+                    self._buffer.extend(os.read(self._master, 256))
+            except OSError:
+                break
+            self._step_model()
+            self._process()
+
+    def _step_model(self):
+        now = time.monotonic()
+        dt = now - self._last_step
+        self._last_step = now
+        with self._lock:
+            for channel in self.channels:
+                channel.step(dt, now, self.sensor_noise)
+
+    def _process(self):
+        buffer = self._buffer
+        while buffer:
+            if buffer.startswith(b'remote'):
+                if len(buffer) < 7:
+                    return
+                mode = buffer[6] - ord('0')
+                del buffer[:7]
+                self._handle_remote(mode, 7)
+            elif buffer.startswith(b'REMOTE'):
+                del buffer[:6]
+                self._handle_remote(1, 6)
+            elif len(buffer) > 1 and (b'remote'.startswith(bytes(buffer)) or b'REMOTE'.startswith(bytes(buffer))):
+                return  # Wait for the rest of the remote command
+            elif buffer[:1] == b'r':
+                return
+            elif buffer[0] in QUERY_COMMANDS:
+                command = chr(buffer[0])
+                del buffer[:1]
+                self._reply(self._query_response(command), 1)
+            elif buffer[0] in SET_COMMANDS:
+                if len(buffer) < 7:
+                    return
+                frame = bytes(buffer[:7])
+                del buffer[:7]
+                self._handle_set(frame)
+            else:
+                del buffer[:1]  # Line noise
+
+    def _handle_remote(self, mode, length):
+        self.stats['commands'] += 1
+        self.remote_mode = mode
+        if mode:
+            self._reply(WellerResponse.build_frame('?', f"{self.unit_id}000"), length)
+        else:
+            time.sleep(self.transmission_time(length))
+
+    def _query_response(self, command):
+        self.stats['commands'] += 1
+        now = time.monotonic()
+        ch1, ch2 = self.channels
+        with self._lock:
+            if command == 'R':
+                return WellerResponse.build_frame('R', self._temp_field(ch1.temperature), self._temp_field(ch2.temperature))
+            if command == 'S':
+                return WellerResponse.build_frame('S', self._temp_field(ch1.set_temp), self._temp_field(ch2.set_temp))
+            if command == 'T':
+                return WellerResponse.build_frame('T', self._temp_field(ch1.preset1), self._temp_field(ch2.preset1))
+            if command == 'U':
+                return WellerResponse.build_frame('U', self._temp_field(ch1.preset2), self._temp_field(ch2.preset2))
+            if command == 'Q':
+                return WellerResponse.build_frame(
+                    'Q', f"{int(ch1.effective_status(now))}{int(ch2.effective_status(now))}00"
+                )
+            if command == 'Y':
+                return WellerResponse.build_frame('Y', f"{int(ch1.tool)}000", f"{int(ch2.tool)}000")
+            if command == 'V':
+                return WellerResponse.build_frame('V', self.firmware)
+            return WellerResponse.build_frame('?', f"{self.unit_id}000")
+
+    def _handle_set(self, frame):
+        self.stats['commands'] += 1
+        time.sleep(self.transmission_time(len(frame)))
+        if sum(frame[:6]) % 256 != frame[6]:
+            self.stats['rejected'] += 1
+            return
+        command = chr(frame[0])
+        try:
+            if command == 'q':
+                status1, status2 = StationStatus(frame[2] - 48), StationStatus(frame[3] - 48)
+                with self._lock:
+                    self.channels[0].status, self.channels[1].status = status1, status2
+                return
+            channel = self.channels[frame[1] - ord('1')]
+            value = int(frame[2:6])
+        except (ValueError, IndexError):
+            self.stats['rejected'] += 1
+            return
+        with self._lock:
+            if command == 's':
+                channel.set_temp = value / 10.0
+            elif command == 't':
+                channel.preset1 = value / 10.0
+            elif command == 'u':
+                channel.preset2 = value / 10.0
+            elif command == 'x':
+                channel.fingerswitch_until = time.monotonic() + value
+
+    def _reply(self, frame, request_length):
+        # Request bytes arrive, the station turns around, then the reply is clocked out
+        time.sleep(self.transmission_time(request_length) + self.turnaround)
+        if self.random.random() < self.drop_rate:
+            self.stats['dropped'] += 1
+            return
+        frame = bytearray(frame)
+        if self.random.random() < self.checksum_error_rate:
+            frame[-1] = (frame[-1] + 1) % 256
+            self.stats['corrupted'] += 1
+        elif self.random.random() < self.noise_rate:
+            index = self.random.randrange(len(frame))
+            frame[index] ^= 1 << self.random.randrange(8)
+            self.stats['corrupted'] += 1
+        frame += self.terminator
+        time.sleep(self.transmission_time(len(frame)))
+        os.write(self._master, bytes(frame))
+        self.stats['replies'] += 1
+
+    @staticmethod
+    def _temp_field(temp):
+        return f"{max(0, min(9999, int(round(temp * 10)))):04d}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--baud', type=int, default=1200, help='Baud rate to pace replies at')
+    parser.add_argument('--no-pace', action='store_true', help='Reply as fast as possible')
+    parser.add_argument('--noise', type=float, default=0.0, help='Probability of a bit flip per reply')
+    parser.add_argument('--checksum-errors', type=float, default=0.0, help='Probability of a bad checksum per reply')
+    parser.add_argument('--drop', type=float, default=0.0, help='Probability of no reply')
+    parser.add_argument('--crlf', action='store_true', help='Terminate replies with CR LF')
+    args = parser.parse_args()
+
+    emulator = StationEmulator(
+        baudrate=args.baud,
+        pace=not args.no_pace,
+        noise_rate=args.noise,
+        checksum_error_rate=args.checksum_errors,
+        drop_rate=args.drop,
+        terminator=b'\r\n' if args.crlf else b''
+    )
+    emulator.start()
+    print(f"Emulated Weller station on {emulator.port} ({args.baud} baud). Press Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(5)
+            print(f"{emulator.stats} CH1={emulator.channels[0].temperature:.1f}°C "
+                  f"CH2={emulator.channels[1].temperature:.1f}°C")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        emulator.stop()
+
+
+if __name__ == '__main__':
+    main()
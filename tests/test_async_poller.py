@@ -0,0 +1,26 @@
+import asyncio
+
+import weller
+
+
+class FlakyPoller(weller.AsyncStationPoller):
+    """Poller whose first refresh fails with an error refresh() does not handle"""
+    refreshes = 0
+
+    async def refresh(self):
+        self.refreshes += 1
+        if self.refreshes == 1:
+            raise RuntimeError("unexpected")
+
+
+def test_async_poller_keeps_running_after_an_unexpected_error():
+    async def scenario():
+        poller = FlakyPoller(weller.DemoWellerStation(), poll_interval=0.01)
+        poller.start()
+        await asyncio.sleep(0.1)
+        task_alive = not poller._task.done()
+        poller.stop()
+        return poller.refreshes, task_alive
+
+    refreshes, task_alive = asyncio.run(scenario())
+    assert refreshes >= 2 and task_alive
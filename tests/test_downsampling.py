@@ -0,0 +1,12 @@
+import weller
+
+
+def test_minmax_keeps_first_and_last_sample():
+    timestamps = list(range(100))
+    values = [50] + [10 * (i % 7) for i in range(98)] + [99]
+    out_t, out_v = weller.downsample_minmax(timestamps, values, 10)
+    assert len(out_v) <= 10
+    assert (out_t[0], out_v[0]) == (0, 50)
+    assert (out_t[-1], out_v[-1]) == (99, 99)
+    assert out_t == sorted(out_t)
+    assert min(values[1:-1]) in out_v and max(values[1:-1]) in out_v
@@ -0,0 +1,53 @@
+import socket
+import time
+
+import pytest
+
+import weller
+
+
+def test_head_requests_do_not_leak_stream_slots():
+    station = weller.DemoWellerStation(web_config=weller.WebConfig(max_streams=2))
+    client = station.create_web_app().test_client()
+    # The WSGI server closes every response; HEAD bodies are never iterated
+    for _ in range(3):
+        response = client.head('/api/stream')
+        assert response.status_code == 200
+        response.close()
+    response = client.get('/api/stream')
+    assert response.status_code == 200
+    response.close()
+
+
+def test_head_requests_over_the_server_do_not_leak_stream_slots():
+    pytest.importorskip('waitress')
+    config = weller.WebConfig(port=0, host='127.0.0.1', max_streams=1)
+    station = weller.DemoWellerStation(web_config=config)
+    server = weller.WebServer(station.create_web_app(), config).start()
+    try:
+        for _ in range(3):
+            with socket.create_connection(('127.0.0.1', server.port), timeout=5) as sock:
+                sock.sendall(b'HEAD /api/stream HTTP/1.1\r\nHost: x\r\n\r\n')
+                assert sock.recv(64).startswith(b'HTTP/1.1 200')
+    finally:
+        server.stop()
+        station.poller.stop()
+
+
+def test_stopping_the_server_ends_open_streams():
+    pytest.importorskip('waitress')
+    config = weller.WebConfig(port=0, host='127.0.0.1', poll_interval=0.1, shutdown_timeout=5.0)
+    station = weller.DemoWellerStation(web_config=config)
+    server = weller.WebServer(station.create_web_app(), config).start()
+    try:
+        with socket.create_connection(('127.0.0.1', server.port), timeout=5) as sock:
+            sock.sendall(b'GET /api/stream HTTP/1.1\r\nHost: x\r\n\r\n')
+            assert sock.recv(64).startswith(b'HTTP/1.1 200')
+            started = time.monotonic()
+            server.stop()
+            assert time.monotonic() - started < config.shutdown_timeout
+            while sock.recv(4096):
+                pass
+    finally:
+        server.stop()
+        station.poller.stop()
@@ -0,0 +1,52 @@
+import json
+
+import weller
+
+
+def make_station(samples):
+    """Demo station holding only the given number of samples per channel (capacity 100)"""
+    station = weller.DemoWellerStation()
+    station.poller.stop()
+    station.temperature_history = {channel: weller.TemperatureRingBuffer(100) for channel in station.temperature_history}
+    for i in range(samples):
+        station.record_history({'channel1': i / 10, 'channel2': 0.0}, timestamp_ms=1_000 + i)
+    return station
+
+
+def test_cursor_older_than_the_buffer_reports_missed_samples():
+    station = make_station(150)
+    try:
+        timestamps, values, cursor, missed, reset = station.get_history_since('channel1', 10)
+        assert not reset
+        assert missed == 40  # Samples 10-49 were overwritten before this read
+        assert values[0] == 50 and len(values) == 100 and cursor == 150
+        assert timestamps[0] == 1_050
+    finally:
+        station.close()
+
+
+def test_cursor_from_another_buffer_resets_to_the_oldest_sample():
+    station = make_station(20)
+    try:
+        # Issued by a buffer that had seen more samples, e.g. before a restart
+        _, values, cursor, missed, reset = station.get_history_since('channel1', 500)
+        assert reset and missed == 0
+        assert values == list(range(20)) and cursor == 20
+        assert station.get_history_since('channel1', -1)[4]
+    finally:
+        station.close()
+
+
+def test_cursor_reads_are_not_cached():
+    station = make_station(5)
+    try:
+        cache = station.response_cache
+        for since in range(5):
+            body = json.loads(station.get_history_response('channel1', since=since).body)
+            assert body['count'] == 5 - since and body['cursor'] == 5
+        assert cache.hits == cache.misses == 0
+        station.get_history_response('channel1', points=10)
+        station.get_history_response('channel1', points=10)
+        assert (cache.hits, cache.misses) == (1, 1)
+    finally:
+        station.close()
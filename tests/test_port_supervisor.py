@@ -0,0 +1,39 @@
+import asyncio
+
+import weller
+
+
+class FakeAsyncStation:
+    def __init__(self, port):
+        self.port = port
+        self.port_identity = None
+        self.is_connected = True
+        self.circuit_breaker = weller.CircuitBreaker()
+        self.events = []
+
+    async def disconnect(self):
+        self.is_connected = False
+        self.events.append('disconnect')
+
+    async def reconnect(self, port=None):
+        self.is_connected = True
+        self.events.append(('reconnect', port))
+
+
+def test_async_supervisor_reattaches_a_replugged_port(tmp_path, monkeypatch):
+    monkeypatch.setattr(weller.serial.tools.list_ports, 'comports', lambda: [])
+    device = tmp_path / 'ttyUSB0'  # Not enumerated, so watched by path
+    device.touch()
+    station = FakeAsyncStation(str(device))
+    supervisor = weller.AsyncPortSupervisor()
+    supervisor.watch(station)
+
+    async def scenario():
+        await supervisor.check()
+        device.unlink()
+        await supervisor.check()
+        device.touch()
+        await supervisor.check()
+
+    asyncio.run(scenario())
+    assert station.events == ['disconnect', ('reconnect', str(device))]
@@ -0,0 +1,115 @@
+import time
+
+import pytest
+
+import weller
+
+
+def test_temp_frame_rounds_like_the_converter():
+    # 0.29 * 10 is 2.8999..., which int() would truncate to 2
+    assert weller.WellerCommand.temp_frame(b's', 1, 0.29) == weller.WellerCommand.frame(b's', 1, 3)
+    assert weller.WellerCommand.build_temp_command('s', 1, 0.29) == 's10003'
+
+
+def test_status_and_tool_replies_ignore_padding_in_unused_positions():
+    status = weller.WellerResponse.build_frame('Q', '21xx')
+    assert weller.WellerResponse.decode_status(status) == {'channel1': 2, 'channel2': 1}
+    tools = weller.WellerResponse.build_frame('Y', '2 AB', '5---')
+    assert weller.WellerResponse.decode_tool_names(tools) == {'channel1': 'WXP200', 'channel2': 'WXP65'}
+
+
+def test_temperature_replies_still_require_all_digits():
+    frame = weller.WellerResponse.build_frame('R', '32x0', '3000')
+    with pytest.raises(weller.WellerError):
+        weller.WellerResponse.decode_channel_pair(frame)
+
+
+class ScriptedSerial:
+    """Serial stand-in returning one scripted chunk per read; b'' models a read that timed out"""
+    def __init__(self, chunks, timeout=0.01):
+        self.chunks = list(chunks)
+        self.timeout = timeout
+        self.timeouts = []
+        self.in_waiting = 0
+
+    def read(self, size=1):
+        self.timeouts.append(self.timeout)
+        return self.chunks.pop(0) if self.chunks else b''
+
+
+def make_station(ser):
+    station = weller.WellerStation.__new__(weller.WellerStation)
+    station.ser = ser
+    station.reply_timeout = weller.AdaptiveTimeout(1200)
+    return station
+
+
+def test_unframed_reply_is_read_whole_under_the_deadline():
+    # A framed read left the port timeout at 0.01 s; the reply arrives after a pause
+    ser = ScriptedSerial([b'', b'', b'?1', b'0002', b'\x8a', b''])
+    reply = make_station(ser)._read_unframed(time.monotonic() + 1.0)
+    assert reply == b'?10002\x8a'
+    assert ser.timeouts[0] > 0.5  # Waiting for the start uses the time left, not the stale timeout
+
+
+def test_unframed_reply_stops_at_the_deadline():
+    ser = ScriptedSerial([])
+    started = time.monotonic()
+    assert make_station(ser)._read_unframed(started + 0.05) == b''
+    assert time.monotonic() - started < 0.5
+
+
+TEMPERATURES = weller.WellerResponse.build_frame('R', '2500', '3000')
+STATUS = weller.WellerResponse.build_frame('Q', '2100')
+EXPECTED = {b'R1': len(TEMPERATURES), b'Q1': len(STATUS)}
+
+
+def test_demux_accepts_interleaved_replies_in_any_order():
+    buffer, frames = bytearray(STATUS + TEMPERATURES), {}
+    weller.demux_frames(buffer, EXPECTED, frames)
+    assert frames == {b'Q1': STATUS, b'R1': TEMPERATURES}
+    assert buffer == b''
+
+
+def test_demux_reassembles_replies_arriving_a_byte_at_a_time():
+    buffer, frames = bytearray(), {}
+    for byte in TEMPERATURES + STATUS:
+        buffer.append(byte)
+        weller.demux_frames(buffer, EXPECTED, frames)
+    assert frames == {b'R1': TEMPERATURES, b'Q1': STATUS}
+    assert buffer == b''
+
+
+def test_demux_leaves_a_partial_frame_in_the_buffer():
+    buffer, frames = bytearray(STATUS + TEMPERATURES[:10]), {}
+    weller.demux_frames(buffer, EXPECTED, frames)
+    assert frames == {b'Q1': STATUS}
+    assert buffer == TEMPERATURES[:10]
+    buffer += TEMPERATURES[10:]
+    weller.demux_frames(buffer, EXPECTED, frames)
+    assert frames[b'R1'] == TEMPERATURES and buffer == b''
+
+
+def test_demux_rejects_a_corrupted_block_as_soon_as_it_is_complete():
+    corrupted = bytearray(TEMPERATURES)
+    corrupted[6] ^= 0xFF  # First block's checksum; the second block has not arrived yet
+    buffer, frames = bytearray(corrupted[:9]), {}
+    with pytest.raises(weller.WellerError):
+        weller.demux_frames(buffer, EXPECTED, frames)
+    assert frames == {} and buffer == b''
+
+
+def test_demux_rejects_a_corrupted_second_block():
+    corrupted = bytearray(TEMPERATURES)
+    corrupted[9] ^= 0x01  # A data byte covered by the second checksum only
+    buffer, frames = bytearray(STATUS + corrupted), {}
+    with pytest.raises(weller.WellerError):
+        weller.demux_frames(buffer, EXPECTED, frames)
+    assert frames == {b'Q1': STATUS} and buffer == b''
+
+
+def test_demux_drops_unknown_leading_bytes():
+    buffer, frames = bytearray(b'\x00\xffZ1' + TEMPERATURES + b'\r\n'), {}
+    weller.demux_frames(buffer, EXPECTED, frames)
+    assert frames == {b'R1': TEMPERATURES}
+    assert buffer == b'\n'  # Too short to be a prefix yet
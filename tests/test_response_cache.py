@@ -0,0 +1,28 @@
+import weller
+
+
+def test_etag_differs_between_keys_at_the_same_version():
+    cache = weller.ResponseCache()
+    first = cache.get(('history', 'channel1', 0, 1000), lambda: (5,), lambda: {'a': 1})
+    second = cache.get(('history', 'channel1', 0, 2000), lambda: (5,), lambda: {'a': 1})
+    assert first.etag != second.etag
+
+
+def test_etag_is_never_older_than_the_body():
+    cache = weller.ResponseCache()
+    # A new sample lands during the first build, so the body is built again
+    version = iter([(1,), (2,), (2,), (2,)]).__next__
+    samples = iter([1, 2])
+    response = cache.get('key', version, lambda: {'samples': next(samples)})
+    assert response.body == b'{"samples":2}'
+    assert response.etag.endswith('-2"')
+    assert cache.get('key', version, lambda: {'samples': 3}) is response
+
+
+def test_unstored_responses_are_tagged_but_not_cached():
+    cache = weller.ResponseCache(max_entries=1)
+    kept = cache.get('kept', lambda: (1,), lambda: {'a': 1})
+    one_off = cache.get('one-off', lambda: (1,), lambda: {'b': 2}, store=False)
+    assert one_off.etag.startswith(f'"{cache.token}-') and one_off.etag != kept.etag
+    # The stored entry was not evicted by the one-off response
+    assert cache.get('kept', lambda: (1,), lambda: {'a': 3}) is kept
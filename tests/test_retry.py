@@ -0,0 +1,75 @@
+import pytest
+
+import weller
+
+
+class FakeClock:
+    def __init__(self, now=100.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_backoff_grows_exponentially_up_to_max_delay(monkeypatch):
+    policy = weller.RetryPolicy(base_delay=0.01, max_delay=0.05)
+    monkeypatch.setattr(weller.random, 'uniform', lambda low, high: high)  # Always the largest jitter
+    assert [policy.backoff(attempt) for attempt in range(1, 6)] == pytest.approx([0.01, 0.02, 0.04, 0.05, 0.05])
+    monkeypatch.undo()
+    assert all(0 <= policy.backoff(attempt) <= 0.05 for attempt in range(1, 20) for _ in range(50))
+
+
+def test_schedule_stops_after_the_last_attempt(monkeypatch):
+    monkeypatch.setattr(weller.random, 'uniform', lambda low, high: high)
+    clock = FakeClock()
+    policy = weller.RetryPolicy(attempts=4, base_delay=0.01, max_delay=0.2, deadline=10.0, clock=clock)
+    schedule = list(policy.schedule())
+    assert [delay for delay, _ in schedule] == pytest.approx([0.0, 0.01, 0.02, 0.04])
+    assert all(deadline == 110.0 for _, deadline in schedule)
+
+
+def test_schedule_stops_when_the_backoff_no_longer_fits_the_deadline(monkeypatch):
+    monkeypatch.setattr(weller.random, 'uniform', lambda low, high: high)
+    clock = FakeClock()
+    policy = weller.RetryPolicy(attempts=10, base_delay=0.1, max_delay=0.1, deadline=0.5, clock=clock)
+    delays = []
+    for delay, deadline in policy.schedule(extension=0.25):
+        assert deadline == pytest.approx(100.75)
+        delays.append(delay)
+        clock.now += delay + 0.2  # The attempt itself takes 0.2 s and fails
+    # Attempts start at 100.0, 100.3 and 100.6; a fourth would start at 100.9 > 100.75
+    assert delays == pytest.approx([0.0, 0.1, 0.1])
+
+
+def test_breaker_opens_after_the_threshold_and_probes_each_interval():
+    clock = FakeClock()
+    breaker = weller.CircuitBreaker(failure_threshold=3, probe_interval=2.0, clock=clock)
+    for _ in range(2):
+        breaker.record_failure()
+    assert not breaker.is_open and breaker.allow()
+    breaker.record_failure()
+    assert breaker.is_open and breaker.opened_at == 100.0
+    assert not breaker.allow()
+
+    clock.now = 101.9
+    assert not breaker.allow()
+    clock.now = 102.0
+    assert breaker.allow()  # Half-open: one probe goes through
+    assert not breaker.allow()  # Any other command waits for the probe interval
+    breaker.record_failure()  # Probe failed: stays open
+    assert breaker.is_open and breaker.opened_at == 100.0
+
+    clock.now = 104.0
+    assert breaker.allow()
+    breaker.record_success()  # Probe succeeded: closed
+    assert not breaker.is_open and breaker.failures == 0
+    assert breaker.allow() and breaker.allow()
+
+
+def test_breaker_reset_closes_it():
+    clock = FakeClock()
+    breaker = weller.CircuitBreaker(failure_threshold=1, clock=clock)
+    breaker.record_failure()
+    assert breaker.is_open
+    breaker.reset()
+    assert not breaker.is_open and breaker.allow()
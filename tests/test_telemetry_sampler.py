@@ -0,0 +1,67 @@
+import time
+
+import pytest
+
+import weller
+
+
+class FlakyStation:
+    """Station whose first temperature read fails with an error the sampler does not expect"""
+    reads = 0
+
+    def read_temperature(self):
+        self.reads += 1
+        if self.reads == 1:
+            raise ValueError("unexpected")
+        return {'channel1': 300, 'channel2': 0}
+
+    def record_history(self, temps, timestamp_ms=None, statuses=None):
+        pass
+
+
+def test_sampler_backs_off_and_keeps_running_after_an_unexpected_error():
+    sampler = weller.TelemetrySampler(FlakyStation(), weller.SamplerConfig(status_rate=0, tools_rate=0))
+    sampler.start()
+    try:
+        deadline = time.monotonic() + 3
+        while sampler.get_rates()['temperature']['samples'] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        rates = sampler.get_rates()['temperature']
+        assert sampler.running
+        assert rates['errors'] == 1 and rates['samples'] >= 1
+        # The failed read is retried after ERROR_BACKOFF, not immediately
+        assert time.monotonic() - sampler._anchor_monotonic >= sampler.ERROR_BACKOFF
+    finally:
+        sampler.stop()
+
+
+class FixedSampler:
+    ERROR_BACKOFF = weller.TelemetrySampler.ERROR_BACKOFF
+
+    def __init__(self, latest):
+        self.latest = latest
+
+    def get_latest(self):
+        return self.latest
+
+
+def sample(value, monotonic, timestamp_ms):
+    return {'value': value, 'timestamp_ms': timestamp_ms, 'monotonic': monotonic}
+
+
+def test_sample_age_is_measured_on_the_monotonic_clock():
+    poller = weller.StationPoller(weller.DemoWellerStation(), poll_interval=1.0)
+    now = time.monotonic()
+    # Fresh on the monotonic clock, an hour old by the wall clock (e.g. after an NTP step)
+    stale_wall_ms = (time.time() - 3600) * 1000
+    latest = {
+        'temperature': sample({'channel1': 300, 'channel2': 0}, now, stale_wall_ms),
+        'status': sample({'channel1': 0, 'channel2': 0}, now, stale_wall_ms),
+        'tools': sample({'channel1': 'WXP120', 'channel2': 'NOTOOL'}, now, stale_wall_ms),
+    }
+    status = poller._status_from_sampler(FixedSampler(latest))
+    assert status['channel1']['temperature'] == 300
+
+    latest['temperature'] = sample({'channel1': 300, 'channel2': 0}, now - 10, time.time() * 1000)
+    with pytest.raises(weller.WellerError, match='No temperature sample'):
+        poller._status_from_sampler(FixedSampler(latest))
@@ -0,0 +1,27 @@
+import weller
+
+
+def test_samples_stamped_before_the_newest_are_clamped(tmp_path):
+    store = weller.TimeSeriesStore(str(tmp_path), retention_days=None)
+    store.append(10_000, (2000, 2100))
+    store.append(9_000, (2010, 2110))  # Wall clock stepped back
+    store.append(11_000, (2020, 2120))
+    store.close()
+
+    # The newest stored timestamp also applies after a restart
+    store = weller.TimeSeriesStore(str(tmp_path), retention_days=None)
+    store.append(5_000, (2030, 2130))
+    records = list(store.read())
+    store.close()
+
+    assert [record[0] for record in records] == [10_000, 10_000, 11_000, 11_000]
+    assert [record[1] for record in records] == [2000, 2010, 2020, 2030]
+    assert [record[1] for record in weller.TimeSeriesStore(str(tmp_path), retention_days=None).read(start_ms=10_500)] \
+        == [2020, 2030]
+
+
+def test_ring_buffer_timestamps_never_decrease():
+    history = weller.TemperatureRingBuffer(8)
+    for timestamp_ms, value in ((1_000, 1), (3_000, 2), (2_000, 3), (4_000, 4)):
+        history.append(timestamp_ms, value)
+    assert history.read_range(2_500, None)[1] == [2, 3, 4]
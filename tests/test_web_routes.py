@@ -0,0 +1,42 @@
+import weller
+
+
+def make_client():
+    return weller.DemoWellerStation().create_web_app().test_client()
+
+
+def test_control_route_replies_with_the_shared_payload():
+    response = make_client().post('/api/set_temperature/1/320.0')
+    assert response.status_code == 200
+    assert response.get_json() == {
+        'success': True, 'temperature': 320.0, 'channel': 1, 'message': 'Temperature set to 320.0°C'
+    }
+
+
+def test_control_route_rejects_invalid_input():
+    response = make_client().post('/api/set_temperature/3/320.0')
+    assert response.status_code == 400
+    assert response.get_json() == {'success': False, 'error': 'Invalid channel'}
+
+
+def test_history_route_supports_conditional_get():
+    client = make_client()
+    response = client.get('/api/temperature_history/1?points=10')
+    assert response.status_code == 200 and response.get_json()['success']
+    again = client.get('/api/temperature_history/1?points=10', headers={'If-None-Match': response.headers['ETag']})
+    assert again.status_code == 304
+
+
+def test_snapshot_of_an_unnamed_tool_does_no_serial_io():
+    station = weller.DemoWellerStation()
+
+    def no_io(*args, **kwargs):
+        raise AssertionError("serial I/O while building a snapshot")
+
+    station.get_tool_type = station.read_tool_type = no_io
+    poller = weller.StationPoller(station)
+    # Tool digits 8 and 9 have no ToolType name and decode as 'Unknown'
+    status = {ch: {'status': 'ON', 'temperature': 300.0, 'tool': 'Unknown'} for ch in ('channel1', 'channel2')}
+    snapshot = poller._build_snapshot(status, None)
+    assert snapshot['tool_info']['channel1'] == weller.UNKNOWN_TOOL_DETAILS
+
@@ -0,0 +1,102 @@
+import socket
+
+import pytest
+from flask import Flask, request
+
+import weller
+
+pytest.importorskip('waitress')
+
+
+def start_server(app, **kwargs):
+    config = weller.WebConfig(port=0, host='127.0.0.1', **kwargs)
+    return weller.WebServer(app, config).start()
+
+
+def read_response(reader):
+    """Read one HTTP response with a Content-Length from a socket file"""
+    status = reader.readline()
+    headers = {}
+    while True:
+        line = reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    body = reader.read(int(headers.get('content-length', 0)))
+    return status, headers, body
+
+
+def make_echo_app():
+    app = Flask(__name__)
+
+    @app.route('/echo', methods=['POST'])
+    def echo():
+        return request.get_data()
+
+    @app.route('/ping')
+    def ping():
+        return 'pong'
+
+    return app
+
+
+def test_post_body_then_pipelined_get_on_one_connection():
+    server = start_server(make_echo_app())
+    try:
+        with socket.create_connection(('127.0.0.1', server.port), timeout=5) as sock, sock.makefile('rb') as reader:
+            sock.sendall(
+                b'POST /echo HTTP/1.1\r\nHost: x\r\nContent-Length: 5\r\n\r\nhello'
+                b'GET /ping HTTP/1.1\r\nHost: x\r\n\r\n'
+            )
+            status, _, body = read_response(reader)
+            assert status.startswith(b'HTTP/1.1 200') and body == b'hello'
+            status, _, body = read_response(reader)
+            assert status.startswith(b'HTTP/1.1 200') and body == b'pong'
+    finally:
+        server.stop()
+
+
+def test_unread_post_body_is_drained_before_next_request():
+    server = start_server(make_echo_app())
+    try:
+        with socket.create_connection(('127.0.0.1', server.port), timeout=5) as sock, sock.makefile('rb') as reader:
+            # /ping does not read the body; the server must skip it, not parse it as a request
+            sock.sendall(b'POST /ping HTTP/1.1\r\nHost: x\r\nContent-Length: 5\r\n\r\nhello')
+            sock.sendall(b'GET /ping HTTP/1.1\r\nHost: x\r\n\r\n')
+            assert read_response(reader)[0].startswith(b'HTTP/1.1 405')
+            status, _, body = read_response(reader)
+            assert status.startswith(b'HTTP/1.1 200') and body == b'pong'
+    finally:
+        server.stop()
+
+
+def test_idle_keepalive_connections_do_not_hold_workers():
+    server = start_server(make_echo_app(), max_workers=1)
+    ping = b'GET /ping HTTP/1.1\r\nHost: x\r\n\r\n'
+    connections = []
+    try:
+        for _ in range(4):
+            sock = socket.create_connection(('127.0.0.1', server.port), timeout=5)
+            connections.append((sock, sock.makefile('rb')))
+            sock.sendall(ping)
+            assert read_response(connections[-1][1])[2] == b'pong'
+        sock, reader = connections[0]
+        sock.sendall(ping)
+        assert read_response(reader)[2] == b'pong'
+    finally:
+        for sock, reader in connections:
+            reader.close()
+            sock.close()
+        server.stop()
+
+
+def test_idle_connection_is_closed_after_keepalive_timeout():
+    server = start_server(make_echo_app(), keepalive_timeout=1)
+    try:
+        with socket.create_connection(('127.0.0.1', server.port), timeout=5) as sock, sock.makefile('rb') as reader:
+            sock.sendall(b'GET /ping HTTP/1.1\r\nHost: x\r\n\r\n')
+            assert read_response(reader)[2] == b'pong'
+            assert reader.read() == b''
+    finally:
+        server.stop()
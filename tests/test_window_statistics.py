@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+import weller
+
+WINDOWS = {'short': 300, 'long': 2_000, 'all': None}
+
+
+def brute_force(samples, capacity, span_ms):
+    """Statistics recomputed from scratch over the retained samples in the window"""
+    retained = samples[-capacity:]
+    if span_ms is not None:
+        cutoff = retained[-1][0] - span_ms
+        retained = [sample for sample in retained if sample[0] >= cutoff]
+    values = [value for _, value in retained]
+    mean = sum(values) / len(values)
+    variance = sum((value - mean) ** 2 for value in values) / len(values)
+    return {
+        'min': min(values) / 10,
+        'max': max(values) / 10,
+        'avg': mean / 10,
+        'stddev': variance ** 0.5 / 10,
+        'current': values[-1] / 10,
+        'count': len(values)
+    }
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_window_statistics_match_a_brute_force_recomputation(seed):
+    rng = random.Random(seed)
+    capacity = 50
+    buffer = weller.TemperatureRingBuffer(capacity, windows=WINDOWS)
+    samples = []
+    timestamp = 1_700_000_000_000
+    for _ in range(20 * capacity):  # Wraps the ring many times
+        # Mostly forward steps, with repeats and the occasional clock step back
+        timestamp += rng.choice([0, rng.randint(1, 100), rng.randint(-500, -1)])
+        value = rng.choice([rng.randint(-400, 4500), rng.randint(2000, 2010)])
+        buffer.append(timestamp, value)
+        clamped = max(timestamp, samples[-1][0]) if samples else timestamp
+        samples.append((clamped, value))
+
+        for name, span_ms in WINDOWS.items():
+            expected = brute_force(samples, capacity, span_ms)
+            actual = buffer.statistics(name)
+            assert actual['count'] == expected['count'], name
+            for key in ('min', 'max', 'current'):
+                assert actual[key] == expected[key], (name, key)
+            assert actual['avg'] == pytest.approx(expected['avg'], abs=1e-6), name
+            assert actual['stddev'] == pytest.approx(expected['stddev'], abs=1e-3), name
@@ -0,0 +1,110 @@
+import io
+import json
+import zlib
+from datetime import datetime
+
+import pytest
+
+import weller
+
+MISSING, NO_STATUS = weller.TimeSeriesStore.MISSING_VALUE, weller.TimeSeriesStore.MISSING_STATUS
+START_MS = 1_700_000_000_000
+# Repeated timestamps, small steps, an hour-long gap and one wider than an int32 of milliseconds
+GAPS = [0, 0, 1, 250, 3_600_000, 1, 2 ** 31 + 5, 100]
+COLUMNAR = ['binary', pytest.param('msgpack', marks=pytest.mark.skipif(weller.msgpack is None,
+                                                                        reason="msgpack not installed"))]
+
+
+def gapped_timestamps(count):
+    timestamps, timestamp = [], START_MS
+    for i in range(count):
+        timestamp += GAPS[i % len(GAPS)]
+        timestamps.append(timestamp)
+    return timestamps
+
+
+def export_records(count):
+    """Raw export records with gaps and every kind of missing value"""
+    records = []
+    for i, timestamp in enumerate(gapped_timestamps(count)):
+        records.append((
+            timestamp,
+            MISSING if i % 7 == 3 else -400 + i,
+            MISSING if i % 5 == 1 else 32767 - i,
+            MISSING if i % 2 else 3500,
+            MISSING if i % 3 else -32768,
+            NO_STATUS if i % 4 == 2 else i % 6,
+            NO_STATUS if i % 9 == 0 else 254
+        ))
+    return records
+
+
+@pytest.mark.parametrize('fmt', COLUMNAR)
+@pytest.mark.parametrize('flags', [{}, {'missed': 12, 'reset': True}, {'decimated': True, 'raw_count': 90}])
+def test_history_round_trips_exactly(fmt, flags):
+    timestamps = gapped_timestamps(40)
+    values = [(-1) ** i * (i * 811 % 32768) for i in range(40)]
+    data = weller.encode_history(fmt, timestamps, values, cursor=2 ** 40 + 3, **flags)
+    assert weller.decode_history(data) == {
+        'success': True,
+        'timestamps': timestamps,
+        'temperatures': values,
+        'cursor': 2 ** 40 + 3,
+        'count': flags.get('raw_count', len(values)),
+        'missed': flags.get('missed', 0),
+        'decimated': flags.get('decimated', False),
+        'reset': flags.get('reset', False)
+    }
+
+
+@pytest.mark.parametrize('fmt', COLUMNAR)
+def test_empty_history_round_trips(fmt):
+    decoded = weller.decode_history(weller.encode_history(fmt, [], [], cursor=7))
+    assert decoded['timestamps'] == [] and decoded['temperatures'] == [] and decoded['cursor'] == 7
+
+
+def decode_msgpack_export(data):
+    """Raw records from a 'msgpack' export, with None mapped back to the missing markers"""
+    markers = (MISSING,) * 4 + (NO_STATUS,) * 2
+    records = []
+    for block in weller.msgpack.Unpacker(io.BytesIO(data)):
+        timestamps = weller.delta_decode(block['start_ms'], block['time_deltas'])
+        assert block['count'] == len(timestamps)
+        columns = [[marker if value is None else value for value in block[name]]
+                   for name, marker in zip(weller.EXPORT_COLUMNS[1:], markers)]
+        records.extend(zip(timestamps, *columns))
+    return records
+
+
+@pytest.mark.parametrize('fmt', COLUMNAR)
+@pytest.mark.parametrize('compress', [False, True])
+def test_export_blocks_round_trip_exactly(fmt, compress):
+    records = export_records(1234)  # Three blocks, the last one partial
+    data = b''.join(weller.iter_columnar_chunks(iter(records), fmt, compress))
+    if compress:
+        data = zlib.decompress(data, 31)
+    decoded = list(weller.decode_export_blocks(data)) if fmt == 'binary' else decode_msgpack_export(data)
+    assert decoded == records
+
+
+def test_json_history_and_ndjson_export_round_trip():
+    station = weller.DemoWellerStation()
+    try:
+        station.poller.stop()  # Only the samples below are recorded
+        station.temperature_history = {channel: weller.TemperatureRingBuffer(100) for channel in station.temperature_history}
+        timestamps = gapped_timestamps(6)  # Up to the hour-long gap
+        temps = [{'channel1': 20.0 + i / 10, 'channel2': -10.5 * i} for i in range(len(timestamps))]
+        for timestamp, sample in zip(timestamps, temps):
+            station.record_history(sample, timestamp_ms=timestamp)
+
+        body = json.loads(station.get_history_response('channel2', since=0, fmt='json').body)
+        assert body['temperatures'] == [sample['channel2'] for sample in temps]
+        assert [round(datetime.fromisoformat(value).timestamp() * 1000) for value in body['timestamps']] == timestamps
+
+        lines = b''.join(station.iter_export('ndjson')).decode().splitlines()
+        rows = [json.loads(line) for line in lines]
+        assert [row['channel1_temperature'] for row in rows] == [sample['channel1'] for sample in temps]
+        # No set points or statuses were recorded: they are exported as null, not as the markers
+        assert all(row[name] is None for row in rows for name in weller.EXPORT_COLUMNS[3:])
+    finally:
+        station.close()
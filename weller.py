@@ -1,2122 +1,5595 @@
-import serial
-import time
-from enum import IntEnum
-import logging
-from datetime import datetime, timedelta
-import json
-from typing import Dict, List, Optional, Union
-from collections import deque
-from flask import Flask, jsonify, render_template_string, request
-import threading
-import csv
-from functools import wraps
-import serial.tools.list_ports
-import random
-from flask_basicauth import BasicAuth
-
-html_template = '''
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Weller Station Control</title>
-    <meta http-equiv="refresh" content="5">
-    <style>
-        body { font-family: Arial; padding: 20px; background-color: #f0f0f0; }
-        .channel { 
-            margin: 20px; 
-            padding: 20px; 
-            border: 1px solid #ccc;
-            border-radius: 10px;
-            background-color: white;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }
-        .controls { margin-top: 15px; }
-        button { 
-            margin: 5px; 
-            padding: 8px 15px; 
-            border: none;
-            border-radius: 5px;
-            background-color: #4CAF50;
-            color: white;
-            cursor: pointer;
-        }
-        button:hover { background-color: #45a049; }
-        .status { margin: 10px 0; }
-        .temp-slider {
-            width: 100%;
-            margin: 10px 0;
-        }
-        .temp-readout {
-            font-size: 24px;
-            font-weight: bold;
-            color: #2196F3;
-        }
-        .stats {
-            display: grid;
-            grid-template-columns: repeat(2, 1fr);
-            gap: 10px;
-            margin: 10px 0;
-        }
-        .stat-item {
-            padding: 5px;
-            background-color: #f8f8f8;
-            border-radius: 5px;
-        }
-        .error { color: red; }
-        .success { color: green; }
-        .station-info {
-            background-color: #e8f5e9;
-            padding: 15px;
-            border-radius: 10px;
-            margin-bottom: 20px;
-        }
-        .chart {
-            height: 200px;
-            margin: 20px 0;
-            background: #f8f8f8;
-            border-radius: 5px;
-        }
-        .temp-control {
-            display: flex;
-            align-items: center;
-            gap: 10px;
-            margin: 15px 0;
-        }
-        .slider-container {
-            flex-grow: 1;
-        }
-        .temp-display {
-            min-width: 80px;
-            text-align: center;
-            font-size: 1.2em;
-        }
-        .settings-btn {
-            position: absolute;
-            top: 20px;
-            right: 20px;
-            padding: 10px;
-            background: #2196F3;
-            border: none;
-            border-radius: 5px;
-            color: white;
-            cursor: pointer;
-        }
-
-        .modal {
-            display: none;
-            position: fixed;
-            top: 0;
-            left: 0;
-            width: 100%;
-            height: 100%;
-            background: rgba(0,0,0,0.5);
-            z-index: 1000;
-        }
-
-        .modal-content {
-            position: relative;
-            background: white;
-            margin: 10% auto;
-            padding: 20px;
-            width: 80%;
-            max-width: 500px;
-            border-radius: 10px;
-        }
-
-        .close-btn {
-            position: absolute;
-            right: 10px;
-            top: 10px;
-            cursor: pointer;
-            font-size: 24px;
-        }
-
-        .settings-group {
-            margin: 15px 0;
-        }
-
-        .settings-group label {
-            display: block;
-            margin-bottom: 5px;
-        }
-    </style>
-    <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
-    <script>
-        let tempValues = {};
-        let sliderValue = {};  // Nytt objekt för att spara slider-värden
-        let charts = {};
-        
-        function updateTempValue(channel, value) {
-            sliderValue[channel] = parseFloat(value);
-            document.getElementById(`tempSliderValue${channel}`).textContent = 
-                Math.round(value) + '°' + settings.unit;
-        }
-        
-        function setTemp(channel) {
-            const temp = sliderValue[channel];
-            if (!temp) {
-                showMessage('Please select a temperature first', true);
-                return;
-            }
-            
-            fetch(`/api/set_temperature/${channel}/${temp}`, {
-                method: 'POST',
-                headers: {
-                    'Accept': 'application/json',
-                    'Content-Type': 'application/json'
-                }
-            })
-            .then(response => response.json())
-            .then(data => {
-                if (data.success) {
-                    showMessage(`Temperature set to ${data.temperature}°C`, false);
-                    updateDisplay();
-                }
-            })
-            .catch(error => showMessage('Error: ' + error.message, true));
-        }
-
-        function setPreset(channel, presetNum, temp) {
-            fetch(`/api/set_preset/${channel}/${presetNum}/${temp}`, {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' }
-            })
-            .then(response => response.json())
-            .then(data => {
-                if (data.success) {
-                    showMessage(`Preset ${presetNum} set to ${Math.round(temp)}°C`, false);
-                    // Force update the display
-                    const presetElement = document.querySelector(`#preset${presetNum}Value${channel}`);
-                    if (presetElement) {
-                        presetElement.textContent = Math.round(temp) + '°C';
-                    }
-                }
-            });
-        }
-
-        function activatePreset(channel, presetNum) {
-            fetch(`/api/activate_preset/${channel}/${presetNum}`, {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' }
-            })
-            .then(response => response.json())
-            .then(data => {
-                if (data.success) {
-                    showMessage(`Activated preset ${presetNum}`, false);
-                    updateDisplay();
-                }
-            });
-        }
-
-        function updateCharts(data) {
-            if (!data.status || !data.temperature_history) return;
-            
-            [1, 2].forEach(channel => {
-                const channelKey = `channel${channel}`;
-                if (data.temperature_history[channelKey].length > 0) {
-                    const temps = data.temperature_history[channelKey].map(d => d.temperature);
-                    const times = data.temperature_history[channelKey].map(d => d.time);
-                    
-                    Plotly.update(`chart${channel}`, {
-                        x: [times],
-                        y: [temps]
-                    });
-                }
-            });
-        }
-        
-        function showMessage(message, isError) {
-            const msgDiv = document.getElementById('messages');
-            msgDiv.textContent = message;
-            msgDiv.className = isError ? 'error' : 'success';
-            setTimeout(() => msgDiv.textContent = '', 3000);
-        }
-
-        function initializeCharts() {
-            [1, 2].forEach(channel => {
-                const layout = {
-                    title: `Channel ${channel} Temperature`,
-                    xaxis: { title: 'Time' },
-                    yaxis: { 
-                        title: 'Temperature (°C)',
-                        range: [0, 500]
-                    },
-                    height: 300,
-                    margin: { t: 30, r: 10, b: 30, l: 40 }
-                };
-                
-                const config = {
-                    responsive: true,
-                    displayModeBar: false
-                };
-                
-                Plotly.newPlot(`chart${channel}`, [{
-                    y: [],
-                    type: 'scatter',
-                    mode: 'lines',
-                    name: 'Temperature',
-                    line: { color: channel === 1 ? '#2196F3' : '#4CAF50' }
-                }], layout, config);
-            });
-        }
-        
-        let settings = {
-            unit: 'C',
-            decimals: 1
-        };
-
-        function updateDisplaySettings() {
-            localStorage.setItem('wellerSettings', JSON.stringify(settings));
-            updateAllTemperatures();
-        }
-
-        function formatTemperature(temp, forceNoDecimals = false) {
-            const value = settings.unit === 'F' ? (temp * 9/5 + 32) : temp;
-            if (forceNoDecimals) {
-                return Math.round(value) + '°' + settings.unit;
-            }
-            return value.toFixed(settings.decimals) + '°' + settings.unit;
-        }
-
-        function updateAllTemperatures() {
-            document.querySelectorAll('.temp-readout').forEach(el => {
-                const tempValue = parseFloat(el.getAttribute('data-temp') || '0');
-                el.textContent = 'Current: ' + formatTemperature(tempValue);
-            });
-            
-            document.querySelectorAll('.temp-display').forEach(el => {
-                const tempValue = parseFloat(el.getAttribute('data-temp') || '0');
-                el.textContent = formatTemperature(tempValue, true);  // Force no decimals
-            });
-        }
-
-        function showSettings() {
-            document.getElementById('settingsModal').style.display = 'block';
-            document.getElementById('unitSelect').value = settings.unit;
-            document.getElementById('decimalsSelect').value = settings.decimals;
-        }
-
-        function closeSettings() {
-            document.getElementById('settingsModal').style.display = 'none';
-        }
-
-        function saveSettings() {
-            settings.unit = document.getElementById('unitSelect').value;
-            settings.decimals = parseInt(document.getElementById('decimalsSelect').value);
-            updateDisplaySettings();
-            closeSettings();
-        }
-
-        // Modify existing updateDisplay function
-        function updateDisplay() {
-            fetch('/api/status')
-                .then(response => response.json())
-                .then(data => {
-                    if (data.success && data.status) {
-                        Object.entries(data.status).forEach(([channel, info]) => {
-                            const idx = channel.slice(-1);
-                            const tempElement = document.querySelector(`#temp${idx}Value`);
-                            tempElement.setAttribute('data-temp', info.temperature);
-                            tempElement.textContent = formatTemperature(info.temperature);
-                        });
-                        updateCharts(data);
-                    }
-                })
-                .catch(console.error);
-        }
-
-        // Load settings on startup
-        document.addEventListener('DOMContentLoaded', () => {
-            const savedSettings = localStorage.getItem('wellerSettings');
-            if (savedSettings) {
-                settings = JSON.parse(savedSettings);
-            }
-            initializeCharts();
-            setInterval(updateDisplay, 1000);
-        });
-
-        function triggerFingerswitch(channel) {
-            const seconds = document.getElementById(`fingerswitchTime${channel}`).value;
-            fetch(`/api/fingerswitch/${channel}/${seconds}`, {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' }
-            })
-            .then(response => response.json())
-            .then(data => {
-                if (data.success) {
-                    showMessage(`Fingerswitch activated for ${seconds} seconds`, false);
-                }
-            });
-        }
-
-        function setRemoteMode(mode) {
-            fetch('/api/remote_mode/' + mode, {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' }
-            })
-            .then(response => response.json())
-            .then(data => {
-                if (data.success) {
-                    showMessage(`Remote mode set to ${mode}`, false);
-                }
-            });
-        }
-
-        function updateToolInfo(channel) {
-            fetch('/api/tool_info/' + channel)
-                .then(response => response.json())
-                .then(data => {
-                    if (data.success) {
-                        const info = data.info;
-                        const container = document.querySelector(`#toolInfo${channel}`);
-                        container.querySelector('.tool-name').textContent = info.name;
-                        container.querySelector('.tool-power').textContent = info.power;
-                        container.querySelector('.tool-max-temp').textContent = info.max_temp + '°C';
-                        container.querySelector('.tool-description').textContent = info.description;
-                    }
-                });
-        }
-    </script>
-</head>
-<body>
-    <button class="settings-btn" onclick="showSettings()">⚙️ Settings</button>
-
-    <div id="settingsModal" class="modal">
-        <div class="modal-content">
-            <span class="close-btn" onclick="closeSettings()">&times;</span>
-            <h2>Settings</h2>
-            
-            <div class="settings-group">
-                <label for="unitSelect">Temperature Unit:</label>
-                <select id="unitSelect">
-                    <option value="C">Celsius</option>
-                    <option value="F">Fahrenheit</option>
-                </select>
-            </div>
-
-            <div class="settings-group">
-                <label for="decimalsSelect">Decimal Places:</label>
-                <select id="decimalsSelect">
-                    <option value="0">0</option>
-                    <option value="1">1</option>
-                    <option value="2">2</option>
-                </select>
-            </div>
-
-            <button onclick="saveSettings()">Save</button>
-        </div>
-    </div>
-
-    <h1>Weller Station Control Panel</h1>
-    
-    <div class="station-info">
-        <h2>Station Information</h2>
-        <div class="status-grid">
-            <div class="info-item">
-                <strong>Model:</strong> {{ station_info.model }}
-            </div>
-            <div class="info-item">
-                <strong>Firmware:</strong> {{ station_info.firmware }}
-            </div>
-            <div class="info-item">
-                <strong>Connection:</strong> 
-                <span class="connection-{{ station_info.connection_status.lower() }}">
-                    {{ station_info.connection_status }}
-                </span>
-            </div>
-            <div class="info-item">
-                <strong>Interface:</strong> {{ station_info.connection }}
-            </div>
-            <div class="info-item">
-                <strong>Uptime:</strong> {{ station_info.uptime }}
-            </div>
-            <div class="info-item">
-                <strong>Last Updated:</strong> 
-                <span id="last_updated">{{ station_info.last_updated }}</span>
-            </div>
-        </div>
-    </div>
-
-    <div id="messages"></div>
-    
-    {% for channel in status %}
-    <div class="channel">
-        <h2>{{ channel.upper() }}</h2>
-        <div class="temp-readout" data-temp="{{ status[channel]['temperature'] }}">
-            Current: {{ status[channel]['temperature'] }}°C
-        </div>
-        
-        <div class="stats">
-            <div class="stat-item">
-                <strong>Status:</strong> {{ status[channel]['status'] }}
-            </div>
-            <div class="stat-item">
-                <strong>Tool:</strong> {{ status[channel]['tool'] }}
-            </div>
-            {% if stats[channel] %}
-            <div class="stat-item">
-                <strong>Min/Max:</strong> {{ "%.1f"|format(stats[channel]['min']) }}°C / {{ "%.1f"|format(stats[channel]['max']) }}°C
-            </div>
-            <div class="stat-item">
-                <strong>Average:</strong> {{ "%.1f"|format(stats[channel]['avg']) }}°C
-            </div>
-            {% endif %}
-            {% if presets[channel] %}
-            <div class="stat-item">
-                <strong>Preset 1:</strong> {{ "%.0f"|format(presets[channel]['preset1']) }}°C
-            </div>
-            <div class="stat-item">
-                <strong>Preset 2:</strong> {{ "%.0f"|format(presets[channel]['preset2']) }}°C
-            </div>
-            {% endif %}
-        </div>
-
-        <div class="controls">
-            <h3>Temperature Control</h3>
-            <div class="temp-control">
-                <div class="slider-container">
-                    <input type="range" 
-                           id="tempSlider{{loop.index}}" 
-                           class="temp-slider"
-                           min="{{ station_info.temp_limits.min }}" 
-                           max="{{ station_info.temp_limits.max }}" 
-                           step="1" 
-                           value="200"
-                           oninput="updateTempValue({{loop.index}}, this.value)">
-                    <div id="tempSliderValue{{loop.index}}" class="temp-display" data-temp="200">200°C</div>
-                </div>
-                <button onclick="setTemp({{loop.index}})">Set</button>
-            </div>
-
-            <div class="preset-controls">
-                <h3>Preset Controls</h3>
-                <div class="preset-row">
-                    <button onclick="setPreset({{loop.index}}, 1, sliderValue[{{loop.index}}])">Save Preset 1</button>
-                    <button onclick="setPreset({{loop.index}}, 2, sliderValue[{{loop.index}}])">Save Preset 2</button>
-                </div>
-                <div class="preset-row">
-                    <button onclick="activatePreset({{loop.index}}, 1)">Use Preset 1</button>
-                    <button onclick="activatePreset({{loop.index}}, 2)">Use Preset 2</button>
-                </div>
-            </div>
-            
-            <h3>Mode Control</h3>
-            <button onclick="setMode({{loop.index}}, 'ON')">ON</button>
-            <button onclick="setMode({{loop.index}}, 'OFF')">OFF</button>
-            <button onclick="setMode({{loop.index}}, 'STANDBY')">STANDBY</button>
-        </div>
-        <div class="tool-controls">
-            <h3>Tool Controls</h3>
-            <div class="fingerswitch-control">
-                <label for="fingerswitchTime{{loop.index}}">Fingerswitch Time (s):</label>
-                <input type="number" 
-                       id="fingerswitchTime{{loop.index}}" 
-                       min="1" 
-                       max="9999" 
-                       value="5">
-                <button onclick="triggerFingerswitch({{loop.index}})">Activate Fingerswitch</button>
-            </div>
-            <div class="tool-info">
-                <strong>Connected Tool:</strong> 
-                <span id="toolInfo{{loop.index}}">{{ status[channel]['tool'] }}</span>
-                <br>
-                <strong>Max Temperature:</strong> 
-                <span id="maxTemp{{loop.index}}">
-                    {% set tool_info = get_tool_info(status[channel]['tool_type']) %}
-                    {{ tool_info.max_temp }}°C
-                </span>
-            </div>
-        </div>
-        <div class="tool-info-extended">
-            <h3>Tool Information</h3>
-            <div id="toolInfo{{loop.index}}">
-                <p><strong>Name:</strong> <span class="tool-name"></span></p>
-                <p><strong>Power:</strong> <span class="tool-power"></span></p>
-                <p><strong>Max Temperature:</strong> <span class="tool-max-temp"></span></p>
-                <p><strong>Description:</strong> <span class="tool-description"></span></p>
-            </div>
-        </div>
-        <div class="remote-controls">
-            <h3>Remote Control</h3>
-            <button onclick="setRemoteMode(0)">Disable Remote</button>
-            <button onclick="setRemoteMode(1)">Enable Remote</button>
-            <button onclick="setRemoteMode(2)">Enable with Lock</button>
-        </div>
-        <div class="chart" id="chart{{loop.index}}"></div>
-    </div>
-    {% endfor %}
-</body>
-</html>
-'''
-
-class StationStatus(IntEnum):
-    OFF = 0
-    ON = 1
-    STANDBY = 2
-    AUTOOFF = 3
-
-class ConnectionType(IntEnum):
-    FRONT = 1
-    REAR = 2
-
-class ToolType(IntEnum):
-    NOTOOL = 0
-    WXP120 = 1
-    WXP200 = 2
-    WXMP = 3
-    WXMT = 4
-    WXP65 = 5
-    WXP80 = 6
-    WXB200 = 7
-
-    @classmethod
-    def get_name(cls, value):
-        try:
-            return cls(value).name
-        except ValueError:
-            return "UNKNOWN"
-
-class RemoteMode(IntEnum):
-    DISABLED = 0
-    ENABLED = 1
-    ENABLED_WITH_LOCK = 2
-
-class WellerError(Exception):
-    """Custom exception for Weller station errors"""
-    pass
-
-def retry_on_error(retries=3, delay=1):
-    """Decorator for retrying failed commands"""
-    def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            last_error = None
-            for _ in range(retries):
-                try:
-                    return func(*args, **kwargs)
-                except WellerError as e:
-                    last_error = e
-                    time.sleep(delay)
-            raise last_error
-        return wrapper
-    return decorator
-
-class WebConfig:
-    def __init__(self, port=5000, username=None, password=None):
-        self.port = port
-        self.username = username
-        self.password = password
-
-# Lägg till ny hjälpklass för temperaturkonvertering
-class TemperatureConverter:
-    @staticmethod
-    def to_internal(temp: float) -> int:
-        """Convert temperature from °C to internal representation (1/10°C)"""
-        return int(temp * 10)
-    
-    @staticmethod
-    def from_internal(value: int) -> float:
-        """Convert temperature from internal representation to °C"""
-        return value / 10.0
-
-# Lägg till efter existerande klasser
-class ResponseParser:
-    """Parser för Weller station-svar"""
-    @staticmethod
-    def parse_response(response: str, expected_prefix: str) -> Dict[str, Union[str, int, float]]:
-        """Parse a response from the station with validation"""
-        if not response or len(response) < 3:
-            raise WellerError("Response too short")
-            
-        if not response.startswith(expected_prefix):
-            raise WellerError(f"Expected prefix {expected_prefix}, got {response[:2]}")
-            
-        result = {
-            'raw': response,
-            'prefix': response[:2],
-            'checksum': response[-1]
-        }
-        
-        # Parse based on command type
-        if expected_prefix in ['R1', 'S1', 'T1', 'U1']:  # Temperature commands
-            result['value'] = float(response[2:6]) / 10.0
-        elif expected_prefix == 'Q1':  # Status command
-            result['ch1_status'] = int(response[2])
-            result['ch2_status'] = int(response[3])
-        elif expected_prefix == 'Y1':  # Tool type command
-            result['ch1_tool'] = int(response[2])
-            result['ch2_tool'] = int(response[9]) if len(response) >= 10 else None
-            
-        return result
-
-class WellerStation:
-    @staticmethod
-    def list_available_ports():
-        """List all available COM ports"""
-        ports = []
-        for port in serial.tools.list_ports.comports():
-            ports.append({
-                'port': port.device,
-                'description': port.description,
-                'manufacturer': port.manufacturer
-            })
-        return ports
-
-    @staticmethod
-    def find_weller_port():
-        """Try to automatically find the Weller station port"""
-        for port in serial.tools.list_ports.comports():
-            # Look for common USB-Serial adapters or Weller in description
-            if any(x in port.description.lower() for x in ['weller', 'usb', 'serial', 'uart', 'cp210x', 'ch340']):
-                return port.device
-        return None
-
-    def __init__(self, port=None, baudrate=1200, log_file=None, max_history=1000, web_interface=False, web_config=None):
-        """Initialize WellerStation with automatic port discovery"""
-        if port is None:
-            port = self.find_weller_port()
-            if port is None:
-                available_ports = self.list_available_ports()
-                raise WellerError(
-                    f"No Weller station found. Available ports:\n" +
-                    "\n".join([f"{p['port']}: {p['description']}"] for p in available_ports)
-                )
-        
-        try:
-            self.ser = serial.Serial(
-                port=port,
-                baudrate=baudrate,
-                bytesize=8,
-                parity=serial.PARITY_NONE,
-                stopbits=serial.STOPBITS_ONE,
-                timeout=1
-            )
-        except serial.SerialException as e:
-            available_ports = self.list_available_ports()
-            raise WellerError(
-                f"Failed to open port {port}. Error: {str(e)}\n"
-                f"Available ports:\n" +
-                "\n".join([f"{p['port']}: {p['description']}"] for p in available_ports)
-            )
-
-        self.status_map = {
-            StationStatus.OFF: "OFF",
-            StationStatus.ON: "ON",
-            StationStatus.STANDBY: "STANDBY",
-            StationStatus.AUTOOFF: "AUTO-OFF"
-        }
-        
-        # Add logging setup
-        self.logger = logging.getLogger('WellerStation')
-        if log_file:
-            handler = logging.FileHandler(log_file)
-            handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
-            self.logger.addHandler(handler)
-        self.logger.setLevel(logging.INFO)
-
-        self.temperature_history = {
-            'channel1': deque(maxlen=max_history),
-            'channel2': deque(maxlen=max_history)
-        }
-        self.last_status = None
-        self.connection_type = None
-        self.temp_limits = {'min': 50, 'max': 450}  # Default temperature limits in °C
-        self.web_interface = web_interface
-        self.web_config = web_config or WebConfig()
-        self.start_time = datetime.now()
-        if web_interface:
-            self.start_web_interface()
-
-    def calculate_checksum(self, command: str) -> str:
-        """Enhanced checksum calculation with validation"""
-        if not command:
-            raise WellerError("Empty command")
-            
-        try:
-            sum_ascii = sum(ord(c) for c in command)
-            # Log detailed calculation
-            self.logger.debug(f"Checksum calculation for '{command}':")
-            self.logger.debug(f"ASCII values: {[ord(c) for c in command]}")
-            self.logger.debug(f"Sum: {sum_ascii}")
-            
-            while sum_ascii > 255:
-                sum_ascii -= 256
-                self.logger.debug(f"Adjusted sum: {sum_ascii}")
-                
-            return chr(sum_ascii)
-        except Exception as e:
-            raise WellerError(f"Checksum calculation failed: {str(e)}")
-
-    def verify_checksum(self, response: str) -> bool:
-        """Enhanced checksum verification with detailed reporting"""
-        if len(response) < 2:
-            self.logger.error("Response too short for checksum verification")
-            return False
-            
-        data = response[:-1]
-        received_checksum = response[-1]
-        calculated_checksum = self.calculate_checksum(data)
-        
-        if received_checksum != calculated_checksum:
-            self.logger.error(
-                f"Checksum mismatch:\n"
-                f"Received: {ord(received_checksum)} ({received_checksum})\n"
-                f"Calculated: {ord(calculated_checksum)} ({calculated_checksum})\n"
-                f"Data: {[ord(c) for c in data]}"
-            )
-            return False
-        return True
-
-    @retry_on_error(retries=3)
-    def send_command(self, command: Union[str, bytes], expect_response=True, cmd_type=None) -> Optional[str]:
-        """Enhanced command sending with validation"""
-        try:
-            if isinstance(command, str):
-                command = command.encode()
-                
-            self.logger.debug(f"Sending command: {command!r}")
-            self.ser.write(command)
-            
-            if expect_response:
-                response = self.ser.readline().decode().strip()
-                if not response:
-                    raise WellerError("No response received")
-                    
-                self.logger.debug(f"Raw response: {response!r}")
-                
-                if cmd_type and not WellerCommand.validate_response_length(cmd_type, response):
-                    raise WellerError(f"Invalid response length for {cmd_type}")
-                    
-                if not self.verify_checksum(response):
-                    self.logger.error(f"Checksum failed for response: {response!r}")
-                    raise WellerError("Checksum validation failed")
-                    
-                return response
-                
-        except serial.SerialException as e:
-            raise WellerError(f"Serial communication error: {e}")
-
-    def enable_remote(self):
-        self.send_command(b"remote1")
-        
-    def disable_remote(self):
-        self.send_command(b"remote0", expect_response=False)
-        
-    def read_status(self):
-        response = self.send_command(b"Q")
-        if len(response) >= 7:
-            status_ch1 = response[2]
-            status_ch2 = response[3]
-            return {
-                'channel1': int(status_ch1),
-                'channel2': int(status_ch2)
-            }
-        return None
-        
-    def read_temperature(self) -> Dict[str, float]:
-        """Read temperature with enhanced error handling"""
-        response = self.send_command(b"R", cmd_type='read_temperature')
-        return WellerResponse.parse_temperature_response(response)
-        
-    def set_temperature(self, channel: int, temp: float) -> None:
-        """Set temperature with enhanced validation"""
-        command = WellerCommand.build_temp_command('s', channel, temp)
-        checksum = self.calculate_checksum(command)
-        full_command = f"{command}{checksum}".encode()
-        self.send_command(full_command, expect_response=False)
-        
-    def set_status(self, ch1_status, ch2_status):
-        command = f"q1{ch1_status}{ch2_status}00"
-        checksum = self.calculate_checksum(command)
-        full_command = f"{command}{checksum}".encode()
-        self.send_command(full_command, expect_response=False)
-        
-    def read_tool_type(self):
-        response = self.send_command(b"Y")
-        tool_types = {
-            '0': 'NOTOOL',
-            '1': 'WXP120',
-            '2': 'WXP200',
-            '3': 'WXMP',
-            '4': 'WXMT',
-            '5': 'WXP65',
-            '6': 'WXP80',
-            '7': 'WXB200'
-        }
-        if len(response) >= 14:
-            tool1 = tool_types.get(response[2], 'Unknown')
-            tool2 = tool_types.get(response[9], 'Unknown')
-            return {'channel1': tool1, 'channel2': tool2}
-        return None
-
-    def close(self):
-        self.ser.close()
-
-    def enable_remote_with_lock(self):
-        """Enable remote control with front button lock"""
-        return self.send_command(b"remote2")
-
-    def read_unit_id(self):
-        """Read the unit ID and return model information"""
-        response = self.send_command(b"?")
-        if len(response) >= 3:
-            models = {
-                '1': 'WX 1',
-                '2': 'WX 2',
-                '3': 'WX 2D',
-                '4': 'WX 2A',
-                '5': 'WX 1D',
-                '6': 'WX 1A'
-            }
-            return models.get(response[2], 'Unknown')
-        return None
-
-    def read_set_temperature(self):
-        """Read the set temperature for both channels"""
-        response = self.send_command(b"S")
-        if len(response) >= 14:
-            temp1 = float(response[2:6]) / 10.0
-            temp2 = float(response[9:13]) / 10.0
-            return {'channel1': temp1, 'channel2': temp2}
-        return None
-
-    def read_preset_temperature1(self):
-        """Read preset temperature 1 for both channels"""
-        response = self.send_command(b"T")
-        if len(response) >= 14:
-            temp1 = float(response[2:6]) / 10.0
-            temp2 = float(response[9:13]) / 10.0
-            return {'channel1': temp1, 'channel2': temp2}
-        return None
-
-    def read_preset_temperature2(self):
-        """Read preset temperature 2 for both channels"""
-        response = self.send_command(b"U")
-        if len(response) >= 14:
-            temp1 = float(response[2:6]) / 10.0
-            temp2 = float(response[9:13]) / 10.0
-            return {'channel1': temp1, 'channel2': temp2}
-        return None
-
-    def set_preset_temperature1(self, channel, temp):
-        """Set preset temperature 1 for specified channel"""
-        temp_str = f"{int(temp*10):04d}"
-        command = f"t{channel}{temp_str}"
-        checksum = self.calculate_checksum(command)
-        full_command = f"{command}{checksum}".encode()
-        self.send_command(full_command, expect_response=False)
-
-    def set_preset_temperature2(self, channel, temp):
-        """Set preset temperature 2 for specified channel"""
-        temp_str = f"{int(temp*10):04d}"
-        command = f"u{channel}{temp_str}"
-        checksum = self.calculate_checksum(command)
-        full_command = f"{command}{checksum}".encode()
-        self.send_command(full_command, expect_response=False)
-
-    def read_firmware_version(self):
-        """Read the firmware version"""
-        response = self.send_command(b"V")
-        if len(response) >= 6:
-            return response[2:6]
-        return None
-
-    def verify_firmware_compatibility(self):
-        """Check if firmware version is compatible (>= 0.64)"""
-        version = self.read_firmware_version()
-        if version:
-            try:
-                version_num = float(version) / 100  # Convert format like "0064" to 0.64
-                if version_num < 0.64:
-                    self.logger.warning(f"Firmware version {version_num} might not support all features")
-                return version_num >= 0.64
-            except ValueError:
-                return False
-        return False
-
-    def log_temperature_data(self):
-        """Log temperature data to file if logging is enabled"""
-        temps = self.read_temperature()
-        if temps:
-            self.logger.info(f"Temperature data: CH1={temps['channel1']}°C, CH2={temps['channel2']}°C")
-
-    def fingerswitch_action(self, channel, seconds):
-        """Trigger fingerswitch action for specified channel"""
-        seconds_str = f"{int(seconds):04d}"
-        command = f"x{channel}{seconds_str}"
-        checksum = self.calculate_checksum(command)
-        full_command = f"{command}{checksum}".encode()
-        self.send_command(full_command, expect_response=False)
-
-    def get_status_string(self, status_code):
-        """Convert status code to readable string"""
-        return self.status_map.get(StationStatus(int(status_code)), "UNKNOWN")
-
-    def read_all_status(self):
-        """Read comprehensive status of the station"""
-        status = self.read_status()
-        temps = self.read_temperature()
-        tools = self.read_tool_type()
-        
-        if all([status, temps, tools]):
-            return {
-                'channel1': {
-                    'status': self.get_status_string(status['channel1']),
-                    'temperature': temps['channel1'],
-                    'tool': tools['channel1']
-                },
-                'channel2': {
-                    'status': self.get_status_string(status['channel2']),
-                    'temperature': temps['channel2'],
-                    'tool': tools['channel2']
-                }
-            }
-        return None
-
-    def set_channel_mode(self, channel, mode):
-        """Set channel mode (ON/OFF/STANDBY/AUTOOFF)"""
-        if not isinstance(mode, StationStatus):
-            raise ValueError("Mode must be a StationStatus enum value")
-        
-        current_status = self.read_status()
-        if current_status:
-            if channel == 1:
-                self.set_status(mode.value, current_status['channel2'])
-            else:
-                self.set_status(current_status['channel1'], mode.value)
-
-    def monitor_status(self, interval=1.0):
-        """Monitor station status continuously"""
-        try:
-            while True:
-                status = self.read_all_status()
-                if status:
-                    print("\033[2J\033[H")  # Clear screen
-                    print("=== Weller Station Status ===")
-                    for channel in ['channel1', 'channel2']:
-                        print(f"\n{channel.upper()}:")
-                        print(f"Status: {status[channel]['status']}")
-                        print(f"Temperature: {status[channel]['temperature']}°C")
-                        print(f"Tool: {status[channel]['tool']}")
-                    print("\nPress Ctrl+C to stop monitoring")
-                time.sleep(interval)
-        except KeyboardInterrupt:
-            print("\nMonitoring stopped")
-
-    def enhanced_monitor(self, interval=1.0, log_data=True):
-        """Enhanced monitoring with additional features"""
-        try:
-            print("Initializing enhanced monitoring...")
-            
-            # Try legacy mode if modern fails
-            try:
-                self.enable_remote()
-            except WellerError:
-                print("Trying legacy remote mode...")
-                self.enable_remote_legacy()
-            
-            self.detect_connection_type()
-            
-            while True:
-                status = self.read_all_status()
-                self.update_history()
-                
-                if status:
-                    print("\033[2J\033[H")  # Clear screen
-                    print(f"=== Weller Station Enhanced Status ({self.connection_type.name} Connection) ===")
-                    print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-                    
-                    for channel in ['channel1', 'channel2']:
-                        print(f"\n{channel.upper()}:")
-                        print(f"Status: {status[channel]['status']}")
-                        print(f"Current Temp: {status[channel]['temperature']}°C")
-                        
-                        # Add temperature statistics
-                        stats = self.get_temperature_statistics(channel)
-                        if stats:
-                            print(f"Min/Max/Avg: {stats['min']:.1f}°C / {stats['max']:.1f}°C / {stats['avg']:.1f}°C")
-                        
-                        # Show presets and tool info
-                        presets = self.read_preset_temperature1()
-                        if presets:
-                            print(f"Preset 1: {presets[channel]}°C")
-                        presets = self.read_preset_temperature2()
-                        if presets:
-                            print(f"Preset 2: {presets[channel]}°C")
-                        print(f"Tool: {status[channel]['tool']}")
-                    
-                    print(f"\nTemperature Limits: {self.temp_limits['min']}°C - {self.temp_limits['max']}°C")
-                    print("\nPress Ctrl+C to stop monitoring")
-                
-                if log_data:
-                    self.log_temperature_data()
-                    
-                time.sleep(interval)
-                
-        except KeyboardInterrupt:
-            print("\nMonitoring stopped")
-        except WellerError as e:
-            print(f"\nError: {e}")
-
-    def set_temperature_limits(self, min_temp: int, max_temp: int) -> None:
-        """Set safety temperature limits"""
-        if not (0 <= min_temp < max_temp <= 550):
-            raise ValueError("Invalid temperature limits")
-        self.temp_limits = {'min': min_temp, 'max': max_temp}
-
-    def detect_connection_type(self) -> Optional[ConnectionType]:
-        """Detect whether front or rear connection is used"""
-        response = self.send_command(b"remote1")
-        if "FRONT" in response:
-            self.connection_type = ConnectionType.FRONT
-        elif "REAR" in response:
-            self.connection_type = ConnectionType.REAR
-        return self.connection_type
-
-    def save_temperature_profile(self, name: str) -> None:
-        """Save current temperature settings as a profile"""
-        profile = {
-            'set_temps': self.read_set_temperature(),
-            'preset1': self.read_preset_temperature1(),
-            'preset2': self.read_preset_temperature2(),
-            'timestamp': datetime.now().isoformat()
-        }
-        
-        try:
-            with open(f"{name}_profile.json", 'w') as f:
-                json.dump(profile, f, indent=2)
-        except Exception as e:
-            self.logger.error(f"Failed to save profile: {e}")
-
-    def load_temperature_profile(self, name: str) -> bool:
-        """Load and apply a saved temperature profile"""
-        try:
-            with open(f"{name}_profile.json", 'r') as f:
-                profile = json.load(f)
-                
-            # Apply temperatures with safety checks
-            for channel in [1, 2]:
-                if 'set_temps' in profile:
-                    temp = profile['set_temps'][f'channel{channel}']
-                    if self.temp_limits['min'] <= temp <= self.temp_limits['max']:
-                        self.set_temperature(channel, temp)
-                
-            return True
-        except Exception as e:
-            self.logger.error(f"Failed to load profile: {e}")
-            return False
-
-    def update_history(self) -> None:
-        """Update temperature history"""
-        temps = self.read_temperature()
-        if temps:
-            timestamp = datetime.now()
-            for channel in ['channel1', 'channel2']:
-                self.temperature_history[channel].append({
-                    'timestamp': timestamp,
-                    'temperature': temps[channel]
-                })
-
-    def get_temperature_statistics(self, channel: str) -> Dict:
-        """Get temperature statistics for a channel"""
-        if not self.temperature_history[channel]:
-            return {}
-            
-        temps = [entry['temperature'] for entry in self.temperature_history[channel]]
-        return {
-            'min': min(temps),
-            'max': max(temps),
-            'avg': sum(temps) / len(temps),
-            'current': temps[-1]
-        }
-
-    def enable_remote_legacy(self):
-        """Enable remote control for legacy firmware (<0.52)"""
-        self.send_command(b"REMOTE")
-        return self.read_unit_id()
-
-    def export_temperature_log(self, filename: str) -> None:
-        """Export temperature history to CSV file"""
-        try:
-            with open(filename, 'w', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow(['Timestamp', 'Channel', 'Temperature'])
-                for channel in ['channel1', 'channel2']:
-                    for entry in self.temperature_history[channel]:
-                        writer.writerow([
-                            entry['timestamp'].isoformat(),
-                            channel,
-                            entry['temperature']
-                        ])
-        except Exception as e:
-            self.logger.error(f"Failed to export temperature log: {e}")
-
-    def get_uptime(self):
-        """Get station uptime"""
-        delta = datetime.now() - self.start_time
-        hours = delta.total_seconds() / 3600
-        return f"{hours:.1f} hours"
-
-    def start_web_interface(self):
-        """Start enhanced web interface with full control"""
-        app = Flask(__name__)
-        
-        if self.web_config.username and self.web_config.password:
-            app.config['BASIC_AUTH_USERNAME'] = self.web_config.username
-            app.config['BASIC_AUTH_PASSWORD'] = self.web_config.password
-            app.config['BASIC_AUTH_FORCE'] = True
-            basic_auth = BasicAuth(app)
-        
-        @app.route('/')
-        def home():
-            status = self.read_all_status()
-            station_info = {
-                'model': self.read_unit_id(),
-                'firmware': self.read_firmware_version(),
-                'connection': self.connection_type.name if self.connection_type else 'Unknown',
-                'temp_limits': self.temp_limits,
-                'uptime': self.get_uptime(),
-                'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'connection_status': 'Connected' if status else 'Disconnected'
-            }
-            return render_template_string(html_template, 
-            status=status,
-            stats={
-                'channel1': self.get_temperature_statistics('channel1'),
-                'channel2': self.get_temperature_statistics('channel2')
-            },
-            presets=self.get_preset_temperatures(),
-            station_info=station_info,
-            get_tool_info=get_tool_info  # Lägg till denna rad
-        )
-
-        @app.route('/api/set_temperature/<int:channel>/<float:temp>', methods=['OPTIONS'])
-        def options_handler():
-            return '', 200
-
-        @app.route('/api/set_temperature/<int:channel>/<float:temp>', methods=['POST'])
-        def api_set_temperature(channel, temp):
-            try:
-                # Validate temperature range
-                if not (self.temp_limits['min'] <= temp <= self.temp_limits['max']):
-                    raise ValueError(f"Temperature must be between {self.temp_limits['min']} and {self.temp_limits['max']}°C")
-                
-                self.set_temperature(channel, temp)
-                return jsonify({
-                    'success': True,
-                    'message': f'Temperature set to {temp}°C',
-                    'temperature': temp,
-                    'channel': channel
-                })
-            except Exception as e:
-                return jsonify({
-                    'success': False,
-                    'error': str(e)
-                }), 400
-
-        @app.route('/api/set_mode/<int:channel>/<string:mode>', methods=['POST'])
-        def api_set_mode(channel, mode):
-            try:
-                mode_map = {'ON': StationStatus.ON, 'OFF': StationStatus.OFF, 
-                           'STANDBY': StationStatus.STANDBY, 'AUTOOFF': StationStatus.AUTOOFF}
-                self.set_channel_mode(channel, mode_map[mode])
-                return jsonify({'success': True})
-            except Exception as e:
-                return jsonify({'error': str(e)}), 400
-
-        @app.route('/api/status')
-        def api_status():
-            status = self.read_all_status()
-            temps = self.read_temperature()
-            stats = {
-                'channel1': self.get_temperature_statistics('channel1'),
-                'channel2': self.get_temperature_statistics('channel2')
-            }
-            return jsonify({
-                'status': status,
-                'temperatures': temps,
-                'statistics': stats,
-                'timestamp': datetime.now().isoformat()
-            })
-
-        @app.route('/api/temperature_history/<channel>')
-        def api_temperature_history(channel):
-            history = self.temperature_history[f'channel{channel}']
-            return jsonify({
-                'temperatures': [entry['temperature'] for entry in history],
-                'timestamps': [entry['timestamp'].isoformat() for entry in history]
-            })
-
-        @app.route('/api/fingerswitch/<int:channel>/<int:seconds>', methods=['POST'])
-        def trigger_fingerswitch(channel, seconds):
-            try:
-                station.fingerswitch_action(channel, seconds)
-                return jsonify({'success': True})
-            except Exception as e:
-                return jsonify({'success': False, 'error': str(e)}), 400
-
-        @app.route('/api/remote_mode/<int:mode>', methods=['POST'])
-        def set_remote_mode(mode):
-            try:
-                station.set_remote_mode(RemoteMode(mode))
-                return jsonify({'success': True, 'mode': mode})
-            except Exception as e:
-                return jsonify({'success': False, 'error': str(e)}), 400
-
-        @app.route('/api/tool_info/<int:channel>')
-        def get_tool_info(channel):
-            try:
-                info = station.get_detailed_tool_info(channel)
-                return jsonify({'success': True, 'info': info})
-            except Exception as e:
-                return jsonify({'success': False, 'error': str(e)}), 400
-
-        @app.route('/api/connection_details')
-        def get_connection_details():
-            try:
-                details = station.get_connection_details()
-                return jsonify({'success': True, 'details': details})
-            except Exception as e:
-                return jsonify({'success': False, 'error': str(e)}), 400
-
-        def run_flask():
-            app.run(port=self.web_config.port, host='0.0.0.0')
-
-        threading.Thread(target=run_flask, daemon=True).start()
-
-    def get_preset_temperatures(self):
-        """Helper method to get all preset temperatures"""
-        preset1 = self.read_preset_temperature1() or {'channel1': None, 'channel2': None}
-        preset2 = self.read_preset_temperature2() or {'channel1': None, 'channel2': None}
-        return {
-            'channel1': {
-                'preset1': preset1['channel1'],
-                'preset2': preset2['channel1']
-            },
-            'channel2': {
-                'preset1': preset1['channel2'],
-                'preset2': preset2['channel2']
-            }
-        }
-
-    def set_remote_mode(self, mode: RemoteMode) -> None:
-        """Set remote control mode"""
-        command = f"remote{mode.value}"
-        response = self.send_command(command.encode())
-        if mode != RemoteMode.DISABLED:
-            # Verify response contains unit ID
-            if not response or not response.startswith('?1'):
-                raise WellerError("Invalid response for remote mode setting")
-        self.remote_mode = mode
-
-    def get_detailed_tool_info(self, channel: int) -> dict:
-        """Get detailed information about connected tool"""
-        tool_info = {
-            ToolType.WXP120: {
-                'name': 'WXP 120',
-                'max_temp': 450,
-                'power': '120W',
-                'description': 'High-power soldering iron'
-            },
-            ToolType.WXP200: {
-                'name': 'WXP 200',
-                'max_temp': 450,
-                'power': '200W',
-                'description': 'High-power soldering iron'
-            },
-            ToolType.WXMP: {
-                'name': 'WXMP',
-                'max_temp': 450,
-                'power': '40W',
-                'description': 'Micro soldering iron'
-            },
-            ToolType.WXMT: {
-                'name': 'WXMT',
-                'max_temp': 450,
-                'power': '120W',
-                'description': 'Desoldering tweezers'
-            },
-            ToolType.WXP65: {
-                'name': 'WXP 65',
-                'max_temp': 450,
-                'power': '65W',
-                'description': 'Standard soldering iron'
-            },
-            ToolType.WXP80: {
-                'name': 'WXP 80',
-                'max_temp': 450,
-                'power': '80W',
-                'description': 'Standard soldering iron'
-            },
-            ToolType.WXB200: {
-                'name': 'WXB 200',
-                'max_temp': 450,
-                'power': '200W',
-                'description': 'Bath'
-            }
-        }
-        
-        tool_type = self.get_tool_type(channel)
-        return tool_info.get(tool_type, {
-            'name': 'Unknown/No Tool',
-            'max_temp': 450,
-            'power': 'N/A',
-            'description': 'Unknown tool or no tool connected'
-        })
-
-    def get_connection_details(self) -> Dict[str, str]:
-        """Get detailed connection information"""
-        details = {
-            'type': self.connection_type.name if self.connection_type else 'Unknown',
-            'mode': self.remote_mode.name if hasattr(self, 'remote_mode') else 'Unknown',
-            'button_lock': 'Enabled' if hasattr(self, 'button_lock') and self.button_lock else 'Disabled',
-            'firmware_version': self.read_firmware_version() or 'Unknown'
-        }
-        return details
-
-class DemoWellerStation(WellerStation):
-    """Simulated Weller station for demo purposes"""
-    def __init__(self, *args, **kwargs):
-        self.status_map = {
-            StationStatus.OFF: "OFF",
-            StationStatus.ON: "ON",
-            StationStatus.STANDBY: "STANDBY",
-            StationStatus.AUTOOFF: "AUTO-OFF"
-        }
-        self.logger = logging.getLogger('DemoWellerStation')
-        self.temperature_history = {
-            'channel1': deque(maxlen=1000),
-            'channel2': deque(maxlen=1000)
-        }
-        self.connection_type = ConnectionType.FRONT
-        self.temp_limits = {'min': 50, 'max': 450}
-        self.current_temps = {'channel1': 250, 'channel2': 200}
-        self.set_temps = {'channel1': 250, 'channel2': 200}
-        self.current_status = {'channel1': StationStatus.ON, 'channel2': StationStatus.STANDBY}
-        self.tools = {'channel1': 'WXP120', 'channel2': 'WXMP'}
-        self.start_time = datetime.now()
-        self.web_config = kwargs.get('web_config') or WebConfig()
-        self.last_update = datetime.now()
-        self.demo_update_interval = timedelta(seconds=1)
-        self.max_history_points = 100  # Begränsa antalet datapunkter i grafen
-        self.start_demo_updates()
-        self.last_temps = {'channel1': None, 'channel2': None}
-        self.presets = {
-            'channel1': {'preset1': 200, 'preset2': 300},
-            'channel2': {'preset1': 200, 'preset2': 300}
-        }
-        self.remote_mode = RemoteMode.ENABLED
-        self.button_lock = False
-
-    def start_demo_updates(self):
-        """Start a background thread to update demo values"""
-        def update_loop():
-            while True:
-                now = datetime.now()
-                if now - self.last_update >= self.demo_update_interval:
-                    self.update_demo_temperatures()
-                    self.last_update = now
-                time.sleep(0.1)
-
-        thread = threading.Thread(target=update_loop, daemon=True)
-        thread.start()
-
-    def update_demo_temperatures(self):
-        """Update demo temperatures with realistic variations and maintain history"""
-        temps = self.read_temperature()
-        current_time = datetime.now()
-        
-        for channel in ['channel1', 'channel2']:
-            # Trim history if needed
-            while len(self.temperature_history[channel]) >= self.max_history_points:
-                self.temperature_history[channel].popleft()
-            
-            # Add new temperature data
-            self.temperature_history[channel].append({
-                'timestamp': current_time,
-                'temperature': temps[channel]
-            })
-
-    def send_command(self, command, expect_response=True):
-        """Simulate command sending"""
-        return "OK"
-
-    def read_temperature(self) -> Dict[str, float]:
-        """Simulate temperature readings with realistic variations"""
-        now = datetime.now()
-        for channel in ['channel1', 'channel2']:
-            target_temp = self.set_temps[channel]
-            current_temp = self.current_temps[channel]
-            
-            if self.current_status[channel] == StationStatus.ON:
-                if self.last_temps[channel] is None:
-                    self.last_temps[channel] = current_temp
-                
-                # Mer realistisk temperaturvariation
-                noise = random.uniform(-0.5, 0.5)
-                if abs(current_temp - target_temp) > 1:
-                    # Gradvis närma sig måltemperaturen
-                    direction = 1 if target_temp > current_temp else -1
-                    delta = min(2.0, abs(target_temp - current_temp)) * direction
-                    new_temp = self.last_temps[channel] + delta + noise
-                else:
-                    # Små variationer runt måltemperaturen
-                    new_temp = target_temp + noise
-                
-                self.current_temps[channel] = new_temp
-                self.last_temps[channel] = new_temp
-                
-            elif self.current_status[channel] == StationStatus.STANDBY:
-                # Gradvis nedkylning till standby-temperatur (150°C)
-                if current_temp > 150:
-                    self.current_temps[channel] = max(150, current_temp - 1)
-            elif self.current_status[channel] == StationStatus.OFF:
-                # Snabbare nedkylning när avstängd
-                self.current_temps[channel] = max(25, current_temp - 2)
-        
-        return self.current_temps.copy()
-
-    def read_status(self):
-        return {
-            'channel1': self.current_status['channel1'].value,
-            'channel2': self.current_status['channel2'].value
-        }
-
-    def set_temperature(self, channel: int, temp: float) -> None:
-        """Set temperature with proper conversion in demo mode"""
-        try:
-            internal_temp = TemperatureConverter.to_internal(temp)
-            if not (self.temp_limits['min'] <= temp <= self.temp_limits['max']):
-                raise ValueError(
-                    f"Temperature must be between {self.temp_limits['min']} "
-                    f"and {self.temp_limits['max']}°C"
-                )
-            
-            channel_key = f'channel{channel}'
-            self.set_temps[channel_key] = temp
-            self.current_temps[channel_key] = temp
-            
-            # Uppdatera temperaturhistorik
-            self.temperature_history[channel_key].append({
-                'timestamp': datetime.now(),
-                'temperature': temp,
-                'internal_value': internal_temp
-            })
-            
-            return True
-        except ValueError as e:
-            raise ValueError(f"Invalid temperature value: {str(e)}")
-
-    def set_status(self, ch1_status, ch2_status):
-        self.current_status['channel1'] = StationStatus(ch1_status)
-        self.current_status['channel2'] = StationStatus(ch2_status)
-
-    def read_tool_type(self):
-        return self.tools.copy()
-
-    def read_firmware_version(self):
-        return "0064"  # Demo firmware version
-
-    def read_unit_id(self):
-        return "WX 2 (Demo)"
-
-    def read_all_status(self):
-        """Read comprehensive status including temperature history"""
-        temps = self.read_temperature()
-        status = self.read_status()
-        
-        return {
-            'channel1': {
-                'status': self.get_status_string(self.current_status['channel1']),
-                'temperature': temps['channel1'],
-                'tool': self.tools['channel1']
-            },
-            'channel2': {
-                'status': self.get_status_string(self.current_status['channel2']),
-                'temperature': temps['channel2'],
-                'tool': self.tools['channel2']
-            }
-        }
-
-    def start_web_interface(self):
-        app = Flask(__name__)
-        
-        @app.after_request
-        def after_request(response):
-            headers = {
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS',
-                'Access-Control-Allow-Headers': 'Content-Type, Authorization',
-                'Access-Control-Max-Age': '3600'
-            }
-            for key, value in headers.items():
-                response.headers.add(key, value)
-            return response
-
-        @app.route('/')
-        def home():
-            try:
-                status = self.read_all_status()
-                station_info = {
-                    'model': self.read_unit_id(),
-                    'firmware': self.read_firmware_version(),
-                    'connection': self.connection_type.name if self.connection_type else 'Unknown',
-                    'temp_limits': self.temp_limits,
-                    'uptime': self.get_uptime(),
-                    'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                    'connection_status': 'Connected' if status else 'Disconnected'
-                }
-                return render_template_string(html_template,
-                    status=status,
-                    stats={
-                        'channel1': self.get_temperature_statistics('channel1'),
-                        'channel2': self.get_temperature_statistics('channel2')
-                    },
-                    presets=self.get_preset_temperatures(),
-                    station_info=station_info,
-                    get_tool_info=get_tool_info  # Lägg till denna rad
-                )
-            except Exception as e:
-                app.logger.error(f"Error in home route: {str(e)}")
-                return jsonify({
-                    'success': False,
-                    'error': f"Error loading interface: {str(e)}"
-                }), 500
-
-        @app.route('/api/set_temperature/<int:channel>/<float:temp>', methods=['POST', 'OPTIONS'])
-        def set_temperature_handler(channel, temp):
-            if request.method == 'OPTIONS':
-                return '', 204
-
-            try:
-                if channel not in [1, 2]:
-                    return jsonify({
-                        'success': False,
-                        'error': "Invalid channel"
-                    }), 400
-
-                if not (self.temp_limits['min'] <= temp <= self.temp_limits['max']):
-                    return jsonify({
-                        'success': False,
-                        'error': f"Temperature must be between {self.temp_limits['min']} and {self.temp_limits['max']}°C"
-                    }), 400
-
-                self.set_temperature(channel, temp)
-                return jsonify({
-                    'success': True,
-                    'temperature': temp,
-                    'channel': channel,
-                    'message': f'Temperature set to {temp}°C'
-                })
-            except Exception as e:
-                app.logger.error(f"Temperature setting error: {str(e)}")
-                return jsonify({
-                    'success': False,
-                    'error': str(e)
-                }), 400
-
-        @app.route('/api/set_mode/<int:channel>/<string:mode>', methods=['POST', 'OPTIONS'])
-        def set_mode_handler(channel, mode):
-            if request.method == 'OPTIONS':
-                return '', 204
-
-            try:
-                mode_map = {'ON': StationStatus.ON, 'OFF': StationStatus.OFF, 
-                           'STANDBY': StationStatus.STANDBY, 'AUTOOFF': StationStatus.AUTOOFF}
-                if mode not in mode_map:
-                    return jsonify({'success': False, 'error': f'Invalid mode: {mode}'}), 400
-                
-                self.set_channel_mode(channel, mode_map[mode])
-                return jsonify({'success': True, 'mode': mode})
-            except Exception as e:
-                return jsonify({'success': False, 'error': str(e)}), 400
-
-        @app.route('/api/status')
-        def api_status():
-            try:
-                status = self.read_all_status()
-                temps = self.read_temperature()
-                history_data = {'channel1': [], 'channel2': []}
-                for ch in ['channel1', 'channel2']:
-                    history_data[ch] = [{
-                        'temperature': entry['temperature'],
-                        'time': entry['timestamp'].strftime('%H:%M:%S')
-                    } for entry in self.temperature_history[ch]]
-                return jsonify({
-                    'success': True,
-                    'status': status,
-                    'temperatures': temps,
-                    'statistics': {
-                        'channel1': self.get_temperature_statistics('channel1'),
-                        'channel2': self.get_temperature_statistics('channel2')
-                    },
-                    'temperature_history': history_data,
-                    'timestamp': datetime.now().isoformat()
-                })
-            except Exception as e:
-                return jsonify({'success': False, 'error': str(e)}), 400
-
-        @app.route('/api/temperature_history/<channel>')
-        def api_temperature_history(channel):
-            try:
-                history = self.temperature_history[f'channel{channel}']
-                return jsonify({
-                    'success': True,
-                    'temperatures': [entry['temperature'] for entry in history],
-                    'timestamps': [entry['timestamp'].isoformat() for entry in history]
-                })
-            except Exception as e:
-                return jsonify({'success': False, 'error': str(e)}), 400
-
-        @app.route('/api/set_preset/<int:channel>/<int:presetNum>/<float:temp>', methods=['POST'])
-        def set_preset(channel, presetNum, temp):
-            channel_key = f'channel{channel}'
-            if channel_key in self.presets:
-                if presetNum == 1:
-                    self.presets[channel_key]['preset1'] = temp
-                else:
-                    self.presets[channel_key]['preset2'] = temp
-            return jsonify({'success': True, 'presetNum': presetNum, 'temperature': temp})
-
-        @app.route('/api/activate_preset/<int:channel>/<int:presetNum>', methods=['POST'])
-        def activate_preset(channel, presetNum):
-            channel_key = f'channel{channel}'
-            if channel_key in self.presets:
-                if presetNum == 1:
-                    self.set_temperature(channel, self.presets[channel_key]['preset1'])
-                else:
-                    self.set_temperature(channel, self.presets[channel_key]['preset2'])
-            return jsonify({'success': True, 'presetNum': presetNum})
-
-        @app.route('/api/fingerswitch/<int:channel>/<int:seconds>', methods=['POST'])
-        def trigger_fingerswitch(channel, seconds):
-            try:
-                station.fingerswitch_action(channel, seconds)
-                return jsonify({'success': True})
-            except Exception as e:
-                return jsonify({'success': False, 'error': str(e)}), 400
-
-        @app.route('/api/remote_mode/<int:mode>', methods=['POST'])
-        def set_remote_mode(mode):
-            try:
-                station.set_remote_mode(RemoteMode(mode))
-                return jsonify({'success': True, 'mode': mode})
-            except Exception as e:
-                return jsonify({'success': False, 'error': str(e)}), 400
-
-        @app.route('/api/tool_info/<int:channel>')
-        def get_tool_info(channel):
-            try:
-                info = station.get_detailed_tool_info(channel)
-                return jsonify({'success': True, 'info': info})
-            except Exception as e:
-                return jsonify({'success': False, 'error': str(e)}), 400
-
-        @app.route('/api/connection_details')
-        def get_connection_details():
-            try:
-                details = station.get_connection_details()
-                return jsonify({'success': True, 'details': details})
-            except Exception as e:
-                return jsonify({'success': False, 'error': str(e)}), 400
-
-        def run_flask():
-            app.run(port=self.web_config.port, host='0.0.0.0', threaded=True)
-
-        thread = threading.Thread(target=run_flask, daemon=True)
-        thread.start()
-        time.sleep(1)
-
-    def get_preset_temperatures(self):
-        """Helper method to get all preset temperatures"""
-        return {
-            'channel1': {
-                'preset1': self.presets['channel1']['preset1'],
-                'preset2': self.presets['channel1']['preset2']
-            },
-            'channel2': {
-                'preset1': self.presets['channel2']['preset1'],
-                'preset2': self.presets['channel2']['preset2']
-            }
-        }
-
-    def read_preset_temperature1(self):
-        """Simulated read of preset temperature 1"""
-        return {
-            'channel1': self.presets['channel1']['preset1'],
-            'channel2': self.presets['channel2']['preset1']
-        }
-
-    def read_preset_temperature2(self):
-        """Simulated read of preset temperature 2"""
-        return {
-            'channel1': self.presets['channel1']['preset2'],
-            'channel2': self.presets['channel2']['preset2']
-        }
-
-    def set_preset_temperature1(self, channel, temp):
-        """Set preset temperature 1"""
-        channel_key = f'channel{channel}'
-        self.presets[channel_key]['preset1'] = temp
-
-    def set_preset_temperature2(self, channel, temp):
-        """Set preset temperature 2"""
-        channel_key = f'channel{channel}'
-        self.presets[channel_key]['preset2'] = temp
-
-    def set_remote_mode(self, mode: RemoteMode) -> None:
-        """Simulate remote mode setting"""
-        self.remote_mode = mode
-        self.button_lock = (mode == RemoteMode.ENABLED_WITH_LOCK)
-
-# ...rest of DemoWellerStation methods...
-
-# ...rest of existing code...
-
-def show_menu():
-    """Display the main menu"""
-    print("\n=== Weller Station Control ===")
-    print("1. Start Monitor Mode")
-    print("2. Start Enhanced Monitor Mode")
-    print("3. Set Temperature")
-    print("4. Set Channel Mode (ON/OFF/STANDBY)")
-    print("5. Save Temperature Profile")
-    print("6. Load Temperature Profile")
-    print("7. Configure Web Interface")
-    print("8. Start Web Interface")
-    print("9. Export Temperature Log")
-    print("10. Exit")
-    return input("Select option (1-10): ")
-
-def handle_set_temperature(station):
-    """Handle temperature setting menu"""
-    channel = input("Enter channel (1/2): ")
-    if channel not in ['1', '2']:
-        print("Invalid channel")
-        return
-    
-    try:
-        temp = float(input("Enter temperature (50-450°C): "))
-        station.set_temperature(int(channel), temp)
-        print(f"Temperature for channel {channel} set to {temp}°C")
-    except ValueError:
-        print("Invalid temperature value")
-
-def handle_set_mode(station):
-    """Handle mode setting menu"""
-    print("\nAvailable modes:")
-    for mode in StationStatus:
-        print(f"{mode.value}: {mode.name}")
-    
-    channel = input("Enter channel (1/2): ")
-    if channel not in ['1', '2']:
-        print("Invalid channel")
-        return
-    
-    try:
-        mode = int(input("Enter mode number: "))
-        station.set_channel_mode(int(channel), StationStatus(mode))
-        print(f"Channel {channel} mode set to {StationStatus(mode).name}")
-    except ValueError:
-        print("Invalid mode value")
-
-def configure_web_interface():
-    """Configure web interface settings"""
-    print("\n=== Web Interface Configuration ===")
-    port = input("Enter port number (default 5000): ") or "5000"
-    use_auth = input("Enable authentication? (y/n): ").lower() == 'y'
-    
-    username = None
-    password = None
-    if use_auth:
-        username = input("Enter username: ")
-        password = input("Enter password: ")
-    
-    return WebConfig(int(port), username, password)
-
-# Example usage:
-if __name__ == "__main__":
-    try:
-        print("=== Weller Station Control ===")
-        print("1. Connect to real station")
-        print("2. Start demo mode")
-        mode = input("Select mode (1/2): ")
-
-        if mode == "1":
-            # List available ports
-            print("\nAvailable COM ports:")
-            ports = WellerStation.list_available_ports()
-            for port in ports:
-                print(f"{port['port']}: {port['description']}")
-            
-            station = WellerStation(log_file="weller_station.log")
-        else:
-            print("\nStarting demo mode...")
-            station = DemoWellerStation()
-
-        # Enable remote control
-        if isinstance(station, WellerStation):
-            station.enable_remote()
-
-        web_config = None
-
-        while True:
-            choice = show_menu()
-            
-            if choice == "1":
-                station.monitor_status()
-            elif choice == "2":
-                station.enhanced_monitor()
-            elif choice == "3":
-                handle_set_temperature(station)
-            elif choice == "4":
-                handle_set_mode(station)
-            elif choice == "5":
-                name = input("Enter profile name: ")
-                station.save_temperature_profile(name)
-            elif choice == "6":
-                name = input("Enter profile name: ")
-                station.load_temperature_profile(name)
-            elif choice == "7":
-                web_config = configure_web_interface()
-                station.web_config = web_config
-            elif choice == "8":
-                if web_config is None:
-                    web_config = configure_web_interface()
-                    station.web_config = web_config
-                station.start_web_interface()
-                print(f"Web interface started at http://localhost:{web_config.port}")
-            elif choice == "9":
-                filename = f"temp_log_{datetime.now().strftime('%Y%m%d_%H%M')}.csv"
-                station.export_temperature_log(filename)
-                print(f"Log exported to {filename}")
-            elif choice == "10":
-                break
-            else:
-                print("Invalid option")
-
-    except WellerError as e:
-        print(f"Error: {e}")
-    except KeyboardInterrupt:
-        print("\nProgram terminated by user")
-    finally:
-        try:
-            if isinstance(station, WellerStation):
-                station.disable_remote()
-                station.close()
-        except:
-            pass
-
-# Lägg till en ny funktion i det globala scopet (utanför klasserna)
-def get_tool_info(tool_type):
-    """Helper function for getting tool information in templates"""
-    tool_info = {
-        'NOTOOL': {'max_temp': 0},
-        'WXP120': {'max_temp': 450},
-        'WXP200': {'max_temp': 450},
-        'WXMP': {'max_temp': 450},
-        'WXMT': {'max_temp': 450},
-        'WXP65': {'max_temp': 450},
-        'WXP80': {'max_temp': 450},
-        'WXB200': {'max_temp': 450}
-    }
-    return tool_info.get(str(tool_type), {'max_temp': 450})
-
-# Uppdatera start_web_interface metoden i både WellerStation och DemoWellerStation
-class WellerStation:
-    # ...existing code...
-
-    def start_web_interface(self):
-        app = Flask(__name__)
-        
-        # ...existing code...
-        
-        @app.route('/')
-        def home():
-            status = self.read_all_status()
-            station_info = {
-                'model': self.read_unit_id(),
-                'firmware': self.read_firmware_version(),
-                'connection': self.connection_type.name if self.connection_type else 'Unknown',
-                'temp_limits': self.temp_limits,
-                'uptime': self.get_uptime(),
-                'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'connection_status': 'Connected' if status else 'Disconnected'
-            }
-            return render_template_string(html_template, 
-                status=status,
-                stats={
-                    'channel1': self.get_temperature_statistics('channel1'),
-                    'channel2': self.get_temperature_statistics('channel2')
-                },
-                presets=self.get_preset_temperatures(),
-                station_info=station_info,
-                get_tool_info=get_tool_info  # Lägg till denna rad
-            )
-
-        # ...rest of existing code...
-
-class DemoWellerStation(WellerStation):
-    # ...existing code...
-
-    def start_web_interface(self):
-        app = Flask(__name__)
-        
-        # ...existing code...
-        
-        @app.route('/')
-        def home():
-            try:
-                status = self.read_all_status()
-                station_info = {
-                    'model': self.read_unit_id(),
-                    'firmware': self.read_firmware_version(),
-                    'connection': self.connection_type.name if self.connection_type else 'Unknown',
-                    'temp_limits': self.temp_limits,
-                    'uptime': self.get_uptime(),
-                    'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                    'connection_status': 'Connected' if status else 'Disconnected'
-                }
-                return render_template_string(html_template,
-                    status=status,
-                    stats={
-                        'channel1': self.get_temperature_statistics('channel1'),
-                        'channel2': self.get_temperature_statistics('channel2')
-                    },
-                    presets=self.get_preset_temperatures(),
-                    station_info=station_info,
-                    get_tool_info=get_tool_info  # Lägg till denna rad
-                )
-            except Exception as e:
-                app.logger.error(f"Error in home route: {str(e)}")
-                return jsonify({
-                    'success': False,
-                    'error': f"Error loading interface: {str(e)}"
-                }), 500
-
-        # ...rest of existing code...
-
-# Add new command validation class
-class WellerCommand:
-    """Command validator and builder for Weller protocol"""
-    COMMANDS = {
-        'read_unit_id': {'cmd': '?', 'response_len': 7},
-        'read_status': {'cmd': 'Q', 'response_len': 7},
-        'read_temperature': {'cmd': 'R', 'response_len': 14},
-        'read_set_temp': {'cmd': 'S', 'response_len': 14},
-        'read_preset1': {'cmd': 'T', 'response_len': 14},
-        'read_preset2': {'cmd': 'U', 'response_len': 14},
-        'read_firmware': {'cmd': 'V', 'response_len': 7},
-        'read_tool': {'cmd': 'Y', 'response_len': 14},
-    }
-
-    @staticmethod
-    def validate_response_length(cmd_type: str, response: str) -> bool:
-        """Validate response length for command type"""
-        if cmd_type not in WellerCommand.COMMANDS:
-            raise WellerError(f"Unknown command type: {cmd_type}")
-        expected_len = WellerCommand.COMMANDS[cmd_type]['response_len']
-        return len(response) >= expected_len
-
-    @staticmethod
-    def build_temp_command(cmd: str, channel: int, temp: float) -> str:
-        """Build temperature related command with validation"""
-        if cmd not in ['s', 't', 'u']:
-            raise WellerError(f"Invalid temperature command: {cmd}")
-        if not (1 <= channel <= 2):
-            raise WellerError(f"Invalid channel: {channel}")
-            
-        temp_int = int(temp * 10)  # Convert to 1/10°C
-        if not (0 <= temp_int <= 9999):
-            raise WellerError(f"Temperature out of range: {temp}")
-            
-        command = f"{cmd}{channel}{temp_int:04d}"
-        return command
-
-# Add new response parser class
-class WellerResponse:
-    """Enhanced response parser for Weller protocol"""
-    @staticmethod
-    def parse_temperature_response(response: str) -> Dict[str, float]:
-        """Parse temperature response with validation"""
-        if len(response) < 14:
-            raise WellerError("Invalid temperature response length")
-            
-        try:
-            temps = {
-                'channel1': float(response[2:6]) / 10.0,
-                'channel2': float(response[9:13]) / 10.0
-            }
-            return temps
-        except ValueError as e:
-            raise WellerError(f"Invalid temperature format: {e}")
-
-    @staticmethod
-    def parse_tool_response(response: str) -> Dict[str, str]:
-        """Parse tool type response with validation"""
-        if len(response) < 14:
-            raise WellerError("Invalid tool response length")
-            
-        try:
-            tools = {
-                'channel1': int(response[2]),
-                'channel2': int(response[9])
-            }
-            return tools
-        except ValueError as e:
-            raise WellerError(f"Invalid tool type format: {e}")
-
-# Update WellerStation class with new validation methods
-class WellerStation:
-    # ...existing code...
-
-    def send_command(self, command: Union[str, bytes], expect_response=True, cmd_type=None) -> Optional[str]:
-        """Enhanced command sending with validation"""
-        try:
-            if isinstance(command, str):
-                command = command.encode()
-                
-            self.logger.debug(f"Sending command: {command!r}")
-            self.ser.write(command)
-            
-            if expect_response:
-                response = self.ser.readline().decode().strip()
-                if not response:
-                    raise WellerError("No response received")
-                    
-                self.logger.debug(f"Raw response: {response!r}")
-                
-                if cmd_type and not WellerCommand.validate_response_length(cmd_type, response):
-                    raise WellerError(f"Invalid response length for {cmd_type}")
-                    
-                if not self.verify_checksum(response):
-                    self.logger.error(f"Checksum failed for response: {response!r}")
-                    raise WellerError("Checksum validation failed")
-                    
-                return response
-                
-        except serial.SerialException as e:
-            raise WellerError(f"Serial communication error: {e}")
-
-    def set_temperature(self, channel: int, temp: float) -> None:
-        """Set temperature with enhanced validation"""
-        command = WellerCommand.build_temp_command('s', channel, temp)
-        checksum = self.calculate_checksum(command)
-        full_command = f"{command}{checksum}".encode()
-        self.send_command(full_command, expect_response=False)
-
-    def read_temperature(self) -> Dict[str, float]:
-        """Read temperature with enhanced validation"""
-        response = self.send_command(b"R", cmd_type='read_temperature')
-        return WellerResponse.parse_temperature_response(response)
-
-# ...rest of existing code...
-
-
-
-
-
-
-
-
-
+import serial
+import time
+from enum import IntEnum
+import logging
+from datetime import datetime
+import json
+from typing import Dict, List, Optional, Union
+from collections import OrderedDict, deque
+from array import array
+import os
+import mmap
+import struct
+import calendar
+from flask import Blueprint, Flask, Response, jsonify, request
+import threading
+import queue
+import itertools
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+import csv
+import io
+import zlib
+import math
+import asyncio
+import base64
+import hmac
+import hashlib
+from email.utils import formatdate
+from functools import lru_cache, partial
+import serial.tools.list_ports
+import random
+from flask_basicauth import BasicAuth
+import jinja2
+import sys
+try:
+    from aiohttp import web  # Optional: only needed for the asyncio web front end
+except ImportError:
+    web = None
+try:
+    import waitress  # Optional: production web server, see WebConfig.server
+except ImportError:
+    waitress = None
+try:
+    import msgpack  # Optional: MessagePack history and export encoding
+except ImportError:
+    msgpack = None
+
+html_template = '''
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Weller Station Control</title>
+    <style>
+        body { font-family: Arial; padding: 20px; background-color: #f0f0f0; }
+        .channel { 
+            margin: 20px; 
+            padding: 20px; 
+            border: 1px solid #ccc;
+            border-radius: 10px;
+            background-color: white;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        }
+        .controls { margin-top: 15px; }
+        button { 
+            margin: 5px; 
+            padding: 8px 15px; 
+            border: none;
+            border-radius: 5px;
+            background-color: #4CAF50;
+            color: white;
+            cursor: pointer;
+        }
+        button:hover { background-color: #45a049; }
+        .status { margin: 10px 0; }
+        .temp-slider {
+            width: 100%;
+            margin: 10px 0;
+        }
+        .temp-readout {
+            font-size: 24px;
+            font-weight: bold;
+            color: #2196F3;
+        }
+        .stats {
+            display: grid;
+            grid-template-columns: repeat(2, 1fr);
+            gap: 10px;
+            margin: 10px 0;
+        }
+        .stat-item {
+            padding: 5px;
+            background-color: #f8f8f8;
+            border-radius: 5px;
+        }
+        .error { color: red; }
+        .success { color: green; }
+        .station-info {
+            background-color: #e8f5e9;
+            padding: 15px;
+            border-radius: 10px;
+            margin-bottom: 20px;
+        }
+        .chart {
+            height: 200px;
+            margin: 20px 0;
+            background: #f8f8f8;
+            border-radius: 5px;
+        }
+        .temp-control {
+            display: flex;
+            align-items: center;
+            gap: 10px;
+            margin: 15px 0;
+        }
+        .slider-container {
+            flex-grow: 1;
+        }
+        .temp-display {
+            min-width: 80px;
+            text-align: center;
+            font-size: 1.2em;
+        }
+        .settings-btn {
+            position: absolute;
+            top: 20px;
+            right: 20px;
+            padding: 10px;
+            background: #2196F3;
+            border: none;
+            border-radius: 5px;
+            color: white;
+            cursor: pointer;
+        }
+
+        .modal {
+            display: none;
+            position: fixed;
+            top: 0;
+            left: 0;
+            width: 100%;
+            height: 100%;
+            background: rgba(0,0,0,0.5);
+            z-index: 1000;
+        }
+
+        .modal-content {
+            position: relative;
+            background: white;
+            margin: 10% auto;
+            padding: 20px;
+            width: 80%;
+            max-width: 500px;
+            border-radius: 10px;
+        }
+
+        .close-btn {
+            position: absolute;
+            right: 10px;
+            top: 10px;
+            cursor: pointer;
+            font-size: 24px;
+        }
+
+        .settings-group {
+            margin: 15px 0;
+        }
+
+        .settings-group label {
+            display: block;
+            margin-bottom: 5px;
+        }
+    </style>
+    <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
+    <script>
+        let tempValues = {};
+        let sliderValue = {};  // Nytt objekt för att spara slider-värden
+        let charts = {};
+        const MAX_CHART_POINTS = 1000;
+        // API routes live next to the page, e.g. /stations/<id>/api/... in fleet mode
+        const API_BASE = window.location.pathname.replace(/\/$/, '');
+        
+        function updateTempValue(channel, value) {
+            sliderValue[channel] = parseFloat(value);
+            document.getElementById(`tempSliderValue${channel}`).textContent = 
+                Math.round(value) + '°' + settings.unit;
+        }
+        
+        function setTemp(channel) {
+            const temp = sliderValue[channel];
+            if (!temp) {
+                showMessage('Please select a temperature first', true);
+                return;
+            }
+            
+            fetch(`${API_BASE}/api/set_temperature/${channel}/${temp}`, {
+                method: 'POST',
+                headers: {
+                    'Accept': 'application/json',
+                    'Content-Type': 'application/json'
+                }
+            })
+            .then(response => response.json())
+            .then(data => {
+                if (data.success) {
+                    showMessage(`Temperature set to ${data.temperature}°C`, false);
+                    updateDisplay();
+                }
+            })
+            .catch(error => showMessage('Error: ' + error.message, true));
+        }
+
+        function setPreset(channel, presetNum, temp) {
+            fetch(`${API_BASE}/api/set_preset/${channel}/${presetNum}/${temp}`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' }
+            })
+            .then(response => response.json())
+            .then(data => {
+                if (data.success) {
+                    showMessage(`Preset ${presetNum} set to ${Math.round(temp)}°C`, false);
+                    // Force update the display
+                    const presetElement = document.querySelector(`#preset${presetNum}Value${channel}`);
+                    if (presetElement) {
+                        presetElement.textContent = Math.round(temp) + '°C';
+                    }
+                }
+            });
+        }
+
+        function activatePreset(channel, presetNum) {
+            fetch(`${API_BASE}/api/activate_preset/${channel}/${presetNum}`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' }
+            })
+            .then(response => response.json())
+            .then(data => {
+                if (data.success) {
+                    showMessage(`Activated preset ${presetNum}`, false);
+                    updateDisplay();
+                }
+            });
+        }
+
+        // Charts download their history once, then only the samples after their cursor
+        let historyCursor = {};
+        let historyPending = {};
+
+        // Binary history frame, see encode_history() in weller.py
+        function decodeHistory(buffer) {
+            const view = new DataView(buffer);
+            const flags = view.getUint32(4, true);
+            const count = view.getUint32(8, true);
+            const int64 = offset => view.getUint32(offset, true) + view.getInt32(offset + 4, true) * 4294967296;
+            const wide = (flags & 4) !== 0;
+            const times = new Array(count);
+            const temperatures = new Array(count);
+            let offset = 40;
+            let time = int64(32);
+            for (let i = 0; i < count; i++, offset += wide ? 8 : 4) {
+                time += wide ? int64(offset) : view.getInt32(offset, true);
+                times[i] = new Date(time).toTimeString().slice(0, 8);
+            }
+            for (let i = 0; i < count; i++, offset += 2) {
+                temperatures[i] = view.getInt16(offset, true) / 10;
+            }
+            return { times, temperatures, cursor: int64(24), reset: (flags & 2) !== 0 };
+        }
+
+        function updateCharts() {
+            [1, 2].forEach(channel => {
+                if (historyPending[channel]) return;
+                const cursor = historyCursor[channel];
+                const query = cursor === undefined ? '' : `?since=${cursor}`;
+                historyPending[channel] = true;
+                fetch(`${API_BASE}/api/temperature_history/${channel}${query}`, {
+                    headers: { 'Accept': 'application/vnd.weller.history' }
+                })
+                    .then(response => {
+                        if (!response.ok) throw new Error(`History request failed: ${response.status}`);
+                        return response.arrayBuffer();
+                    })
+                    .then(buffer => {
+                        const data = decodeHistory(buffer);
+                        const times = data.times;
+                        if (cursor === undefined || data.reset) {
+                            Plotly.update(`chart${channel}`, {
+                                x: [times],
+                                y: [data.temperatures]
+                            });
+                        } else if (times.length > 0) {
+                            Plotly.extendTraces(`chart${channel}`, {
+                                x: [times],
+                                y: [data.temperatures]
+                            }, [0], MAX_CHART_POINTS);
+                        }
+                        historyCursor[channel] = data.cursor;
+                    })
+                    .catch(console.error)
+                    .finally(() => { historyPending[channel] = false; });
+            });
+        }
+        
+        function showMessage(message, isError) {
+            const msgDiv = document.getElementById('messages');
+            msgDiv.textContent = message;
+            msgDiv.className = isError ? 'error' : 'success';
+            setTimeout(() => msgDiv.textContent = '', 3000);
+        }
+
+        function initializeCharts() {
+            [1, 2].forEach(channel => {
+                const layout = {
+                    title: `Channel ${channel} Temperature`,
+                    xaxis: { title: 'Time' },
+                    yaxis: { 
+                        title: 'Temperature (°C)',
+                        range: [0, 500]
+                    },
+                    height: 300,
+                    margin: { t: 30, r: 10, b: 30, l: 40 }
+                };
+                
+                const config = {
+                    responsive: true,
+                    displayModeBar: false
+                };
+                
+                Plotly.newPlot(`chart${channel}`, [{
+                    x: [],
+                    y: [],
+                    type: 'scatter',
+                    mode: 'lines',
+                    name: 'Temperature',
+                    line: { color: channel === 1 ? '#2196F3' : '#4CAF50' }
+                }], layout, config);
+            });
+        }
+        
+        let settings = {
+            unit: 'C',
+            decimals: 1
+        };
+
+        function updateDisplaySettings() {
+            localStorage.setItem('wellerSettings', JSON.stringify(settings));
+            updateAllTemperatures();
+        }
+
+        function formatTemperature(temp, forceNoDecimals = false) {
+            const value = settings.unit === 'F' ? (temp * 9/5 + 32) : temp;
+            if (forceNoDecimals) {
+                return Math.round(value) + '°' + settings.unit;
+            }
+            return value.toFixed(settings.decimals) + '°' + settings.unit;
+        }
+
+        function updateAllTemperatures() {
+            document.querySelectorAll('.temp-readout').forEach(el => {
+                const tempValue = parseFloat(el.getAttribute('data-temp') || '0');
+                el.textContent = 'Current: ' + formatTemperature(tempValue);
+            });
+            
+            document.querySelectorAll('.temp-display').forEach(el => {
+                const tempValue = parseFloat(el.getAttribute('data-temp') || '0');
+                el.textContent = formatTemperature(tempValue, true);  // Force no decimals
+            });
+        }
+
+        function showSettings() {
+            document.getElementById('settingsModal').style.display = 'block';
+            document.getElementById('unitSelect').value = settings.unit;
+            document.getElementById('decimalsSelect').value = settings.decimals;
+        }
+
+        function closeSettings() {
+            document.getElementById('settingsModal').style.display = 'none';
+        }
+
+        function saveSettings() {
+            settings.unit = document.getElementById('unitSelect').value;
+            settings.decimals = parseInt(document.getElementById('decimalsSelect').value);
+            updateDisplaySettings();
+            closeSettings();
+        }
+
+        // Modify existing updateDisplay function
+        function updateDisplay() {
+            fetch(API_BASE + '/api/status?history=0')
+                .then(response => response.json())
+                .then(data => {
+                    if (data.success && data.status) {
+                        Object.entries(data.status).forEach(([channel, info]) => {
+                            updateChannelReadout(channel.slice(-1), info);
+                        });
+                        updateCharts();
+                    }
+                })
+                .catch(console.error);
+        }
+
+        function updateChannelReadout(idx, info) {
+            if (info.temperature !== undefined) {
+                const tempElement = document.querySelector(`#temp${idx}Value`);
+                if (tempElement) {
+                    tempElement.setAttribute('data-temp', info.temperature);
+                    tempElement.textContent = 'Current: ' + formatTemperature(info.temperature);
+                }
+            }
+            if (info.status !== undefined) {
+                const statusElement = document.querySelector(`#status${idx}Value`);
+                if (statusElement) statusElement.textContent = info.status;
+            }
+        }
+
+        // Live updates are pushed by the server; fall back to polling without EventSource
+        function connectStream() {
+            if (!window.EventSource) {
+                setInterval(updateDisplay, 1000);
+                return;
+            }
+            const source = new EventSource(API_BASE + '/api/stream');
+            source.onerror = () => {
+                // The server refuses streams when it is at capacity; poll instead
+                if (source.readyState === EventSource.CLOSED) {
+                    historyCursor = {};
+                    setInterval(updateDisplay, 1000);
+                }
+            };
+            // A (re)connected stream starts with a snapshot; reload the charts in full
+            source.addEventListener('snapshot', () => {
+                historyCursor = {};
+                updateDisplay();
+            });
+            source.addEventListener('delta', event => {
+                const data = JSON.parse(event.data);
+                const connection = document.getElementById('connectionStatus');
+                if (connection) {
+                    connection.textContent = data.connected ? 'Connected' : (data.stale ? 'Offline (stale data)' : 'Disconnected');
+                }
+                Object.entries(data.channels).forEach(([channel, info]) => {
+                    const idx = channel.slice(-1);
+                    updateChannelReadout(idx, info);
+                    Plotly.extendTraces(`chart${idx}`, {
+                        x: [[data.time]],
+                        y: [[info.temperature]]
+                    }, [0], MAX_CHART_POINTS);
+                });
+            });
+        }
+
+        function setText(id, text) {
+            const element = document.getElementById(id);
+            if (element) element.textContent = text;
+        }
+
+        // The page itself is static; station data comes from the bootstrap snapshot
+        function applyBootstrap(data) {
+            const info = data.station_info;
+            setText('model', info.model || '');
+            setText('firmware', info.firmware || '');
+            setText('interface', info.connection);
+            setText('uptime', info.uptime);
+            setText('last_updated', info.last_updated);
+            setText('connectionStatus', info.connection_status);
+            document.getElementById('connectionStatus').className = 'connection-' + info.connection_status.toLowerCase();
+
+            [1, 2].forEach(idx => {
+                const channel = `channel${idx}`;
+                const slider = document.getElementById(`tempSlider${idx}`);
+                slider.min = info.temp_limits.min;
+                slider.max = info.temp_limits.max;
+
+                const status = (data.status || {})[channel];
+                if (status) {
+                    updateChannelReadout(idx, status);
+                    setText(`tool${idx}Value`, status.tool);
+                    setText(`connectedTool${idx}`, status.tool);
+                }
+                const stats = data.statistics[channel];
+                if (stats) {
+                    setText(`minMax${idx}Value`, `${stats.min.toFixed(1)}°C / ${stats.max.toFixed(1)}°C`);
+                    setText(`avg${idx}Value`, `${stats.avg.toFixed(1)}°C`);
+                    document.getElementById(`stats${idx}`).style.display = '';
+                }
+                const presets = (data.presets || {})[channel];
+                if (presets) {
+                    setText(`preset1Value${idx}`, Math.round(presets.preset1) + '°C');
+                    setText(`preset2Value${idx}`, Math.round(presets.preset2) + '°C');
+                    document.getElementById(`presets${idx}`).style.display = '';
+                }
+                const tool = data.tool_info[channel];
+                if (tool) {
+                    setText(`maxTemp${idx}`, tool.max_temp + '°C');
+                    const container = document.getElementById(`toolInfo${idx}`);
+                    container.querySelector('.tool-name').textContent = tool.name;
+                    container.querySelector('.tool-power').textContent = tool.power;
+                    container.querySelector('.tool-max-temp').textContent = tool.max_temp + '°C';
+                    container.querySelector('.tool-description').textContent = tool.description;
+                }
+            });
+        }
+
+        function loadBootstrap() {
+            return fetch(API_BASE + '/api/bootstrap')
+                .then(response => response.json())
+                .then(data => {
+                    if (data.success) applyBootstrap(data);
+                })
+                .catch(console.error);
+        }
+
+        // Load settings on startup
+        document.addEventListener('DOMContentLoaded', () => {
+            const savedSettings = localStorage.getItem('wellerSettings');
+            if (savedSettings) {
+                settings = JSON.parse(savedSettings);
+            }
+            initializeCharts();
+            loadBootstrap().then(connectStream);
+        });
+
+        function triggerFingerswitch(channel) {
+            const seconds = document.getElementById(`fingerswitchTime${channel}`).value;
+            fetch(`${API_BASE}/api/fingerswitch/${channel}/${seconds}`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' }
+            })
+            .then(response => response.json())
+            .then(data => {
+                if (data.success) {
+                    showMessage(`Fingerswitch activated for ${seconds} seconds`, false);
+                }
+            });
+        }
+
+        function setRemoteMode(mode) {
+            fetch(API_BASE + '/api/remote_mode/' + mode, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' }
+            })
+            .then(response => response.json())
+            .then(data => {
+                if (data.success) {
+                    showMessage(`Remote mode set to ${mode}`, false);
+                }
+            });
+        }
+
+        function updateToolInfo(channel) {
+            fetch(API_BASE + '/api/tool_info/' + channel)
+                .then(response => response.json())
+                .then(data => {
+                    if (data.success) {
+                        const info = data.info;
+                        const container = document.querySelector(`#toolInfo${channel}`);
+                        container.querySelector('.tool-name').textContent = info.name;
+                        container.querySelector('.tool-power').textContent = info.power;
+                        container.querySelector('.tool-max-temp').textContent = info.max_temp + '°C';
+                        container.querySelector('.tool-description').textContent = info.description;
+                    }
+                });
+        }
+    </script>
+</head>
+<body>
+    <button class="settings-btn" onclick="showSettings()">⚙️ Settings</button>
+
+    <div id="settingsModal" class="modal">
+        <div class="modal-content">
+            <span class="close-btn" onclick="closeSettings()">&times;</span>
+            <h2>Settings</h2>
+            
+            <div class="settings-group">
+                <label for="unitSelect">Temperature Unit:</label>
+                <select id="unitSelect">
+                    <option value="C">Celsius</option>
+                    <option value="F">Fahrenheit</option>
+                </select>
+            </div>
+
+            <div class="settings-group">
+                <label for="decimalsSelect">Decimal Places:</label>
+                <select id="decimalsSelect">
+                    <option value="0">0</option>
+                    <option value="1">1</option>
+                    <option value="2">2</option>
+                </select>
+            </div>
+
+            <button onclick="saveSettings()">Save</button>
+        </div>
+    </div>
+
+    <h1>Weller Station Control Panel</h1>
+    
+    <div class="station-info">
+        <h2>Station Information</h2>
+        <div class="status-grid">
+            <div class="info-item">
+                <strong>Model:</strong> <span id="model"></span>
+            </div>
+            <div class="info-item">
+                <strong>Firmware:</strong> <span id="firmware"></span>
+            </div>
+            <div class="info-item">
+                <strong>Connection:</strong> 
+                <span id="connectionStatus"></span>
+            </div>
+            <div class="info-item">
+                <strong>Interface:</strong> <span id="interface"></span>
+            </div>
+            <div class="info-item">
+                <strong>Uptime:</strong> <span id="uptime"></span>
+            </div>
+            <div class="info-item">
+                <strong>Last Updated:</strong> 
+                <span id="last_updated"></span>
+            </div>
+        </div>
+    </div>
+
+    <div id="messages"></div>
+    
+    {% for index in channels %}
+    <div class="channel">
+        <h2>CHANNEL{{ index }}</h2>
+        <div class="temp-readout" id="temp{{ index }}Value" data-temp="0"></div>
+        
+        <div class="stats">
+            <div class="stat-item">
+                <strong>Status:</strong> <span id="status{{ index }}Value"></span>
+            </div>
+            <div class="stat-item">
+                <strong>Tool:</strong> <span id="tool{{ index }}Value"></span>
+            </div>
+            <div class="stat-item" id="stats{{ index }}" style="display: none">
+                <strong>Min/Max:</strong> <span id="minMax{{ index }}Value"></span>
+                <br>
+                <strong>Average:</strong> <span id="avg{{ index }}Value"></span>
+            </div>
+            <div class="stat-item" id="presets{{ index }}" style="display: none">
+                <strong>Preset 1:</strong> <span id="preset1Value{{ index }}"></span>
+                <br>
+                <strong>Preset 2:</strong> <span id="preset2Value{{ index }}"></span>
+            </div>
+        </div>
+
+        <div class="controls">
+            <h3>Temperature Control</h3>
+            <div class="temp-control">
+                <div class="slider-container">
+                    <input type="range" 
+                           id="tempSlider{{ index }}" 
+                           class="temp-slider"
+                           min="50" 
+                           max="450" 
+                           step="1" 
+                           value="200"
+                           oninput="updateTempValue({{ index }}, this.value)">
+                    <div id="tempSliderValue{{ index }}" class="temp-display" data-temp="200">200°C</div>
+                </div>
+                <button onclick="setTemp({{ index }})">Set</button>
+            </div>
+
+            <div class="preset-controls">
+                <h3>Preset Controls</h3>
+                <div class="preset-row">
+                    <button onclick="setPreset({{ index }}, 1, sliderValue[{{ index }}])">Save Preset 1</button>
+                    <button onclick="setPreset({{ index }}, 2, sliderValue[{{ index }}])">Save Preset 2</button>
+                </div>
+                <div class="preset-row">
+                    <button onclick="activatePreset({{ index }}, 1)">Use Preset 1</button>
+                    <button onclick="activatePreset({{ index }}, 2)">Use Preset 2</button>
+                </div>
+            </div>
+            
+            <h3>Mode Control</h3>
+            <button onclick="setMode({{ index }}, 'ON')">ON</button>
+            <button onclick="setMode({{ index }}, 'OFF')">OFF</button>
+            <button onclick="setMode({{ index }}, 'STANDBY')">STANDBY</button>
+        </div>
+        <div class="tool-controls">
+            <h3>Tool Controls</h3>
+            <div class="fingerswitch-control">
+                <label for="fingerswitchTime{{ index }}">Fingerswitch Time (s):</label>
+                <input type="number" 
+                       id="fingerswitchTime{{ index }}" 
+                       min="1" 
+                       max="9999" 
+                       value="5">
+                <button onclick="triggerFingerswitch({{ index }})">Activate Fingerswitch</button>
+            </div>
+            <div class="tool-info">
+                <strong>Connected Tool:</strong> 
+                <span id="connectedTool{{ index }}"></span>
+                <br>
+                <strong>Max Temperature:</strong> 
+                <span id="maxTemp{{ index }}"></span>
+            </div>
+        </div>
+        <div class="tool-info-extended">
+            <h3>Tool Information</h3>
+            <div id="toolInfo{{ index }}">
+                <p><strong>Name:</strong> <span class="tool-name"></span></p>
+                <p><strong>Power:</strong> <span class="tool-power"></span></p>
+                <p><strong>Max Temperature:</strong> <span class="tool-max-temp"></span></p>
+                <p><strong>Description:</strong> <span class="tool-description"></span></p>
+            </div>
+        </div>
+        <div class="remote-controls">
+            <h3>Remote Control</h3>
+            <button onclick="setRemoteMode(0)">Disable Remote</button>
+            <button onclick="setRemoteMode(1)">Enable Remote</button>
+            <button onclick="setRemoteMode(2)">Enable with Lock</button>
+        </div>
+        <div class="chart" id="chart{{ index }}"></div>
+    </div>
+    {% endfor %}
+</body>
+</html>
+'''
+
+class StationStatus(IntEnum):
+    OFF = 0
+    ON = 1
+    STANDBY = 2
+    AUTOOFF = 3
+
+class ConnectionType(IntEnum):
+    FRONT = 1
+    REAR = 2
+
+class ToolType(IntEnum):
+    NOTOOL = 0
+    WXP120 = 1
+    WXP200 = 2
+    WXMP = 3
+    WXMT = 4
+    WXP65 = 5
+    WXP80 = 6
+    WXB200 = 7
+
+    @classmethod
+    def get_name(cls, value):
+        try:
+            return cls(value).name
+        except ValueError:
+            return "UNKNOWN"
+
+class RemoteMode(IntEnum):
+    DISABLED = 0
+    ENABLED = 1
+    ENABLED_WITH_LOCK = 2
+
+class WellerError(Exception):
+    """Custom exception for Weller station errors"""
+    pass
+
+def configure_basic_auth(app: Flask, web_config: 'WebConfig') -> None:
+    """Protect every route of app with basic auth if credentials are configured"""
+    if web_config.username and web_config.password:
+        app.config['BASIC_AUTH_USERNAME'] = web_config.username
+        app.config['BASIC_AUTH_PASSWORD'] = web_config.password
+        app.config['BASIC_AUTH_FORCE'] = True
+        BasicAuth(app)
+
+class StationOfflineError(WellerError):
+    """Raised without touching the port while the circuit breaker is open"""
+    pass
+
+class RetryPolicy:
+    """Jittered exponential backoff bounded by a total deadline per command"""
+    def __init__(self, attempts=3, base_delay=0.01, max_delay=0.2, deadline=0.6, clock=time.monotonic):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline  # Seconds for all attempts of one command, including backoff
+        self.clock = clock  # Source of the deadlines; time.monotonic outside tests
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter delay before retry number attempt (1-based)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def schedule(self, extension: float = 0.0):
+        """Yield (delay, deadline) before each attempt.
+
+        The first attempt has no delay; further attempts are only yielded
+        while attempts remain and the backoff still fits in the deadline.
+        deadline is a clock() value; extension adds to it, e.g. for
+        the extra line time of a pipelined batch.
+        """
+        deadline = self.clock() + self.deadline + extension
+        for attempt in range(self.attempts):
+            delay = self.backoff(attempt) if attempt else 0.0
+            if attempt and self.clock() + delay >= deadline:
+                return
+            yield delay, deadline
+
+class CircuitBreaker:
+    """Mark a station offline after repeated failures and probe it periodically.
+
+    After failure_threshold consecutive failed commands the breaker opens
+    and allow() rejects commands at once. Every probe_interval one command
+    is let through as a probe; success closes the breaker, failure keeps it
+    open for the next interval.
+    """
+    def __init__(self, failure_threshold=3, probe_interval=2.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self.clock = clock  # time.monotonic outside tests
+        self.failures = 0
+        self.opened_at = None  # clock() when the breaker opened
+        self._next_probe = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        """True if a command may use the port now"""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            now = self.clock()
+            if now >= self._next_probe:
+                self._next_probe = now + self.probe_interval
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def reset(self) -> None:
+        """Close the breaker, e.g. after the port was reopened"""
+        self.record_success()
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.opened_at is None and self.failures >= self.failure_threshold:
+                self.opened_at = self.clock()
+                self._next_probe = self.opened_at + self.probe_interval
+
+PIPELINE_FAILURE_LIMIT = 3  # Failed batches in a row before falling back to one query at a time
+
+def batch_length(commands: List[bytes]) -> int:
+    """Bytes on the line for a pipelined batch: all requests plus all replies"""
+    return sum(len(command) + WellerCommand.expected_response(command)[1] for command in commands)
+
+def demux_frames(buffer: bytearray, expected: Dict[bytes, int], frames: Dict[bytes, bytes]) -> None:
+    """Move complete reply frames from the front of buffer into frames.
+
+    expected maps reply prefixes (e.g. b'R1') to frame lengths; replies are
+    recognised by prefix, so they may arrive in any order, and other bytes
+    are dropped as noise. Each 7-byte block's checksum is verified as soon
+    as the block is complete, raising WellerError on a mismatch. Consumed
+    bytes are deleted from buffer; an incomplete frame is left in place.
+    """
+    pos = 0
+    while len(buffer) - pos >= 2:
+        prefix = bytes(buffer[pos:pos + 2])
+        length = expected.get(prefix)
+        if length is None or prefix in frames:
+            pos += 1
+            continue
+        available = min(len(buffer) - pos, length)
+        for block_end in range(6, available, 7):
+            if buffer[pos + block_end] != sum(buffer[pos:pos + block_end]) % 256:
+                del buffer[:pos + available]
+                raise WellerError("Checksum validation failed")
+        if available < length:
+            break
+        frames[prefix] = bytes(buffer[pos:pos + length])
+        pos += length
+    del buffer[:pos]
+
+class AdaptiveTimeout:
+    """Reply timeout that follows the measured line latency.
+
+    The transmission time of request and reply at the configured baud rate
+    is known exactly; on top of that the station's turnaround latency is
+    tracked with a smoothed mean and mean deviation (as TCP does for its
+    retransmission timeout), so a healthy link answers within tens of
+    milliseconds and a missing reply is detected just as quickly.
+    """
+    ALPHA = 0.125
+    BETA = 0.25
+    BITS_PER_BYTE = 10  # Start bit, 8 data bits, stop bit
+
+    def __init__(self, baudrate=1200, initial=0.2, minimum=0.02, maximum=0.5):
+        self.baudrate = baudrate
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency = initial
+        self.deviation = initial / 2
+
+    def line_time(self, byte_count: int) -> float:
+        return byte_count * self.BITS_PER_BYTE / self.baudrate
+
+    def timeout(self, request_length: int, reply_length: int) -> float:
+        """Seconds to wait for a reply_length frame after writing request_length bytes"""
+        budget = self.latency + 4 * self.deviation
+        budget = max(self.minimum, min(self.maximum, budget))
+        return self.line_time(request_length + reply_length) + budget
+
+    def observe(self, request_length: int, reply_length: int, elapsed: float) -> None:
+        """Record the time a complete reply took"""
+        latency = max(0.0, elapsed - self.line_time(request_length + reply_length))
+        self.deviation += self.BETA * (abs(latency - self.latency) - self.deviation)
+        self.latency += self.ALPHA * (latency - self.latency)
+
+    def expired(self) -> None:
+        """Back off after a reply did not arrive in time"""
+        self.latency = min(self.maximum, max(self.minimum, self.latency * 2))
+
+class SerialWorker:
+    """Single worker thread that owns the serial port.
+
+    Transactions are queued with a priority (lower runs first, FIFO within a
+    priority) and each caller gets a Future for its result, so concurrent
+    callers can never interleave bytes on the line.
+    """
+    PRIORITY_CONTROL = 0   # Set-point and mode writes
+    PRIORITY_QUERY = 10    # Telemetry reads
+    _PRIORITY_STOP = 1 << 30
+
+    def __init__(self, name='SerialWorker'):
+        self._queue = queue.PriorityQueue()
+        self._counter = itertools.count()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, priority: int, func, *args, **kwargs) -> Future:
+        """Queue func(*args, **kwargs) to run on the worker thread"""
+        future = Future()
+        if threading.current_thread() is self._thread:
+            # Called from inside a transaction; queueing would deadlock
+            self._execute(future, func, args, kwargs)
+        else:
+            self._queue.put((priority, next(self._counter), future, func, args, kwargs))
+        return future
+
+    def stop(self, timeout=5.0):
+        """Finish queued transactions and stop the worker"""
+        self._queue.put((self._PRIORITY_STOP, next(self._counter), None, None, (), {}))
+        if threading.current_thread() is not self._thread:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            _, _, future, func, args, kwargs = self._queue.get()
+            if future is None:
+                break
+            if future.set_running_or_notify_cancel():
+                self._execute(future, func, args, kwargs)
+
+    @staticmethod
+    def _execute(future, func, args, kwargs):
+        try:
+            future.set_result(func(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+
+class WebConfig:
+    SERVERS = ('waitress', 'development')
+
+    def __init__(self, port=5000, username=None, password=None, poll_interval=1.0, metadata_interval=30.0,
+                 history_points=500, server='waitress', host='0.0.0.0', max_workers=64, max_pending=64,
+                 keepalive_timeout=5.0, max_streams=None, shutdown_timeout=5.0):
+        if server not in self.SERVERS:
+            raise WellerError(f"Unknown web server: {server}")
+        self.port = port
+        self.username = username
+        self.password = password
+        self.poll_interval = poll_interval  # Seconds between status polls
+        self.metadata_interval = metadata_interval  # Seconds between model/firmware/preset refreshes
+        self.history_points = history_points  # Target points per chart/history response
+        self.server = server  # 'waitress' (falls back to 'development' if not installed) or 'development' (app.run)
+        self.host = host
+        self.max_workers = max_workers  # Requests handled concurrently (waitress threads)
+        self.max_pending = max_pending  # Connections open beyond that before new ones wait in the listen backlog
+        self.keepalive_timeout = keepalive_timeout  # Seconds an idle keep-alive connection is held (rounded up)
+        self.max_streams = max_streams if max_streams is not None else max(1, max_workers // 2)
+        self.shutdown_timeout = shutdown_timeout  # Seconds in-flight requests get to finish on stop
+        # Event streams hold a worker each; the slots are shared by every app using this config
+        self.stream_slots = threading.BoundedSemaphore(self.max_streams)
+
+class StorageConfig:
+    def __init__(self, directory, segment_seconds=3600, retention_days=30):
+        self.directory = directory  # Directory holding the segment files
+        self.segment_seconds = segment_seconds  # 3600 for hourly, 86400 for daily segments
+        self.retention_days = retention_days  # Segments older than this are deleted; None keeps all
+
+class SamplerConfig:
+    def __init__(self, temperature_rate=None, status_rate=2.0, tools_rate=0.2):
+        self.temperature_rate = temperature_rate  # Hz; None samples as fast as the line allows
+        self.status_rate = status_rate  # Hz; 0 disables the field
+        self.tools_rate = tools_rate  # Hz; presets are only read on request
+
+# Lägg till ny hjälpklass för temperaturkonvertering
+class TemperatureConverter:
+    @staticmethod
+    def to_internal(temp: float) -> int:
+        """Convert temperature from °C to internal representation (1/10°C)"""
+        return int(round(temp * 10))
+    
+    @staticmethod
+    def from_internal(value: int) -> float:
+        """Convert temperature from internal representation to °C"""
+        return value / 10.0
+
+def parse_time_param(value: Optional[str]) -> Optional[int]:
+    """Parse a query-string time given as epoch milliseconds or ISO-8601"""
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return to_epoch_ms(datetime.fromisoformat(value))
+    except ValueError:
+        raise WellerError(f"Invalid time value: {value}")
+
+def parse_int_param(value: Optional[str]) -> Optional[int]:
+    """Parse an optional integer query-string value"""
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise WellerError(f"Invalid integer value: {value}")
+
+def to_epoch_ms(timestamp: datetime) -> int:
+    """Convert a datetime to epoch milliseconds"""
+    return int(timestamp.timestamp() * 1000)
+
+def from_epoch_ms(value: int) -> datetime:
+    """Convert epoch milliseconds to a local datetime"""
+    return datetime.fromtimestamp(value / 1000.0)
+
+def downsample_lttb(timestamps: List[int], values: List[int], threshold: int) -> tuple:
+    """Largest-Triangle-Three-Buckets downsampling to at most threshold points.
+
+    Keeps the first and last sample and, per bucket, the sample forming the
+    largest triangle with its neighbours, so spikes survive decimation.
+    """
+    count = len(values)
+    if threshold >= count or threshold < 3:
+        return list(timestamps), list(values)
+
+    out_t, out_v = [timestamps[0]], [values[0]]
+    bucket_size = (count - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, count)
+        # Average of the next bucket (or the last point) is the third vertex
+        span = max(1, next_end - end)
+        avg_t = sum(timestamps[end:next_end]) / span if next_end > end else timestamps[-1]
+        avg_v = sum(values[end:next_end]) / span if next_end > end else values[-1]
+
+        at, av = timestamps[a], values[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((at - avg_t) * (values[j] - av) - (at - timestamps[j]) * (avg_v - av))
+            if area > best_area:
+                best, best_area = j, area
+        out_t.append(timestamps[best])
+        out_v.append(values[best])
+        a = best
+
+    out_t.append(timestamps[-1])
+    out_v.append(values[-1])
+    return out_t, out_v
+
+def downsample_minmax(timestamps: List[int], values: List[int], threshold: int) -> tuple:
+    """Min/max-per-bucket downsampling to at most threshold points.
+
+    The first and last sample are always kept, so the result spans the
+    same time range; the other threshold - 2 points go to the buckets.
+    """
+    count = len(values)
+    if threshold >= count or threshold < 2:
+        return list(timestamps), list(values)
+
+    buckets = (threshold - 2) // 2
+    interior = count - 2
+    out_t, out_v = [timestamps[0]], [values[0]]
+    for i in range(buckets):
+        start = 1 + i * interior // buckets
+        end = 1 + (i + 1) * interior // buckets
+        if start >= end:
+            continue
+        bucket = values[start:end]
+        low = start + bucket.index(min(bucket))
+        high = start + bucket.index(max(bucket))
+        for j in sorted({low, high}):
+            out_t.append(timestamps[j])
+            out_v.append(values[j])
+    out_t.append(timestamps[-1])
+    out_v.append(values[-1])
+    return out_t, out_v
+
+DOWNSAMPLERS = {
+    'lttb': downsample_lttb,
+    'minmax': downsample_minmax
+}
+
+class WindowStatistics:
+    """Running statistics over a sliding window of a TemperatureRingBuffer.
+
+    Keeps integer sum and sum of squares (exact for 1/10°C samples, so
+    removing samples never accumulates rounding drift) plus monotonic deques
+    of sample numbers for the window minimum and maximum. Every update is
+    amortized O(1).
+    """
+    def __init__(self, span_ms: Optional[int] = None):
+        self.span_ms = span_ms  # None means the whole buffer
+        self.start = 0  # Sample number of the oldest sample in the window
+        self.count = 0
+        self.total = 0
+        self.total_squares = 0
+        self._min = deque()
+        self._max = deque()
+
+    def add(self, number: int, value: int, values: array, capacity: int) -> None:
+        self.count += 1
+        self.total += value
+        self.total_squares += value * value
+        while self._min and values[self._min[-1] % capacity] >= value:
+            self._min.pop()
+        self._min.append(number)
+        while self._max and values[self._max[-1] % capacity] <= value:
+            self._max.pop()
+        self._max.append(number)
+
+    def evict(self, value: int) -> None:
+        """Drop the oldest sample (which must still be readable in the buffer)"""
+        self.count -= 1
+        self.total -= value
+        self.total_squares -= value * value
+        if self._min and self._min[0] == self.start:
+            self._min.popleft()
+        if self._max and self._max[0] == self.start:
+            self._max.popleft()
+        self.start += 1
+
+    def result(self, values: array, capacity: int, current: int) -> Dict[str, float]:
+        if not self.count:
+            return {}
+        mean = self.total / self.count
+        variance = max(0.0, self.total_squares / self.count - mean * mean)
+        return {
+            'min': TemperatureConverter.from_internal(values[self._min[0] % capacity]),
+            'max': TemperatureConverter.from_internal(values[self._max[0] % capacity]),
+            'avg': TemperatureConverter.from_internal(mean),
+            'stddev': TemperatureConverter.from_internal(variance ** 0.5),
+            'current': TemperatureConverter.from_internal(current),
+            'count': self.count
+        }
+
+class TemperatureRingBuffer:
+    """Fixed-capacity ring buffer of temperature samples.
+
+    Timestamps are stored as epoch milliseconds (int64) and temperatures in
+    the internal 1/10°C representation (int16) in preallocated typed arrays,
+    so appends are O(1) and allocate nothing per sample. Indexes passed to
+    the read methods are logical: 0 is the oldest retained sample.
+    Statistics for each window in STATISTICS_WINDOWS are updated on append.
+    Timestamps are clamped so they never decrease, as range reads bisect.
+    """
+    STATISTICS_WINDOWS = {'10s': 10_000, '1min': 60_000, 'all': None}
+
+    def __init__(self, capacity: int, windows: Optional[Dict[str, Optional[int]]] = None):
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1")
+        self.capacity = capacity
+        self._timestamps = array('q', bytes(8 * capacity))
+        self._values = array('h', bytes(2 * capacity))
+        self._total = 0  # Samples appended since creation
+        self._lock = threading.Lock()
+        windows = self.STATISTICS_WINDOWS if windows is None else windows
+        self._windows = {name: WindowStatistics(span_ms) for name, span_ms in windows.items()}
+
+    def __len__(self) -> int:
+        return min(self._total, self.capacity)
+
+    @property
+    def total(self) -> int:
+        """Samples appended since creation; changes whenever the buffer does"""
+        return self._total
+
+    def append(self, timestamp_ms: int, value: int) -> None:
+        """Append one sample (value in 1/10°C), overwriting the oldest when full"""
+        with self._lock:
+            number = self._total
+            capacity = self.capacity
+            values = self._values
+            timestamps = self._timestamps
+            oldest_kept = number + 1 - capacity
+            for stats in self._windows.values():
+                # Evict the sample about to be overwritten before it is lost
+                while stats.start < oldest_kept:
+                    stats.evict(values[stats.start % capacity])
+
+            if number and timestamp_ms < timestamps[(number - 1) % capacity]:
+                timestamp_ms = timestamps[(number - 1) % capacity]  # Clock stepped back; keep reads sorted
+            index = number % capacity
+            timestamps[index] = timestamp_ms
+            values[index] = value
+            self._total = number + 1
+
+            for stats in self._windows.values():
+                if stats.span_ms is not None:
+                    cutoff = timestamp_ms - stats.span_ms
+                    while stats.start < number and timestamps[stats.start % capacity] < cutoff:
+                        stats.evict(values[stats.start % capacity])
+                stats.add(number, value, values, capacity)
+
+    def statistics(self, window: str = 'all') -> Dict[str, float]:
+        """Statistics in °C for a named window; O(1) regardless of history length"""
+        with self._lock:
+            if window not in self._windows:
+                raise WellerError(f"Unknown statistics window: {window}")
+            if not self._total:
+                return {}
+            current = self._values[(self._total - 1) % self.capacity]
+            return self._windows[window].result(self._values, self.capacity, current)
+
+    def latest(self) -> Optional[tuple]:
+        """Return the newest (timestamp_ms, value) pair, or None if empty"""
+        with self._lock:
+            if not self._total:
+                return None
+            index = (self._total - 1) % self.capacity
+            return self._timestamps[index], self._values[index]
+
+    def _segments(self, start: int, stop: Optional[int]) -> List[tuple]:
+        """Physical (begin, end) array ranges covering logical [start, stop)"""
+        count = min(self._total, self.capacity)
+        stop = count if stop is None else max(0, min(stop, count))
+        start = max(0, min(start, stop))
+        if start == stop:
+            return []
+        oldest = (self._total - count) % self.capacity
+        begin = (oldest + start) % self.capacity
+        end = begin + (stop - start)
+        if end <= self.capacity:
+            return [(begin, end)]
+        return [(begin, self.capacity), (0, end - self.capacity)]
+
+    def index_range(self, start_ms: Optional[int] = None, end_ms: Optional[int] = None) -> tuple:
+        """Logical [start, stop) indexes of samples with start_ms <= timestamp <= end_ms"""
+        with self._lock:
+            return self._index_range(start_ms, end_ms)
+
+    def _index_range(self, start_ms: Optional[int], end_ms: Optional[int]) -> tuple:
+        count = min(self._total, self.capacity)
+        oldest = self._total - count
+
+        def bisect(target, right):
+            low, high = 0, count
+            while low < high:
+                mid = (low + high) // 2
+                value = self._timestamps[(oldest + mid) % self.capacity]
+                if value < target or (right and value == target):
+                    low = mid + 1
+                else:
+                    high = mid
+            return low
+
+        start = 0 if start_ms is None else bisect(start_ms, False)
+        stop = count if end_ms is None else bisect(end_ms, True)
+        return start, max(start, stop)
+
+    def read_range(self, start_ms: Optional[int] = None, end_ms: Optional[int] = None) -> tuple:
+        """Copy samples with start_ms <= timestamp <= end_ms.
+
+        Returns (timestamps, values, next_number), read under one lock;
+        next_number is the sample number after the last one copied, so
+        read_from(next_number) continues exactly where this read ended.
+        """
+        with self._lock:
+            start, stop = self._index_range(start_ms, end_ms)
+            timestamps, values = [], []
+            for b, e in self._segments(start, stop):
+                timestamps.extend(self._timestamps[b:e])
+                values.extend(self._values[b:e])
+            return timestamps, values, self._total - min(self._total, self.capacity) + stop
+
+    def views(self, start: int = 0, stop: Optional[int] = None) -> List[tuple]:
+        """Zero-copy (timestamps, values) memoryview pairs in chronological order.
+
+        The views alias the live arrays: later appends overwrite the oldest
+        samples in place, so copy the data if it must outlive the next append.
+        """
+        with self._lock:
+            timestamps = memoryview(self._timestamps)
+            values = memoryview(self._values)
+            return [(timestamps[b:e], values[b:e]) for b, e in self._segments(start, stop)]
+
+    def to_lists(self, start: int = 0, stop: Optional[int] = None) -> tuple:
+        """Copy samples into (timestamps_ms, values) lists in chronological order"""
+        with self._lock:
+            timestamps, values = [], []
+            for b, e in self._segments(start, stop):
+                timestamps.extend(self._timestamps[b:e])
+                values.extend(self._values[b:e])
+            return timestamps, values
+
+    def read_from(self, number: int, limit: Optional[int] = None) -> tuple:
+        """Copy samples starting at absolute sample number `number`.
+
+        Sample numbers count every append since creation, so they stay valid
+        while the ring wraps. Returns (timestamps, values, next_number); if
+        `number` was already overwritten, reading starts at the oldest sample.
+        """
+        with self._lock:
+            count = min(self._total, self.capacity)
+            oldest = self._total - count
+            start = max(number, oldest) - oldest
+            stop = count if limit is None else min(count, start + limit)
+            timestamps, values = [], []
+            for b, e in self._segments(start, stop):
+                timestamps.extend(self._timestamps[b:e])
+                values.extend(self._values[b:e])
+            return timestamps, values, oldest + start + len(values)
+
+    def iter_range(self, start_ms: Optional[int] = None, end_ms: Optional[int] = None,
+                   chunk_size: int = 1024):
+        """Yield (timestamp_ms, value) pairs in a time range, copying chunk_size samples at a time"""
+        start, _ = self.index_range(start_ms, None)
+        with self._lock:
+            number = self._total - min(self._total, self.capacity) + start
+        while True:
+            timestamps, values, number = self.read_from(number, chunk_size)
+            if not timestamps:
+                return
+            for timestamp_ms, value in zip(timestamps, values):
+                if end_ms is not None and timestamp_ms > end_ms:
+                    return
+                yield timestamp_ms, value
+
+    def __iter__(self):
+        timestamps, values = self.to_lists()
+        return zip(timestamps, values)
+
+# Lägg till efter existerande klasser
+class ResponseParser:
+    """Parser för Weller station-svar"""
+    @staticmethod
+    def parse_response(response: str, expected_prefix: str) -> Dict[str, Union[str, int, float]]:
+        """Parse a response from the station with validation"""
+        if not response or len(response) < 3:
+            raise WellerError("Response too short")
+            
+        if not response.startswith(expected_prefix):
+            raise WellerError(f"Expected prefix {expected_prefix}, got {response[:2]}")
+            
+        result = {
+            'raw': response,
+            'prefix': response[:2],
+            'checksum': response[-1]
+        }
+        
+        # Parse based on command type
+        if expected_prefix in ['R1', 'S1', 'T1', 'U1']:  # Temperature commands
+            result['value'] = float(response[2:6]) / 10.0
+        elif expected_prefix == 'Q1':  # Status command
+            result['ch1_status'] = int(response[2])
+            result['ch2_status'] = int(response[3])
+        elif expected_prefix == 'Y1':  # Tool type command
+            result['ch1_tool'] = int(response[2])
+            result['ch2_tool'] = int(response[9]) if len(response) >= 10 else None
+
+        return result
+
+def format_sse_event(event: str, data: Dict, event_id: Optional[int] = None) -> str:
+    """Serialize one Server-Sent Events message"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+class TimeSeriesStore:
+    """Append-only on-disk store of station samples.
+
+    Each record is a fixed-size little-endian struct (RECORD) holding the
+    epoch-ms timestamp, both channels' temperature and set point in 1/10°C
+    and both status codes. Records go into one segment file per rotation
+    period; segments older than the retention period are deleted. Reads
+    memory-map the segments, so range queries never load whole files into
+    RAM and never block the writer.
+
+    Reads binary-search each segment, which relies on timestamps never
+    decreasing. A sample stamped before the newest stored one (the wall
+    clock was stepped back, e.g. by NTP) is stored at the newest timestamp
+    instead, including across restarts.
+    """
+    RECORD = struct.Struct('<qhhhhBB')  # ts_ms, temp1, temp2, set1, set2, status1, status2
+    MISSING_VALUE = -32768  # int16 marker for an unknown temperature
+    MISSING_STATUS = 255
+    SEGMENT_SUFFIX = '.wxs'
+    SEGMENT_TIME_FORMAT = '%Y%m%dT%H%M%S'
+
+    def __init__(self, directory: str, segment_seconds: int = 3600, retention_days: float = 30):
+        self.directory = directory
+        self.segment_ms = int(segment_seconds * 1000)
+        self.retention_ms = int(retention_days * 86400 * 1000) if retention_days else None
+        self.logger = logging.getLogger('TimeSeriesStore')
+        self._lock = threading.Lock()
+        self._file = None
+        self._segment_start = None
+        os.makedirs(directory, exist_ok=True)
+        self.enforce_retention()
+        self._last_ts = self._newest_timestamp()
+
+    def _segment_path(self, segment_start_ms: int) -> str:
+        name = time.strftime(self.SEGMENT_TIME_FORMAT, time.gmtime(segment_start_ms / 1000))
+        return os.path.join(self.directory, name + self.SEGMENT_SUFFIX)
+
+    def segments(self) -> List[tuple]:
+        """Sorted (segment_start_ms, path) pairs of all segment files"""
+        result = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(self.SEGMENT_SUFFIX):
+                continue
+            try:
+                start = time.strptime(name[:-len(self.SEGMENT_SUFFIX)], self.SEGMENT_TIME_FORMAT)
+            except ValueError:
+                continue
+            start_ms = calendar.timegm(start) * 1000
+            result.append((start_ms, os.path.join(self.directory, name)))
+        return sorted(result)
+
+    def _newest_timestamp(self) -> Optional[int]:
+        """Timestamp of the last complete record on disk, if any"""
+        record_size = self.RECORD.size
+        for _, path in reversed(self.segments()):
+            try:
+                with open(path, 'rb') as f:
+                    length = os.fstat(f.fileno()).st_size // record_size * record_size
+                    if length:
+                        f.seek(length - record_size)
+                        return self.RECORD.unpack(f.read(record_size))[0]
+            except OSError as e:
+                self.logger.error(f"Failed to read segment {path}: {e}")
+        return None
+
+    def append(self, timestamp_ms: int, temps: tuple, set_temps: tuple = (None, None),
+               statuses: tuple = (None, None)) -> None:
+        """Append one record; temperatures in 1/10°C, None for unknown values"""
+        values = (
+            *(self.MISSING_VALUE if value is None else value for value in temps),
+            *(self.MISSING_VALUE if value is None else value for value in set_temps),
+            *(self.MISSING_STATUS if value is None else value for value in statuses)
+        )
+        with self._lock:
+            if self._last_ts is not None and timestamp_ms < self._last_ts:
+                timestamp_ms = self._last_ts  # Clock stepped back; keep the segments sorted
+            self._last_ts = timestamp_ms
+            record = self.RECORD.pack(timestamp_ms, *values)
+            segment_start = timestamp_ms - timestamp_ms % self.segment_ms
+            if segment_start != self._segment_start:
+                self._rotate(segment_start)
+            self._file.write(record)
+            self._file.flush()
+
+    def _rotate(self, segment_start: int) -> None:
+        if self._file:
+            self._file.close()
+        path = self._segment_path(segment_start)
+        self._file = open(path, 'ab')
+        # Drop a partial record left behind by an interrupted write
+        size = self._file.tell()
+        if size % self.RECORD.size:
+            self._file.truncate(size - size % self.RECORD.size)
+            self._file.seek(0, os.SEEK_END)
+        self._segment_start = segment_start
+        self.enforce_retention(segment_start)
+
+    def enforce_retention(self, now_ms: Optional[int] = None) -> None:
+        """Delete segments that ended before the retention period"""
+        if self.retention_ms is None:
+            return
+        now_ms = now_ms if now_ms is not None else to_epoch_ms(datetime.now())
+        for start_ms, path in self.segments():
+            if start_ms + self.segment_ms < now_ms - self.retention_ms and start_ms != self._segment_start:
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    self.logger.error(f"Failed to remove segment {path}: {e}")
+
+    def read(self, start_ms: Optional[int] = None, end_ms: Optional[int] = None):
+        """Yield record tuples with start_ms <= timestamp <= end_ms in time order"""
+        record_size = self.RECORD.size
+        for segment_start, path in self.segments():
+            if end_ms is not None and segment_start > end_ms:
+                break
+            if start_ms is not None and segment_start + self.segment_ms <= start_ms:
+                continue
+            try:
+                with open(path, 'rb') as f:
+                    length = os.fstat(f.fileno()).st_size // record_size * record_size
+                    if not length:
+                        continue
+                    mm = mmap.mmap(f.fileno(), length, access=mmap.ACCESS_READ)
+            except OSError as e:
+                self.logger.error(f"Failed to open segment {path}: {e}")
+                continue
+            try:
+                count = length // record_size
+                first = 0
+                if start_ms is not None:
+                    high = count
+                    while first < high:
+                        mid = (first + high) // 2
+                        if self.RECORD.unpack_from(mm, mid * record_size)[0] < start_ms:
+                            first = mid + 1
+                        else:
+                            high = mid
+                for index in range(first, count):
+                    record = self.RECORD.unpack_from(mm, index * record_size)
+                    if end_ms is not None and record[0] > end_ms:
+                        return
+                    yield record
+            finally:
+                mm.close()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+                self._segment_start = None
+
+EXPORT_COLUMNS = (
+    'timestamp',
+    'channel1_temperature', 'channel2_temperature',
+    'channel1_set_temperature', 'channel2_set_temperature',
+    'channel1_status', 'channel2_status'
+)
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+    'binary': 'application/vnd.weller.export',
+    'msgpack': 'application/msgpack'
+}
+
+HISTORY_FORMATS = {
+    'json': 'application/json',
+    'binary': 'application/vnd.weller.history',
+    'msgpack': 'application/msgpack'
+}
+
+# Columnar frames: a fixed header, then one little-endian array per column.
+# Timestamps are deltas in ms from the previous sample (the first from
+# start_ms) as int32, or int64 with FLAG_WIDE_TIME; temperatures are int16
+# 1/10°C. History frames hold one channel; export blocks hold the
+# EXPORT_COLUMNS as int16 temperatures (TimeSeriesStore.MISSING_VALUE when
+# unknown) and uint8 status codes (MISSING_STATUS), padded to 8 bytes.
+HISTORY_FRAME = struct.Struct('<4sIIIIxxxxqq')  # magic, flags, count, raw_count, missed, cursor, start_ms
+HISTORY_MAGIC = b'WXH1'
+EXPORT_BLOCK = struct.Struct('<4sIIxxxxq')  # magic, flags, count, start_ms
+EXPORT_MAGIC = b'WXE1'
+FLAG_DECIMATED = 1
+FLAG_RESET = 2
+FLAG_WIDE_TIME = 4
+COLUMNAR_FORMATS = ('binary', 'msgpack')
+
+def negotiate_format(accept: Optional[str], formats: Dict[str, str], default: str) -> str:
+    """Format whose media type the Accept header ranks highest; default for */* or no match"""
+    best, best_q = default, 0.0
+    for part in (accept or '').split(','):
+        media_type, *params = part.split(';')
+        media_type = media_type.strip().lower()
+        q = 1.0
+        for param in params:
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        for fmt, candidate in formats.items():
+            if candidate == media_type and q > best_q and (fmt != 'msgpack' or msgpack is not None):
+                best, best_q = fmt, q
+    return best
+
+def _require_msgpack() -> None:
+    if msgpack is None:
+        raise WellerError("MessagePack encoding requires msgpack (pip install msgpack)")
+
+def _little_endian(column: array) -> bytes:
+    if sys.byteorder == 'big':
+        column.byteswap()
+    return column.tobytes()
+
+def _read_column(typecode: str, data: bytes, offset: int, count: int) -> tuple:
+    """Read count little-endian items at offset; returns (array, next offset)"""
+    column = array(typecode)
+    end = offset + column.itemsize * count
+    column.frombytes(data[offset:end])
+    if sys.byteorder == 'big':
+        column.byteswap()
+    return column, end
+
+def delta_encode(timestamps) -> tuple:
+    """Return (start_ms, deltas): each timestamp minus the previous one, the first minus itself"""
+    start = timestamps[0] if timestamps else 0
+    return start, [b - a for a, b in zip(itertools.chain((start,), timestamps), timestamps)]
+
+def delta_decode(start_ms: int, deltas) -> List[int]:
+    """Inverse of delta_encode()"""
+    return list(itertools.accumulate(itertools.chain((start_ms,), deltas)))[1:]
+
+def _pack_deltas(deltas) -> tuple:
+    """(flags, bytes) for a delta column, widened to int64 if a gap does not fit in int32"""
+    try:
+        return 0, _little_endian(array('i', deltas))
+    except OverflowError:
+        return FLAG_WIDE_TIME, _little_endian(array('q', deltas))
+
+def encode_history(fmt: str, timestamps, values, cursor: int, raw_count: Optional[int] = None,
+                   missed: int = 0, decimated: bool = False, reset: bool = False) -> bytes:
+    """Encode one channel's history (epoch ms, 1/10°C values) as a 'binary' frame or 'msgpack' map"""
+    start, deltas = delta_encode(timestamps)
+    raw_count = len(values) if raw_count is None else raw_count
+    if fmt == 'msgpack':
+        _require_msgpack()
+        return msgpack.packb({
+            'success': True, 'cursor': cursor, 'count': raw_count, 'missed': missed,
+            'decimated': decimated, 'reset': reset,
+            'start_ms': start, 'time_deltas': deltas, 'temperatures': list(values)
+        })
+    if fmt != 'binary':
+        raise WellerError(f"Unknown history format: {fmt}")
+    flags, time_column = _pack_deltas(deltas)
+    flags |= (FLAG_DECIMATED if decimated else 0) | (FLAG_RESET if reset else 0)
+    header = HISTORY_FRAME.pack(HISTORY_MAGIC, flags, len(values), raw_count, missed, cursor, start)
+    return header + time_column + _little_endian(array('h', values))
+
+def decode_history(data: bytes) -> Dict:
+    """Decode a 'binary' history frame (or a 'msgpack' one, if data is not a frame).
+
+    Returns timestamps in epoch ms and temperatures in 1/10°C, plus the
+    cursor and the other response fields.
+    """
+    if data[:4] != HISTORY_MAGIC:
+        _require_msgpack()
+        payload = msgpack.unpackb(data)
+        timestamps = delta_decode(payload.pop('start_ms'), payload.pop('time_deltas'))
+        return dict(payload, timestamps=timestamps)
+    _, flags, count, raw_count, missed, cursor, start = HISTORY_FRAME.unpack_from(data)
+    deltas, offset = _read_column('q' if flags & FLAG_WIDE_TIME else 'i', data, HISTORY_FRAME.size, count)
+    values, _ = _read_column('h', data, offset, count)
+    return {
+        'success': True,
+        'timestamps': delta_decode(start, deltas),
+        'temperatures': values.tolist(),
+        'cursor': cursor,
+        'count': raw_count,
+        'missed': missed,
+        'decimated': bool(flags & FLAG_DECIMATED),
+        'reset': bool(flags & FLAG_RESET)
+    }
+
+def encode_export_block(records, fmt: str = 'binary') -> bytes:
+    """Encode raw export records (see WellerStation.iter_export_records) as one columnar block"""
+    timestamps, *columns = zip(*records)
+    start, deltas = delta_encode(timestamps)
+    if fmt == 'msgpack':
+        _require_msgpack()
+        missing = (TimeSeriesStore.MISSING_VALUE,) * 4 + (TimeSeriesStore.MISSING_STATUS,) * 2
+        block = {'start_ms': start, 'count': len(timestamps), 'time_deltas': deltas}
+        for name, column, marker in zip(EXPORT_COLUMNS[1:], columns, missing):
+            block[name] = [None if value == marker else value for value in column]
+        return msgpack.packb(block)
+    if fmt != 'binary':
+        raise WellerError(f"Unknown export format: {fmt}")
+    flags, time_column = _pack_deltas(deltas)
+    parts = [EXPORT_BLOCK.pack(EXPORT_MAGIC, flags, len(timestamps), start), time_column]
+    parts.extend(_little_endian(array('h', column)) for column in columns[:4])
+    parts.extend(bytes(column) for column in columns[4:])
+    parts.append(bytes(-sum(map(len, parts)) % 8))
+    return b''.join(parts)
+
+def decode_export_blocks(data: bytes):
+    """Yield raw export records from a 'binary' export, block by block"""
+    offset = 0
+    while offset < len(data):
+        magic, flags, count, start = EXPORT_BLOCK.unpack_from(data, offset)
+        if magic != EXPORT_MAGIC:
+            raise WellerError(f"Invalid export block at byte {offset}")
+        deltas, offset = _read_column('q' if flags & FLAG_WIDE_TIME else 'i', data, offset + EXPORT_BLOCK.size, count)
+        columns = [delta_decode(start, deltas)]
+        for _ in range(4):
+            column, offset = _read_column('h', data, offset, count)
+            columns.append(column)
+        for _ in range(2):
+            columns.append(data[offset:offset + count])
+            offset += count
+        offset += -offset % 8
+        yield from zip(*columns)
+
+def iter_columnar_chunks(records, fmt: str = 'binary', compress: bool = False, rows_per_chunk: int = 500):
+    """Serialize raw export records into one columnar block per rows_per_chunk records"""
+    if fmt not in COLUMNAR_FORMATS:
+        raise WellerError(f"Unknown export format: {fmt}")
+    if fmt == 'msgpack':
+        _require_msgpack()
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    records = iter(records)
+    while True:
+        block = list(itertools.islice(records, rows_per_chunk))
+        if not block:
+            break
+        chunk = encode_export_block(block, fmt)
+        chunk = compressor.compress(chunk) if compressor else chunk
+        if chunk:
+            yield chunk
+    if compressor:
+        yield compressor.flush()
+
+def iter_export_chunks(rows, fmt: str = 'csv', compress: bool = False, rows_per_chunk: int = 500):
+    """Serialize export rows (tuples matching EXPORT_COLUMNS) into streamed chunks.
+
+    Only rows_per_chunk rows are buffered at a time; with compress the
+    output is a single gzip stream built incrementally.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise WellerError(f"Unknown export format: {fmt}")
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+
+    def emit(text):
+        data = text.encode('utf-8')
+        return compressor.compress(data) if compressor else data
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == 'csv' else None
+    if writer:
+        writer.writerow(EXPORT_COLUMNS)
+
+    pending = 0
+    for row in rows:
+        if writer:
+            writer.writerow(['' if value is None else value for value in row])
+        else:
+            buffer.write(json.dumps(dict(zip(EXPORT_COLUMNS, row)), separators=(',', ':')))
+            buffer.write('\n')
+        pending += 1
+        if pending >= rows_per_chunk:
+            chunk = emit(buffer.getvalue())
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+            if chunk:
+                yield chunk
+
+    chunk = emit(buffer.getvalue())
+    if compressor:
+        chunk += compressor.flush()
+    if chunk:
+        yield chunk
+
+class EncodedResponse:
+    """Response body encoded once and served with an ETag and an optional gzip variant"""
+    GZIP_MIN_SIZE = 512  # Smaller bodies are not worth compressing
+
+    def __init__(self, body: bytes, content_type: str, etag: Optional[str] = None,
+                 last_modified: Optional[float] = None, vary: str = 'Accept-Encoding'):
+        self.body = body
+        self.content_type = content_type
+        self.etag = etag or '"%s"' % hashlib.sha1(body).hexdigest()[:20]
+        self.last_modified = last_modified  # Epoch seconds
+        self.vary = vary
+        self._gzip_body = None
+
+    @property
+    def gzip_body(self) -> bytes:
+        """gzip encoding of body, compressed on first use"""
+        if self._gzip_body is None:
+            compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+            self._gzip_body = compressor.compress(self.body) + compressor.flush()
+        return self._gzip_body
+
+    @staticmethod
+    def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+        for part in (accept_encoding or '').split(','):
+            coding, _, params = part.partition(';')
+            if coding.strip().lower() in ('gzip', '*'):
+                try:
+                    return float(params.strip()[2:]) > 0 if params.strip().startswith('q=') else True
+                except ValueError:
+                    return False
+        return False
+
+    def negotiate(self, if_none_match: Optional[str], accept_encoding: Optional[str]) -> tuple:
+        """Return (status, body, headers) for a request's If-None-Match and Accept-Encoding"""
+        compress = len(self.body) >= self.GZIP_MIN_SIZE and self.accepts_gzip(accept_encoding)
+        # Each encoding is its own representation, so it gets its own strong ETag
+        etag = self.etag[:-1] + '-gzip"' if compress else self.etag
+        headers = {'ETag': etag, 'Vary': self.vary, 'Cache-Control': 'no-cache'}
+        # Last-Modified is informational: data changes several times a second, so only
+        # the ETag is precise enough to answer conditional requests with
+        if self.last_modified is not None:
+            headers['Last-Modified'] = formatdate(self.last_modified, usegmt=True)
+        if if_none_match:
+            tags = {tag.strip().replace('W/', '', 1) for tag in if_none_match.split(',')}
+            if '*' in tags or etag in tags:
+                return 304, b'', headers
+        headers['Content-Type'] = self.content_type
+        if compress:
+            headers['Content-Encoding'] = 'gzip'
+            return 200, self.gzip_body, headers
+        return 200, self.body, headers
+
+class ResponseCache:
+    """Serialized JSON responses shared by all clients, keyed by request and data version.
+
+    Each key keeps only the response for its latest version, and the least
+    recently used keys are dropped beyond max_entries. ETags are built from
+    a hash of the key, the version and a per-cache token, so they differ
+    between queries and never match across restarts.
+    """
+    BUILD_ATTEMPTS = 3  # Rebuilds while the data keeps changing underneath a build
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self.token = '%08x' % random.getrandbits(32)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, version, build, last_modified: Optional[float] = None,
+            fmt: Optional[str] = None, content_type: str = 'application/json', store: bool = True) -> EncodedResponse:
+        """Cached response for key at version(); build() returns the payload on a miss.
+
+        version() is read before and after each build. A body is only cached
+        when both match; otherwise it is rebuilt, and after BUILD_ATTEMPTS
+        served tagged with the later version, so an ETag is never older than
+        the data in its body. The payload is serialized as JSON unless
+        build() returns bytes. fmt names a representation chosen from the
+        Accept header; it becomes part of the ETag and the response varies
+        on Accept. With store=False the response is built and tagged the
+        same way but not cached, for one-off queries that would only evict
+        shared entries.
+        """
+        current = version()
+        if store:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] == current:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                self.misses += 1
+        for _ in range(self.BUILD_ATTEMPTS):
+            payload = build()
+            built, current = current, version()
+            if built == current:
+                break
+        body = payload if isinstance(payload, bytes) else json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        key_hash = '%08x' % zlib.crc32(repr(key).encode('utf-8'))
+        tag = '-'.join(map(str, (key_hash,) + current + ((fmt,) if fmt else ())))
+        encoded = EncodedResponse(
+            body, content_type, '"%s-%s"' % (self.token, tag), last_modified,
+            vary='Accept, Accept-Encoding' if fmt else 'Accept-Encoding'
+        )
+        if store and built == current:
+            with self._lock:
+                self._entries[key] = (current, encoded)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return encoded
+
+def json_reply(payload, status: int = 200) -> tuple:
+    """(status, headers, body) for a JSON payload, the reply shape of the shared route handlers"""
+    return status, {'Content-Type': 'application/json'}, json.dumps(payload).encode('utf-8')
+
+def error_reply(error, status: int = 400) -> tuple:
+    return json_reply({'success': False, 'error': str(error)}, status)
+
+def encoded_reply(encoded: EncodedResponse, headers) -> tuple:
+    """(status, headers, body) for a cached response, negotiated against the request headers"""
+    status, body, response_headers = encoded.negotiate(headers.get('If-None-Match'), headers.get('Accept-Encoding'))
+    return status, response_headers, body
+
+STREAM_HEADERS = {'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+STREAM_RETRY = b"retry: 2000\n\n"  # First chunk of every event stream
+
+def last_event_id(headers) -> Optional[int]:
+    """Sequence number a reconnecting event stream client has seen, if any"""
+    try:
+        return int(headers.get('Last-Event-ID'))
+    except (TypeError, ValueError):
+        return None
+
+def stream_chunk(event: Dict, seq: Optional[int]) -> tuple:
+    """(chunk, new seq) to send a stream client at seq once event is published or the wait timed out"""
+    if event['seq'] == seq:
+        return b": keepalive\n\n", seq
+    message = event['delta'] if seq is not None and event['base_seq'] == seq else event['full']
+    return message.encode('utf-8'), event['seq']
+
+class WebAction:
+    """A validated control request: the station call to make and the JSON reply once it succeeded.
+
+    call is a plain method on WellerStation and a coroutine function on
+    AsyncWellerStation, so each front end runs it its own way.
+    """
+    def __init__(self, call, args: tuple, payload: Dict, refresh: Optional[str] = None):
+        self.call = call
+        self.args = args
+        self.payload = payload
+        self.refresh = refresh  # None, 'status' or 'metadata': what the poller re-reads afterwards
+
+class SlotHoldingIterator:
+    """Response body that holds a semaphore slot until the server closes it.
+
+    The slot is released in close(), which WSGI servers call even when the
+    body was never iterated (HEAD requests, clients gone before the first
+    chunk), unlike a finally block inside a generator that never started.
+    """
+    def __init__(self, iterable, slots):
+        self._iterable = iterable
+        self._iterator = iter(iterable)
+        self._slots = slots
+        self._lock = threading.Lock()
+        self._held = True
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._iterator)
+
+    def close(self):
+        with self._lock:
+            held, self._held = self._held, False
+        if not held:
+            return
+        try:
+            if hasattr(self._iterable, 'close'):
+                self._iterable.close()
+        finally:
+            self._slots.release()
+
+class WebServer:
+    """Serves a Flask app in the background with the server chosen in WebConfig.server.
+
+    'waitress' runs the app on waitress with a pool of max_workers threads;
+    idle keep-alive connections are held by its event loop, not a worker.
+    Without the waitress package, and for 'development', Flask's built-in
+    app.run server is used instead. stop() stops accepting connections and
+    gives in-flight requests WebConfig.shutdown_timeout seconds to finish.
+    """
+    def __init__(self, app: Flask, web_config: 'WebConfig'):
+        self.app = app
+        self.web_config = web_config
+        self.logger = logging.getLogger('WebServer')
+        self.stopping = threading.Event()  # Lets event streams end on shutdown
+        self._server = None
+        self._thread = None
+        self._map = {}  # waitress socket map, closed by stop()
+
+    @property
+    def port(self) -> int:
+        """The bound port (useful with port 0)"""
+        if self._server is not None:
+            return self._server.effective_port
+        return self.web_config.port
+
+    def wsgi_app(self, environ, start_response):
+        environ['weller.server_stopping'] = self.stopping
+        return self.app(environ, start_response)
+
+    def start(self) -> 'WebServer':
+        config = self.web_config
+        server = config.server
+        if server == 'waitress' and waitress is None:
+            self.logger.warning("waitress is not installed (pip install waitress); using the development server")
+            server = 'development'
+        if server == 'development':
+            target = partial(self.app.run, port=config.port, host=config.host, threaded=True)
+        else:
+            # waitress takes whole seconds
+            idle_timeout = max(1, math.ceil(config.keepalive_timeout))
+            self._server = waitress.create_server(
+                self.wsgi_app, map=self._map, host=config.host, port=config.port, threads=config.max_workers,
+                connection_limit=config.max_workers + config.max_pending,
+                channel_timeout=idle_timeout, cleanup_interval=idle_timeout
+            )
+            target = self._server.run
+        self._thread = threading.Thread(target=target, name='WebServer', daemon=True)
+        self._thread.start()
+        self.logger.info(f"Web interface ({server}) listening on {config.host}:{self.port}")
+        return self
+
+    def stop(self) -> None:
+        """Stop accepting connections and let in-flight requests finish (not supported by 'development')"""
+        server, self._server = self._server, None
+        if server is None:
+            return
+        self.stopping.set()
+        server.accepting = False  # Checked by the server loop before each poll
+        server.task_dispatcher.shutdown(timeout=self.web_config.shutdown_timeout)
+        # Sockets are closed on the loop thread; the loop ends once the map is empty
+        server.trigger.pull_trigger(partial(waitress.wasyncore.close_all, self._map))
+        self._thread.join(self.web_config.shutdown_timeout)
+        self._thread = None
+
+class StationPoller:
+    """Background poller that owns all telemetry reads for a station.
+
+    Every refresh builds a new snapshot dict and swaps it in atomically; a
+    published snapshot is never mutated. Web routes serve from the latest
+    snapshot, so HTTP latency does not depend on the number of clients.
+    Stream events are serialized once per poll and shared by all subscribers.
+    """
+    CHANNELS = ('channel1', 'channel2')
+
+    def __init__(self, station, poll_interval=1.0, metadata_interval=30.0):
+        self.station = station
+        self.poll_interval = poll_interval
+        self.metadata_interval = metadata_interval
+        self.logger = logging.getLogger('StationPoller')
+        self._seq = 0
+        self._metadata = {}
+        self._metadata_time = None
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._condition = threading.Condition()
+        self._snapshot = None
+        self._stream_event = None
+        self._publish(self._build_snapshot(None, "Waiting for first poll"))
+
+    def start(self):
+        """Start the polling thread (no-op if already running)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='StationPoller', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """Stop the polling thread"""
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def request_refresh(self, metadata=False):
+        """Wake the poller early, e.g. after a set-point write"""
+        if metadata:
+            self._metadata_time = None
+        self._wakeup.set()
+
+    def get_snapshot(self) -> Dict:
+        """Return the latest published snapshot (never blocks on serial I/O)"""
+        return self._snapshot
+
+    def wait_for_event(self, last_seq: Optional[int], timeout: float) -> Dict:
+        """Block until a snapshot newer than last_seq is published or timeout expires.
+
+        Returns the current stream event: {'seq', 'base_seq', 'full', 'delta'},
+        where 'delta' is only valid for a subscriber that last saw base_seq.
+        """
+        with self._condition:
+            if self._stream_event['seq'] == last_seq:
+                self._condition.wait(timeout)
+            return self._stream_event
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wakeup.clear()
+            started = time.monotonic()
+            self.refresh()
+            remaining = self.poll_interval - (time.monotonic() - started)
+            if remaining > 0:
+                self._wakeup.wait(remaining)
+
+    def refresh(self) -> Dict:
+        """Poll the station once and publish a new snapshot"""
+        now = time.monotonic()
+        if self._metadata_time is None or now - self._metadata_time >= self.metadata_interval:
+            try:
+                self._metadata = self._read_metadata()
+                self._metadata_time = now
+            except Exception as e:
+                self.logger.error(f"Metadata refresh failed: {e}")
+
+        status, error = None, None
+        try:
+            sampler = self.station.sampler
+            if sampler and sampler.running:
+                status = self._status_from_sampler(sampler)
+            else:
+                status = self.station.read_all_status()
+        except Exception as e:
+            error = str(e)
+            self.logger.error(f"Status poll failed: {e}")
+
+        return self._complete_refresh(status, error)
+
+    def _status_from_sampler(self, sampler: 'TelemetrySampler') -> Dict:
+        """Build a read_all_status() result from the sampler's latest samples instead of the line"""
+        latest = sampler.get_latest()
+        if not all(latest[field] for field in ('temperature', 'status', 'tools')):
+            raise WellerError("Waiting for the first samples")
+        age = time.monotonic() - latest['temperature']['monotonic']
+        if age > 2 * self.poll_interval + sampler.ERROR_BACKOFF:
+            raise WellerError(f"No temperature sample for {age:.1f}s")
+        temps, status, tools = (latest[field]['value'] for field in ('temperature', 'status', 'tools'))
+        return {
+            ch: {
+                'status': self.station.get_status_string(status[ch]),
+                'temperature': temps[ch],
+                'tool': tools[ch]
+            } for ch in self.CHANNELS
+        }
+
+    def _complete_refresh(self, status, error) -> Dict:
+        """Record a polled status in the history and publish the new snapshot.
+
+        If the poll failed, the last known status is published again marked
+        stale, with stale_since set to the time of the last good reading.
+        """
+        if status:
+            self._record_status(status)
+        return self._publish_status(status, error)
+
+    def _record_status(self, status: Dict) -> None:
+        """Append a polled status to the history and store, unless a running sampler records it"""
+        sampler = self.station.sampler
+        if not (sampler and sampler.running):
+            self.station.record_history(
+                {ch: status[ch]['temperature'] for ch in self.CHANNELS},
+                set_temps=self._metadata.get('set_temperatures') or {},
+                statuses={ch: self.station.get_status_code(status[ch]['status']) for ch in self.CHANNELS}
+            )
+
+    def _publish_status(self, status, error) -> Dict:
+        """Publish the snapshot for a recorded status, or the last one marked stale if the poll failed"""
+        previous = self._snapshot
+        stale_since = None
+        if status:
+            if previous and previous['stale']:
+                self._metadata_time = None  # Back online: reload metadata on the next poll
+        elif previous and previous['status']:
+            status = previous['status']
+            stale_since = previous['stale_since'] or previous['timestamp']
+
+        snapshot = self._build_snapshot(status, error, stale_since)
+        self._publish(snapshot)
+        return snapshot
+
+    def _publish(self, snapshot: Dict) -> None:
+        previous = self._snapshot
+        event = {
+            'seq': snapshot['seq'],
+            'base_seq': previous['seq'] if previous else None,
+            'full': format_sse_event('snapshot', self._stream_payload(snapshot, None), snapshot['seq']),
+            'delta': format_sse_event('delta', self._stream_payload(snapshot, previous or {}), snapshot['seq'])
+        }
+        with self._condition:
+            self._snapshot = snapshot
+            self._stream_event = event
+            self._condition.notify_all()
+
+    def _stream_payload(self, snapshot: Dict, previous: Optional[Dict]) -> Dict:
+        """Compact stream payload; with a previous snapshot, unchanged status/tool fields are omitted.
+
+        Stale snapshots carry no channel readings, so charts are not extended with old values.
+        """
+        status = (not snapshot['stale'] and snapshot['status']) or {}
+        previous_status = (previous or {}).get('status') or {}
+        channels = {}
+        for ch in self.CHANNELS:
+            if ch not in status:
+                continue
+            info = status[ch]
+            before = previous_status.get(ch) if previous is not None else None
+            channels[ch] = {
+                key: info[key] for key in ('temperature', 'status', 'tool')
+                if key == 'temperature' or before is None or before[key] != info[key]
+            }
+        return {
+            'seq': snapshot['seq'],
+            'time': datetime.fromisoformat(snapshot['timestamp']).strftime('%H:%M:%S'),
+            'connected': snapshot['status'] is not None and not snapshot['stale'],
+            'stale': snapshot['stale'],
+            'channels': channels
+        }
+
+    def _read_metadata(self) -> Dict:
+        """Read values that rarely change (model, firmware, presets)"""
+        firmware = self.station.read_firmware_version()
+        return {
+            'model': self.station.read_unit_id(),
+            'firmware': firmware,
+            'presets': self.station.get_preset_temperatures(),
+            'set_temperatures': self.station.read_set_temperature(),
+            'connection_details': self.station.describe_connection(firmware)
+        }
+
+    def _build_snapshot(self, status, error, stale_since: Optional[str] = None) -> Dict:
+        station = self.station
+        self._seq += 1
+        timestamp = datetime.now()
+        temps = {ch: status[ch]['temperature'] for ch in self.CHANNELS} if status else None
+        tool_info = {}
+        if status:
+            for ch in self.CHANNELS:
+                tool_info[ch] = station.tool_details(status[ch]['tool'])  # No serial I/O while publishing
+
+        return {
+            'seq': self._seq,
+            'timestamp': timestamp.isoformat(),
+            'last_updated': timestamp.strftime('%Y-%m-%d %H:%M:%S'),
+            'status': status,
+            'temperatures': temps,
+            'statistics': {ch: station.get_temperature_statistics(ch) for ch in self.CHANNELS},
+            'windowed_statistics': {
+                ch: {window: station.get_temperature_statistics(ch, window)
+                     for window in TemperatureRingBuffer.STATISTICS_WINDOWS}
+                for ch in self.CHANNELS
+            },
+            'presets': self._metadata.get('presets'),
+            'station_info': {
+                'model': self._metadata.get('model'),
+                'firmware': self._metadata.get('firmware'),
+                'connection': station.connection_type.name if station.connection_type else 'Unknown',
+                'temp_limits': dict(station.temp_limits),
+                'connection_status': 'Offline' if stale_since else 'Connected' if status else 'Disconnected'
+            },
+            'connection_details': self._metadata.get('connection_details'),
+            'tool_info': tool_info,
+            'stale': stale_since is not None,
+            'stale_since': stale_since,
+            'error': error
+        }
+
+class TelemetrySampler:
+    """Background sampler that reads each station field at its own rate.
+
+    Temperature is read back to back by default, status and tool type on
+    fixed periods, presets only after request_presets(). A field's next due
+    time advances by whole periods from its previous due time, not from when
+    the read finished, so read latency does not add up to drift; when reads
+    fall behind, missed slots are skipped instead of being caught up in a
+    burst. Samples are timestamped at the midpoint of the read on the
+    time.monotonic() clock and mapped to epoch milliseconds through a single
+    anchor, so history timestamps stay increasing even if the wall clock
+    is adjusted.
+    """
+    FIELDS = ('temperature', 'status', 'tools', 'presets')
+    ERROR_BACKOFF = 0.5  # Seconds before a failed field is read again
+
+    def __init__(self, station, config: Optional[SamplerConfig] = None, on_sample=None):
+        config = config or SamplerConfig()
+        self.station = station
+        self.on_sample = on_sample  # Called as on_sample(field, value, timestamp_ms)
+        self.periods = {
+            'temperature': self._period(config.temperature_rate),
+            'status': self._period(config.status_rate),
+            'tools': self._period(config.tools_rate),
+            'presets': None
+        }
+        self.logger = logging.getLogger('TelemetrySampler')
+        self._readers = {
+            'temperature': self._read_temperature,
+            'status': self._read_status,
+            'tools': self._read_tools,
+            'presets': self._read_presets
+        }
+        self._latest = {field: None for field in self.FIELDS}
+        self._samples = {field: 0 for field in self.FIELDS}
+        self._errors = {field: 0 for field in self.FIELDS}
+        self._next_due = {}
+        self._presets_requested = False
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._anchor_ms = None
+        self._anchor_monotonic = None  # Also the start time of the current run
+
+    @staticmethod
+    def _period(rate: Optional[float]) -> Optional[float]:
+        """Seconds between samples: 0.0 for as fast as possible, None for disabled"""
+        if rate is None:
+            return 0.0
+        return 1.0 / rate if rate > 0 else None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start sampling (no-op if already running)"""
+        if self.running:
+            return
+        self._anchor_ms = time.time() * 1000
+        self._anchor_monotonic = time.monotonic()
+        self._next_due = {
+            field: self._anchor_monotonic for field, period in self.periods.items() if period is not None
+        }
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='TelemetrySampler', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """Stop sampling"""
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def request_presets(self) -> None:
+        """Read the presets once, ahead of any queued periodic field"""
+        with self._lock:
+            self._presets_requested = True
+        self._wakeup.set()
+
+    def get_latest(self) -> Dict[str, Optional[Dict]]:
+        """Return {field: {'value', 'timestamp_ms', 'monotonic'} or None} with the newest sample of each field"""
+        with self._lock:
+            return dict(self._latest)
+
+    def get_rates(self) -> Dict[str, Dict]:
+        """Return {field: {'samples', 'errors', 'rate'}}, rate being the achieved samples per second"""
+        elapsed = time.monotonic() - self._anchor_monotonic if self._anchor_monotonic is not None else 0.0
+        with self._lock:
+            return {
+                field: {
+                    'samples': self._samples[field],
+                    'errors': self._errors[field],
+                    'rate': self._samples[field] / elapsed if elapsed > 0 else 0.0
+                } for field in self.FIELDS
+            }
+
+    def to_epoch_ms(self, monotonic_time: float) -> int:
+        """Map a time.monotonic() value onto epoch milliseconds"""
+        return int(self._anchor_ms + (monotonic_time - self._anchor_monotonic) * 1000)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wakeup.clear()
+            field, wait = self._next_field(time.monotonic())
+            if field is None:
+                self._wakeup.wait(wait)
+                continue
+            self._sample(field)
+
+    def _next_field(self, now: float) -> tuple:
+        """Return (field, None) for the most overdue field, or (None, seconds until one is due)"""
+        with self._lock:
+            if self._presets_requested:
+                self._presets_requested = False
+                return 'presets', None
+        if not self._next_due:
+            return None, 1.0
+        field = min(self._next_due, key=self._next_due.get)
+        due = self._next_due[field]
+        if due <= now:
+            return field, None
+        return None, due - now
+
+    def _sample(self, field: str) -> None:
+        """Read field and record the sample; any failure only delays the field's next read"""
+        started = time.monotonic()
+        try:
+            value = self._readers[field]()
+            self._record(field, value, started, time.monotonic())
+        except Exception as e:
+            with self._lock:
+                self._errors[field] += 1
+            if isinstance(e, WellerError):
+                self.logger.debug(f"Sampling {field} failed: {e}")
+            else:
+                self.logger.exception(f"Sampling {field} failed")
+            if field in self._next_due:
+                self._next_due[field] = time.monotonic() + max(self.periods[field], self.ERROR_BACKOFF)
+
+    def _record(self, field: str, value, started: float, finished: float) -> None:
+        midpoint = (started + finished) / 2
+        timestamp_ms = self.to_epoch_ms(midpoint)
+        with self._lock:
+            self._latest[field] = {'value': value, 'timestamp_ms': timestamp_ms, 'monotonic': midpoint}
+            self._samples[field] += 1
+            status = self._latest['status']
+        if field == 'temperature':
+            self.station.record_history(value, timestamp_ms=timestamp_ms,
+                                        statuses=status['value'] if status else None)
+        if field in self._next_due:
+            self._advance(field, finished)
+        if self.on_sample:
+            self.on_sample(field, value, timestamp_ms)
+
+    def _advance(self, field: str, now: float) -> None:
+        """Schedule the next read of field one period after its previous due time"""
+        period = self.periods[field]
+        if period == 0.0:
+            self._next_due[field] = now
+            return
+        due = self._next_due[field] + period
+        if due <= now:
+            due += (int((now - due) // period) + 1) * period  # Skip missed slots, keep the phase
+        self._next_due[field] = due
+
+    def _read_temperature(self):
+        return self.station.read_temperature()
+
+    def _read_status(self):
+        return self.station.read_status()
+
+    def _read_tools(self):
+        self.station.metadata_cache.invalidate('tools')
+        return self.station.read_tool_type()
+
+    def _read_presets(self):
+        self.station.metadata_cache.invalidate('preset1')
+        self.station.metadata_cache.invalidate('preset2')
+        return self.station.get_preset_temperatures()
+
+class MetadataCache:
+    """TTL cache for station values that rarely change.
+
+    A TTL of None keeps an entry until it is invalidated. Stations
+    invalidate entries when they write them, clear the cache on reconnect
+    and drop the tool entry when polling shows a channel status change,
+    which is how a tool swap shows up in the Q reply.
+    """
+    DEFAULT_TTLS = {
+        'unit_id': None,
+        'firmware': None,
+        'tools': 5.0,
+        'preset1': 300.0,
+        'preset2': 300.0
+    }
+
+    def __init__(self, ttls: Optional[Dict[str, Optional[float]]] = None):
+        self.ttls = dict(self.DEFAULT_TTLS, **(ttls or {}))
+        self._entries = {}
+
+    def get(self, key: str):
+        """Cached value, or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires = entry
+        if expires is not None and time.monotonic() >= expires:
+            return None
+        return value
+
+    def put(self, key: str, value):
+        """Cache value (None is not cached) and return it"""
+        if value is not None:
+            ttl = self.ttls.get(key)
+            self._entries[key] = (value, None if ttl is None else time.monotonic() + ttl)
+        return value
+
+    def fetch(self, key: str, loader):
+        """Cached value, calling loader() on a miss"""
+        value = self.get(key)
+        return value if value is not None else self.put(key, loader())
+
+    def invalidate(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+class PortSupervisor:
+    """Watch serial ports for hot-plug events and reconnect stations.
+
+    A background thread polls serial.tools.list_ports every interval
+    seconds. When a watched station's port disappears the station is
+    disconnected; when it (or the same USB adapter under a new name)
+    reappears, the station reopens it and restores its remote mode. Ports
+    that list_ports does not enumerate (e.g. ptys or symlinks) are watched
+    by checking whether the device path exists.
+    """
+    def __init__(self, interval=0.25, reconnect_interval=1.0):
+        self.interval = interval
+        self.reconnect_interval = reconnect_interval  # Between attempts while a present port stays offline
+        self.logger = logging.getLogger('PortSupervisor')
+        self._stations = []
+        self._last_attempt = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def watch(self, station: 'WellerStation') -> None:
+        with self._lock:
+            if station not in self._stations:
+                self._stations.append(station)
+
+    def unwatch(self, station: 'WellerStation') -> None:
+        with self._lock:
+            if station in self._stations:
+                self._stations.remove(station)
+            self._last_attempt.pop(id(station), None)
+
+    def start(self):
+        """Start the watcher thread (no-op if already running)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='PortSupervisor', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.check()
+            except Exception as e:
+                self.logger.error(f"Port check failed: {e}")
+            self._stop.wait(self.interval)
+
+    def check(self) -> None:
+        """Compare the current ports with every watched station once"""
+        ports = {port.device: port for port in serial.tools.list_ports.comports()}
+        for station, device in self._plan(ports):
+            if device is None:
+                self.logger.warning(f"Port {station.port} removed")
+                station.disconnect()
+                continue
+            try:
+                station.reconnect(device)
+                self.logger.info(f"Reconnected station on {device}")
+            except WellerError as e:
+                self.logger.debug(f"Reconnect on {device} failed: {e}")
+
+    def _plan(self, ports: Dict) -> List[tuple]:
+        """(station, device) pairs to act on: device None to disconnect, else the port to reconnect on"""
+        with self._lock:
+            stations = list(self._stations)
+        actions = []
+        for station in stations:
+            device = self._locate(station, ports)
+            if device is None:
+                if station.is_connected:
+                    actions.append((station, None))
+                continue
+
+            if station.is_connected and device == station.port and not station.circuit_breaker.is_open:
+                continue
+            # Back (possibly under a new name), or present but not answering
+            now = time.monotonic()
+            if not station.is_connected or device != station.port \
+                    or now - self._last_attempt.get(id(station), 0.0) >= self.reconnect_interval:
+                self._last_attempt[id(station)] = now
+                actions.append((station, device))
+        return actions
+
+    @staticmethod
+    def _locate(station: 'WellerStation', ports: Dict) -> Optional[str]:
+        """Current device path of the station's adapter, or None if it is unplugged"""
+        if station.port in ports:
+            return station.port
+        identity = station.port_identity
+        if identity:
+            for device, info in ports.items():
+                if PortSupervisor.identity_of(info) == identity:
+                    return device
+            return None
+        return station.port if os.path.exists(station.port) else None
+
+    @staticmethod
+    def identity_of(info) -> Optional[tuple]:
+        """Stable identity of a USB serial adapter across re-enumeration"""
+        if info is None or info.vid is None:
+            return None
+        return (info.vid, info.pid, info.serial_number or info.location)
+
+TOOL_DETAILS = {
+    ToolType.WXP120: {
+        'name': 'WXP 120',
+        'max_temp': 450,
+        'power': '120W',
+        'description': 'High-power soldering iron'
+    },
+    ToolType.WXP200: {
+        'name': 'WXP 200',
+        'max_temp': 450,
+        'power': '200W',
+        'description': 'High-power soldering iron'
+    },
+    ToolType.WXMP: {
+        'name': 'WXMP',
+        'max_temp': 450,
+        'power': '40W',
+        'description': 'Micro soldering iron'
+    },
+    ToolType.WXMT: {
+        'name': 'WXMT',
+        'max_temp': 450,
+        'power': '120W',
+        'description': 'Desoldering tweezers'
+    },
+    ToolType.WXP65: {
+        'name': 'WXP 65',
+        'max_temp': 450,
+        'power': '65W',
+        'description': 'Standard soldering iron'
+    },
+    ToolType.WXP80: {
+        'name': 'WXP 80',
+        'max_temp': 450,
+        'power': '80W',
+        'description': 'Standard soldering iron'
+    },
+    ToolType.WXB200: {
+        'name': 'WXB 200',
+        'max_temp': 450,
+        'power': '200W',
+        'description': 'Bath'
+    }
+}
+UNKNOWN_TOOL_DETAILS = {
+    'name': 'Unknown/No Tool',
+    'max_temp': 450,
+    'power': 'N/A',
+    'description': 'Unknown tool or no tool connected'
+}
+
+class StationBase:
+    """State and helpers shared by WellerStation and AsyncWellerStation.
+
+    History, statistics, storage, snapshot payloads and the web route
+    handlers live here. Nothing in this class does serial I/O: subclasses
+    supply the station commands, as plain methods (WellerStation) or
+    coroutines (AsyncWellerStation).
+    """
+    @staticmethod
+    def tool_details(tool_name: Optional[str]) -> dict:
+        """Details of a tool by its ToolType name; UNKNOWN_TOOL_DETAILS for unnamed codes or no tool"""
+        return TOOL_DETAILS.get(ToolType.__members__.get(tool_name), UNKNOWN_TOOL_DETAILS)
+
+    def describe_connection(self, firmware_version: Optional[str]) -> Dict[str, str]:
+        """Connection details from known state and an already read firmware version"""
+        return {
+            'type': self.connection_type.name if self.connection_type else 'Unknown',
+            'mode': self.remote_mode.name if hasattr(self, 'remote_mode') else 'Unknown',
+            'button_lock': 'Enabled' if hasattr(self, 'button_lock') and self.button_lock else 'Disabled',
+            'firmware_version': firmware_version or 'Unknown'
+        }
+
+    def get_status_string(self, status_code):
+        """Convert status code to readable string"""
+        return self.status_map.get(StationStatus(int(status_code)), "UNKNOWN")
+
+    def get_status_code(self, status_string: str) -> Optional[int]:
+        """Convert a readable status string back to its code"""
+        for code, name in self.status_map.items():
+            if name == status_string:
+                return int(code)
+        return None
+
+    def _check_status_change(self, status: Optional[Dict[str, int]]) -> None:
+        """Drop the cached tool types when a channel's status changes (e.g. a tool swap)"""
+        if status and status != self._last_status_codes:
+            if self._last_status_codes is not None:
+                self.metadata_cache.invalidate('tools')
+            self._last_status_codes = status
+
+    def _pipeline_failed(self, error: WellerError) -> None:
+        """Count a batch that failed although single queries worked; stop pipelining if it keeps happening"""
+        self._pipeline_failures += 1
+        self.logger.debug(f"Pipelined read failed ({error}), sent one command at a time")
+        if self._pipeline_failures >= PIPELINE_FAILURE_LIMIT:
+            self.logger.warning("Station does not handle pipelined queries; sending one command at a time from now on")
+            self.pipelining = False
+
+    def record_history(self, temps: Dict[str, float], timestamp: Optional[datetime] = None,
+                       set_temps: Optional[Dict[str, float]] = None,
+                       statuses: Optional[Dict[str, int]] = None, timestamp_ms: Optional[int] = None) -> None:
+        """Append one temperature sample per channel to the history and the on-disk store"""
+        if timestamp_ms is None:
+            timestamp_ms = to_epoch_ms(timestamp or datetime.now())
+        internal = tuple(TemperatureConverter.to_internal(temps[channel]) for channel in ['channel1', 'channel2'])
+        for channel, value in zip(['channel1', 'channel2'], internal):
+            self.temperature_history[channel].append(timestamp_ms, value)
+
+        if self.store:
+            set_temps = set_temps or {}
+            statuses = statuses or {}
+            try:
+                self.store.append(
+                    timestamp_ms,
+                    internal,
+                    tuple(None if set_temps.get(ch) is None else TemperatureConverter.to_internal(set_temps[ch])
+                          for ch in ['channel1', 'channel2']),
+                    tuple(statuses.get(ch) for ch in ['channel1', 'channel2'])
+                )
+            except OSError as e:
+                self.logger.error(f"Failed to persist sample: {e}")
+
+    def open_store(self, storage_config: Optional['StorageConfig']) -> Optional[TimeSeriesStore]:
+        """Open the on-disk time-series store if storage is configured"""
+        if storage_config is None:
+            return None
+        return TimeSeriesStore(
+            storage_config.directory,
+            segment_seconds=storage_config.segment_seconds,
+            retention_days=storage_config.retention_days
+        )
+
+    def get_temperature_statistics(self, channel: str, window: str = 'all') -> Dict:
+        """Get temperature statistics for a channel.
+
+        window is one of TemperatureRingBuffer.STATISTICS_WINDOWS ('10s',
+        '1min' or 'all' for the whole buffer).
+        """
+        return self.temperature_history[channel].statistics(window)
+
+    def get_uptime(self):
+        """Get station uptime"""
+        delta = datetime.now() - self.start_time
+        hours = delta.total_seconds() / 3600
+        return f"{hours:.1f} hours"
+
+    def get_history(self, channel: str, start_ms: Optional[int] = None, end_ms: Optional[int] = None,
+                    points: Optional[int] = None, method: str = 'lttb') -> tuple:
+        """Return (timestamps_ms, values, raw_count) for a time range, decimated to ~points samples"""
+        return self._read_history(channel, start_ms, end_ms, points, method)[:3]
+
+    def _read_history(self, channel: str, start_ms: Optional[int], end_ms: Optional[int],
+                      points: Optional[int], method: str) -> tuple:
+        """get_history() plus the sample number following the last raw sample read"""
+        if method not in DOWNSAMPLERS:
+            raise WellerError(f"Unknown downsampling method: {method}")
+        if channel not in self.temperature_history:
+            raise WellerError(f"Unknown channel: {channel}")
+        timestamps, values, cursor = self.temperature_history[channel].read_range(start_ms, end_ms)
+        raw_count = len(values)
+        if points:
+            timestamps, values = DOWNSAMPLERS[method](timestamps, values, points)
+        return timestamps, values, raw_count, cursor
+
+    def get_history_since(self, channel: str, since: int, limit: Optional[int] = None) -> tuple:
+        """Samples recorded after cursor since, as (timestamps_ms, values, cursor, missed, reset).
+
+        Cursors are sample numbers, so a client passes back the cursor it
+        was given to receive only newer samples. missed counts samples that
+        were overwritten before they were read; reset is set when since was
+        not issued by this buffer (e.g. before a restart) and the read started
+        over from the oldest sample.
+        """
+        if channel not in self.temperature_history:
+            raise WellerError(f"Unknown channel: {channel}")
+        history = self.temperature_history[channel]
+        reset = since < 0 or since > history.total
+        if reset:
+            since = 0
+        timestamps, values, cursor = history.read_from(since, limit)
+        missed = cursor - len(values) - since
+        return timestamps, values, cursor, missed, reset
+
+    def get_history_payload(self) -> Dict[str, List[Dict]]:
+        """Temperature history formatted for the dashboard charts"""
+        payload = {}
+        for channel in ['channel1', 'channel2']:
+            timestamps, values, _ = self.get_history(channel, points=self.web_config.history_points)
+            payload[channel] = [{
+                'temperature': TemperatureConverter.from_internal(value),
+                'time': from_epoch_ms(timestamp_ms).strftime('%H:%M:%S')
+            } for timestamp_ms, value in zip(timestamps, values)]
+        return payload
+
+    def get_bootstrap_payload(self) -> Dict:
+        """Initial dashboard state, taken from the poller snapshot"""
+        snapshot = self.get_snapshot()
+        station_info = dict(snapshot['station_info'])
+        station_info['uptime'] = self.get_uptime()
+        station_info['last_updated'] = snapshot['last_updated']
+        return {
+            'success': True,
+            'seq': snapshot['seq'],
+            'status': snapshot['status'],
+            'statistics': snapshot['statistics'],
+            'presets': snapshot['presets'],
+            'station_info': station_info,
+            'tool_info': snapshot['tool_info'],
+            'stale': snapshot['stale'],
+            'error': snapshot['error']
+        }
+
+    def get_status_response(self, include_history: bool = True) -> EncodedResponse:
+        """Serialized /api/status, rebuilt only after a new snapshot or (with history) a new sample"""
+        snapshot = self.get_snapshot()
+
+        def version():
+            if include_history:
+                return (snapshot['seq'],) + tuple(history.total for history in self.temperature_history.values())
+            return (snapshot['seq'],)
+
+        def build():
+            payload = {
+                'success': snapshot['status'] is not None,
+                'status': snapshot['status'],
+                'temperatures': snapshot['temperatures'],
+                'statistics': snapshot['statistics'],
+                'windowed_statistics': snapshot['windowed_statistics'],
+                'timestamp': snapshot['timestamp'],
+                'stale': snapshot['stale'],
+                'stale_since': snapshot['stale_since'],
+                'error': snapshot['error']
+            }
+            if include_history:
+                payload['temperature_history'] = self.get_history_payload()
+            return payload
+
+        return self.response_cache.get(
+            ('status', include_history), version, build,
+            last_modified=datetime.fromisoformat(snapshot['timestamp']).timestamp()
+        )
+
+    def get_history_response(self, channel: str, start_ms: Optional[int] = None, end_ms: Optional[int] = None,
+                             points: Optional[int] = None, method: str = 'lttb',
+                             since: Optional[int] = None, limit: Optional[int] = None,
+                             fmt: str = 'json') -> EncodedResponse:
+        """Serialized /api/temperature_history, rebuilt only after a new sample on channel.
+
+        With since, only the raw samples after that cursor are returned and
+        the time range and decimation parameters are ignored. fmt is a key of
+        HISTORY_FORMATS.
+        """
+        if fmt not in HISTORY_FORMATS:
+            raise WellerError(f"Unknown history format: {fmt}")
+        if channel not in self.temperature_history:
+            raise WellerError(f"Unknown channel: {channel}")
+        history = self.temperature_history[channel]
+
+        def version():
+            return (history.total,)
+
+        def build():
+            if since is None:
+                timestamps, values, raw_count, cursor = self._read_history(channel, start_ms, end_ms, points, method)
+                extra = {'count': raw_count, 'decimated': len(values) < raw_count, 'method': method}
+            else:
+                timestamps, values, cursor, missed, reset = self.get_history_since(channel, since, limit)
+                extra = {'count': len(values), 'missed': missed, 'reset': reset}
+            if fmt != 'json':
+                return encode_history(
+                    fmt, timestamps, values, cursor, raw_count=extra['count'], missed=extra.get('missed', 0),
+                    decimated=extra.get('decimated', False), reset=extra.get('reset', False)
+                )
+            return {
+                'success': True,
+                'temperatures': [TemperatureConverter.from_internal(value) for value in values],
+                'timestamps': [from_epoch_ms(timestamp_ms).isoformat() for timestamp_ms in timestamps],
+                'cursor': cursor,
+                **extra
+            }
+
+        if since is None:
+            key = ('history', channel, start_ms, end_ms, points, method, fmt)
+        else:
+            key = ('since', channel, since, limit, fmt)
+        latest = history.latest()
+        # Every poll brings a new cursor, so cursor reads are tagged but not cached
+        return self.response_cache.get(
+            key, version, build, last_modified=latest[0] / 1000.0 if latest else None,
+            fmt=fmt, content_type=HISTORY_FORMATS[fmt], store=since is None
+        )
+
+    def iter_export(self, fmt: str = 'csv', start_ms: Optional[int] = None, end_ms: Optional[int] = None,
+                    compress: bool = False):
+        """Export chunks for a time range in fmt, a key of EXPORT_FORMATS"""
+        if fmt not in EXPORT_FORMATS:
+            raise WellerError(f"Unknown export format: {fmt}")
+        if fmt == 'msgpack':
+            _require_msgpack()  # Fail before the response starts rather than mid-stream
+        if fmt in COLUMNAR_FORMATS:
+            return iter_columnar_chunks(self.iter_export_records(start_ms, end_ms), fmt, compress)
+        return iter_export_chunks(self.iter_export_rows(start_ms, end_ms), fmt, compress)
+
+    def iter_export_rows(self, start_ms: Optional[int] = None, end_ms: Optional[int] = None):
+        """Yield time-aligned export rows (see EXPORT_COLUMNS) for a time range"""
+        missing = TimeSeriesStore.MISSING_VALUE
+
+        def temperature(value):
+            return None if value == missing else TemperatureConverter.from_internal(value)
+
+        def status_name(code):
+            try:
+                return self.get_status_string(code)
+            except (TypeError, ValueError):
+                return None
+
+        for timestamp_ms, t1, t2, s1, s2, st1, st2 in self.iter_export_records(start_ms, end_ms):
+            yield (
+                from_epoch_ms(timestamp_ms).isoformat(),
+                temperature(t1), temperature(t2),
+                temperature(s1), temperature(s2),
+                status_name(st1), status_name(st2)
+            )
+
+    def iter_export_records(self, start_ms: Optional[int] = None, end_ms: Optional[int] = None):
+        """Yield raw time-aligned records (timestamp_ms, temp1, temp2, set1, set2, status1, status2).
+
+        Temperatures are in 1/10°C and statuses are codes, with
+        TimeSeriesStore.MISSING_VALUE / MISSING_STATUS for unknown values.
+        Reads from the on-disk store when one is configured, otherwise from
+        the in-memory history (which has no set points or status).
+        """
+        if self.store:
+            yield from self.store.read(start_ms, end_ms)
+            return
+
+        missing, no_status = TimeSeriesStore.MISSING_VALUE, TimeSeriesStore.MISSING_STATUS
+
+        # Merge both channels on timestamp so rows line up even if one channel has extra samples
+        channel1 = self.temperature_history['channel1'].iter_range(start_ms, end_ms)
+        channel2 = self.temperature_history['channel2'].iter_range(start_ms, end_ms)
+        sample1, sample2 = next(channel1, None), next(channel2, None)
+        while sample1 or sample2:
+            if sample2 is None or (sample1 and sample1[0] < sample2[0]):
+                timestamp_ms, t1, t2 = sample1[0], sample1[1], None
+                sample1 = next(channel1, None)
+            elif sample1 is None or sample2[0] < sample1[0]:
+                timestamp_ms, t1, t2 = sample2[0], None, sample2[1]
+                sample2 = next(channel2, None)
+            else:
+                timestamp_ms, t1, t2 = sample1[0], sample1[1], sample2[1]
+                sample1, sample2 = next(channel1, None), next(channel2, None)
+            yield (
+                timestamp_ms,
+                missing if t1 is None else t1, missing if t2 is None else t2,
+                missing, missing, no_status, no_status
+            )
+
+    def web_home(self, headers) -> tuple:
+        try:
+            return encoded_reply(dashboard_page(), headers)
+        except Exception as e:
+            self.logger.error(f"Error in home route: {str(e)}")
+            return error_reply(f"Error loading interface: {str(e)}", 500)
+
+    def web_bootstrap(self) -> tuple:
+        try:
+            return json_reply(self.get_bootstrap_payload())
+        except Exception as e:
+            return error_reply(e)
+
+    def web_status(self, args, headers) -> tuple:
+        try:
+            return encoded_reply(self.get_status_response(
+                include_history=args.get('history', '1').lower() not in ('0', 'false', 'no')
+            ), headers)
+        except Exception as e:
+            return error_reply(e)
+
+    def web_temperature_history(self, channel: str, args, headers) -> tuple:
+        """Query parameters: start/end (epoch ms or ISO-8601), points, method (lttb|minmax),
+        or since (cursor from a previous response) and limit for only the newer samples.
+        The Accept header selects JSON, the binary frame or MessagePack (HISTORY_FORMATS)."""
+        try:
+            points = parse_int_param(args.get('points'))
+            return encoded_reply(self.get_history_response(
+                f'channel{channel}',
+                start_ms=parse_time_param(args.get('start')),
+                end_ms=parse_time_param(args.get('end')),
+                points=self.web_config.history_points if points is None else points,
+                method=args.get('method', 'lttb'),
+                since=parse_int_param(args.get('since')),
+                limit=parse_int_param(args.get('limit')),
+                fmt=negotiate_format(headers.get('Accept'), HISTORY_FORMATS, 'json')
+            ), headers)
+        except Exception as e:
+            return error_reply(e)
+
+    def web_export(self, args, headers) -> tuple:
+        """Query parameters: start/end (epoch ms or ISO-8601), format (csv|ndjson|binary|msgpack,
+        otherwise chosen from the Accept header), gzip (0|1). A successful body is an iterator of chunks."""
+        try:
+            fmt = args.get('format') or negotiate_format(headers.get('Accept'), EXPORT_FORMATS, 'csv')
+            compress = args.get('gzip', '0').lower() in ('1', 'true', 'yes')
+            chunks = self.iter_export(fmt, parse_time_param(args.get('start')), parse_time_param(args.get('end')), compress)
+        except Exception as e:
+            return error_reply(e)
+
+        filename = f"weller_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{fmt}"
+        if compress:
+            filename += '.gz'
+        return 200, {
+            'Content-Type': 'application/gzip' if compress else EXPORT_FORMATS[fmt],
+            'Content-Disposition': f'attachment; filename={filename}'
+        }, chunks
+
+    def web_tool_info(self, channel: int) -> tuple:
+        try:
+            info = self.get_snapshot()['tool_info'].get(f'channel{channel}')
+            if info is None:
+                raise WellerError(f"No tool information for channel {channel}")
+            return json_reply({'success': True, 'info': info})
+        except Exception as e:
+            return error_reply(e)
+
+    def web_connection_details(self) -> tuple:
+        try:
+            details = self.get_snapshot()['connection_details']
+            if details is None:
+                raise WellerError("Connection details not available yet")
+            return json_reply({'success': True, 'details': details})
+        except Exception as e:
+            return error_reply(e)
+
+    def web_set_temperature(self, channel: int, temp: float) -> WebAction:
+        if channel not in [1, 2]:
+            raise WellerError("Invalid channel")
+        if not (self.temp_limits['min'] <= temp <= self.temp_limits['max']):
+            raise WellerError(f"Temperature must be between {self.temp_limits['min']} and {self.temp_limits['max']}°C")
+        return WebAction(self.set_temperature, (channel, temp), {
+            'success': True,
+            'temperature': temp,
+            'channel': channel,
+            'message': f'Temperature set to {temp}°C'
+        }, refresh='metadata')
+
+    def web_set_mode(self, channel: int, mode: str) -> WebAction:
+        mode_map = {'ON': StationStatus.ON, 'OFF': StationStatus.OFF,
+                    'STANDBY': StationStatus.STANDBY, 'AUTOOFF': StationStatus.AUTOOFF}
+        if mode not in mode_map:
+            raise WellerError(f'Invalid mode: {mode}')
+        return WebAction(self.set_channel_mode, (channel, mode_map[mode]), {'success': True, 'mode': mode},
+                         refresh='status')
+
+    def web_set_preset(self, channel: int, preset_num: int, temp: float) -> WebAction:
+        call = self.set_preset_temperature1 if preset_num == 1 else self.set_preset_temperature2
+        return WebAction(call, (channel, temp), {'success': True, 'presetNum': preset_num, 'temperature': temp},
+                         refresh='metadata')
+
+    def web_activate_preset(self, channel: int, preset_num: int) -> WebAction:
+        presets = self.get_snapshot()['presets'] or {}
+        channel_presets = presets.get(f'channel{channel}')
+        temp = channel_presets and channel_presets[f'preset{1 if preset_num == 1 else 2}']
+        if temp is None:
+            raise WellerError(f"No preset {preset_num} known for channel {channel}")
+        return WebAction(self.set_temperature, (channel, temp), {'success': True, 'presetNum': preset_num},
+                         refresh='metadata')
+
+    def web_fingerswitch(self, channel: int, seconds: int) -> WebAction:
+        return WebAction(self.fingerswitch_action, (channel, seconds), {'success': True})
+
+    def web_remote_mode(self, mode: int) -> WebAction:
+        return WebAction(self.set_remote_mode, (RemoteMode(mode),), {'success': True, 'mode': mode},
+                         refresh='metadata')
+
+    def complete_web_action(self, action: WebAction) -> tuple:
+        """Reply for a WebAction whose call succeeded; asks the poller to pick up the change"""
+        if action.refresh and self.poller:
+            self.poller.request_refresh(metadata=action.refresh == 'metadata')
+        return json_reply(action.payload)
+
+class WellerStation(StationBase):
+    UNFRAMED_QUIET_BYTES = 3  # Character times of silence that end a reply of unknown format
+
+    @staticmethod
+    def list_available_ports():
+        """List all available COM ports"""
+        ports = []
+        for port in serial.tools.list_ports.comports():
+            ports.append({
+                'port': port.device,
+                'description': port.description,
+                'manufacturer': port.manufacturer
+            })
+        return ports
+
+    @staticmethod
+    def find_weller_ports() -> List[str]:
+        """Find all ports that look like a Weller station"""
+        ports = []
+        for port in serial.tools.list_ports.comports():
+            # Look for common USB-Serial adapters or Weller in description
+            if any(x in port.description.lower() for x in ['weller', 'usb', 'serial', 'uart', 'cp210x', 'ch340']):
+                ports.append(port.device)
+        return ports
+
+    @staticmethod
+    def find_weller_port():
+        """Try to automatically find the Weller station port"""
+        ports = WellerStation.find_weller_ports()
+        return ports[0] if ports else None
+
+    def __init__(self, port=None, baudrate=1200, log_file=None, max_history=1000, web_interface=False, web_config=None,
+                 storage_config=None):
+        """Initialize WellerStation with automatic port discovery"""
+        if port is None:
+            port = self.find_weller_port()
+            if port is None:
+                available_ports = self.list_available_ports()
+                raise WellerError(
+                    f"No Weller station found. Available ports:\n" +
+                    "\n".join([f"{p['port']}: {p['description']}"] for p in available_ports)
+                )
+        
+        self.baudrate = baudrate
+        try:
+            self.ser = self._open_serial(port)
+        except serial.SerialException as e:
+            available_ports = self.list_available_ports()
+            raise WellerError(
+                f"Failed to open port {port}. Error: {str(e)}\n"
+                f"Available ports:\n" +
+                "\n".join([f"{p['port']}: {p['description']}"] for p in available_ports)
+            )
+
+        self.port = port
+        self.port_identity = self._port_identity(port)
+        self.remote_mode = RemoteMode.DISABLED
+        self.reply_timeout = AdaptiveTimeout(baudrate)
+        self.retry_policies = {
+            SerialWorker.PRIORITY_CONTROL: RetryPolicy(attempts=3, deadline=0.3),
+            SerialWorker.PRIORITY_QUERY: RetryPolicy(attempts=3, deadline=0.6)
+        }
+        self.circuit_breaker = CircuitBreaker()
+        self.metadata_cache = MetadataCache()
+        self._last_status_codes = None
+        self.pipelining = True  # Cleared if the station cannot handle back-to-back queries
+        self._pipeline_failures = 0
+        self._serial_worker = SerialWorker(name=f'SerialWorker-{port}')
+
+        self.status_map = {
+            StationStatus.OFF: "OFF",
+            StationStatus.ON: "ON",
+            StationStatus.STANDBY: "STANDBY",
+            StationStatus.AUTOOFF: "AUTO-OFF"
+        }
+        
+        # Add logging setup
+        self.logger = logging.getLogger('WellerStation')
+        if log_file:
+            handler = logging.FileHandler(log_file)
+            handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
+            self.logger.addHandler(handler)
+        self.logger.setLevel(logging.INFO)
+
+        self.temperature_history = {
+            'channel1': TemperatureRingBuffer(max_history),
+            'channel2': TemperatureRingBuffer(max_history)
+        }
+        self.last_status = None
+        self.connection_type = None
+        self.temp_limits = {'min': 50, 'max': 450}  # Default temperature limits in °C
+        self.web_interface = web_interface
+        self.web_config = web_config or WebConfig()
+        self.start_time = datetime.now()
+        self.poller = None
+        self.sampler = None
+        self.web_server = None
+        self.response_cache = ResponseCache()
+        self.store = self.open_store(storage_config)
+        if web_interface:
+            self.start_web_interface()
+
+    def _open_serial(self, port: str) -> serial.Serial:
+        return serial.Serial(
+            port=port,
+            baudrate=self.baudrate,
+            bytesize=8,
+            parity=serial.PARITY_NONE,
+            stopbits=serial.STOPBITS_ONE,
+            timeout=1
+        )
+
+    @staticmethod
+    def _port_identity(port: str) -> Optional[tuple]:
+        for info in serial.tools.list_ports.comports():
+            if info.device == port:
+                return PortSupervisor.identity_of(info)
+        return None
+
+    @property
+    def is_connected(self) -> bool:
+        """True while the serial port is open"""
+        return self.ser.is_open
+
+    def disconnect(self) -> None:
+        """Close the port after the adapter was unplugged; commands fail fast until reconnect()"""
+        self._serial_worker.submit(SerialWorker.PRIORITY_CONTROL, self._close_serial).result()
+
+    def _close_serial(self) -> None:
+        try:
+            self.ser.close()
+        except (serial.SerialException, OSError):
+            pass
+
+    def reconnect(self, port: Optional[str] = None) -> None:
+        """Reopen the port (optionally under a new device name) and restore the remote mode.
+
+        History, statistics and the poller carry on; the poller is asked to
+        refresh at once so the first fresh snapshot follows immediately.
+        """
+        self._serial_worker.submit(SerialWorker.PRIORITY_CONTROL, self._reopen, port or self.port).result()
+        if self.poller:
+            self.poller.request_refresh(metadata=True)
+
+    def _reopen(self, port: str) -> None:
+        """Runs on the serial worker thread"""
+        self._close_serial()
+        try:
+            self.ser = self._open_serial(port)
+        except serial.SerialException as e:
+            raise WellerError(f"Failed to open port {port}. Error: {str(e)}")
+        self.port = port
+        self.circuit_breaker.reset()
+        self.metadata_cache.clear()  # The adapter may now lead to a different station
+        if self.remote_mode != RemoteMode.DISABLED:
+            self._transact(WellerCommand.REMOTE_FRAMES[self.remote_mode])
+        else:
+            # Any verified reply proves the station is back
+            self._transact(b"?")
+
+    def calculate_checksum(self, command: str) -> str:
+        """Modulo-256 checksum of a command, as a character"""
+        if not command:
+            raise WellerError("Empty command")
+            
+        try:
+            checksum = sum(command.encode('latin-1')) % 256
+        except UnicodeEncodeError as e:
+            raise WellerError(f"Checksum calculation failed: {str(e)}")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Checksum of {command!r}: {checksum}")
+        return chr(checksum)
+
+    def verify_checksum(self, response: str) -> bool:
+        """Enhanced checksum verification with detailed reporting"""
+        if len(response) < 2:
+            self.logger.error("Response too short for checksum verification")
+            return False
+            
+        data = response[:-1]
+        received_checksum = response[-1]
+        calculated_checksum = self.calculate_checksum(data)
+        
+        if received_checksum != calculated_checksum:
+            self.logger.error(
+                f"Checksum mismatch:\n"
+                f"Received: {ord(received_checksum)} ({received_checksum})\n"
+                f"Calculated: {ord(calculated_checksum)} ({calculated_checksum})\n"
+                f"Data: {[ord(c) for c in data]}"
+            )
+            return False
+        return True
+
+    def submit_command(self, command: Union[str, bytes], expect_response=True, cmd_type=None,
+                       priority=SerialWorker.PRIORITY_QUERY) -> Future:
+        """Queue a command on the serial worker and return a Future for its response"""
+        return self._serial_worker.submit(priority, self._transact, command, expect_response, cmd_type, priority)
+
+    def send_command(self, command: Union[str, bytes], expect_response=True, cmd_type=None,
+                     priority=SerialWorker.PRIORITY_QUERY) -> Optional[str]:
+        """Send a command through the serial worker and wait for the response"""
+        return self.submit_command(command, expect_response, cmd_type, priority).result()
+
+    def query(self, command: bytes, priority=SerialWorker.PRIORITY_QUERY) -> bytes:
+        """Send a query and return its raw, checksum-verified reply frame (see WellerResponse.decode_fields)"""
+        return self._serial_worker.submit(priority, self._transact, command, True, None, priority, True).result()
+
+    def _transact(self, command: Union[str, bytes], expect_response=True, cmd_type=None,
+                  priority=SerialWorker.PRIORITY_QUERY, raw=False) -> Union[str, bytes, None]:
+        """Run one command with retries; only called on the serial worker thread"""
+        if isinstance(command, str):
+            command = command.encode()
+        return self._with_retries(
+            priority, expect_response,
+            lambda deadline: self._transact_once(command, expect_response, cmd_type, deadline, raw)
+        )
+
+    def _transact_batch(self, commands: List[bytes]) -> Dict[bytes, bytes]:
+        """Run a pipelined batch of queries with retries; only called on the serial worker thread"""
+        return self._with_retries(
+            SerialWorker.PRIORITY_QUERY, True,
+            lambda deadline: self._transact_batch_once(commands, deadline),
+            extension=self.reply_timeout.line_time(batch_length(commands))
+        )
+
+    def _with_retries(self, priority: int, expect_response: bool, attempt, extension: float = 0.0):
+        """Call attempt(deadline) until it succeeds, following the RetryPolicy for priority.
+
+        While the circuit breaker is open this fails at once with
+        StationOfflineError, except for the periodic probe.
+        """
+        if not self.ser.is_open:
+            raise StationOfflineError(f"Port {self.port} is disconnected")
+        # Only a verified reply can probe an offline station; blind writes are rejected
+        if not (self.circuit_breaker.allow() if expect_response else not self.circuit_breaker.is_open):
+            raise StationOfflineError(f"Station on {self.port} is offline")
+
+        last_error = None
+        for delay, deadline in self.retry_policies[priority].schedule(extension):
+            if delay:
+                time.sleep(delay)
+            try:
+                result = attempt(deadline)
+            except WellerError as e:
+                last_error = e
+                self.logger.debug(f"Attempt failed: {e}")
+                continue
+            if expect_response:
+                self.circuit_breaker.record_success()
+            return result
+
+        self.circuit_breaker.record_failure()
+        raise last_error
+
+    def _transact_once(self, command: bytes, expect_response: bool, cmd_type: Optional[str],
+                       deadline: float, raw=False) -> Union[str, bytes, None]:
+        """Run one write/read transaction, giving up at deadline (time.monotonic()).
+
+        With raw, the reply frame is returned as bytes as read from the port.
+        """
+        try:
+            expected = WellerCommand.expected_response(command) if expect_response else None
+            if raw and not expected:
+                raise WellerError(f"Unknown response format for {command!r}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"Sending command: {command!r}")
+            self.ser.reset_input_buffer()  # Drop late bytes from an earlier, failed transaction
+            self.ser.write(command)
+            
+            if expect_response:
+                if expected:
+                    prefix, length = expected
+                    frame = self._read_frames(len(command), {prefix: length}, deadline)[prefix]
+                    if raw:
+                        return frame  # demux_frames has verified the checksums
+                    response = frame.decode('latin-1')
+                else:
+                    response = self._read_unframed(deadline).decode('latin-1').strip()
+                if not response:
+                    raise WellerError("No response received")
+                    
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(f"Raw response: {response!r}")
+                
+                if cmd_type and not WellerCommand.validate_response_length(cmd_type, response):
+                    raise WellerError(f"Invalid response length for {cmd_type}")
+                    
+                if not self.verify_checksum(response):
+                    self.logger.error(f"Checksum failed for response: {response!r}")
+                    raise WellerError("Checksum validation failed")
+                    
+                return response
+                
+        except (serial.SerialException, OSError) as e:
+            raise WellerError(f"Serial communication error: {e}")
+
+    def _transact_batch_once(self, commands: List[bytes], deadline: float) -> Dict[bytes, bytes]:
+        """Write all queries in one burst and demultiplex the replies by prefix"""
+        expected = {}
+        for command in commands:
+            reply = WellerCommand.expected_response(command)
+            if reply is None:
+                raise WellerError(f"Cannot pipeline {command!r}: no known reply")
+            expected[reply[0]] = reply[1]
+        request = b''.join(commands)
+        try:
+            self.ser.reset_input_buffer()
+            self.ser.write(request)
+            frames = self._read_frames(len(request), expected, deadline)
+        except (serial.SerialException, OSError) as e:
+            raise WellerError(f"Serial communication error: {e}")
+        return {command: frames[WellerCommand.expected_response(command)[0]] for command in commands}
+
+    def _read_frames(self, request_length: int, expected: Dict[bytes, int],
+                     deadline: Optional[float] = None) -> Dict[bytes, bytes]:
+        """Read one reply frame per expected prefix (see demux_frames).
+
+        Returns as soon as every frame is complete; a corrupted reply fails
+        as soon as its bad block arrives. The reply timeout is capped by
+        deadline (time.monotonic()) if given.
+        """
+        started = time.monotonic()
+        reply_length = sum(expected.values())
+        reply_deadline = started + self.reply_timeout.timeout(request_length, reply_length)
+        deadline = min(reply_deadline, deadline) if deadline else reply_deadline
+        buffer = bytearray()
+        frames = {}
+        while len(frames) < len(expected):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                if deadline == reply_deadline:
+                    self.reply_timeout.expired()
+                raise WellerError(f"No response received within {deadline - started:.3f}s")
+            self._set_read_timeout(remaining)
+            pending = sum(length for prefix, length in expected.items() if prefix not in frames)
+            buffer += self.ser.read(max(1, pending - len(buffer)))
+            demux_frames(buffer, expected, frames)
+        self.reply_timeout.observe(request_length, reply_length, time.monotonic() - started)
+        return frames
+
+    def _read_unframed(self, deadline: float) -> bytes:
+        """Read a reply of unknown format: up to a newline, or until the line goes quiet.
+
+        Every read sets its own timeout and none outlasts deadline
+        (time.monotonic()), so the result does not depend on the timeout a
+        previous framed read left on the port.
+        """
+        gap = self.reply_timeout.line_time(self.UNFRAMED_QUIET_BYTES)
+        buffer = bytearray()
+        while not buffer.endswith(b'\n'):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            # Once the reply has started, a pause of a few characters ends it
+            self._set_read_timeout(min(remaining, gap) if buffer else remaining)
+            data = self.ser.read(max(1, self.ser.in_waiting))
+            if not data:
+                if buffer:
+                    break
+                continue
+            buffer += data
+        return bytes(buffer)
+
+    def _set_read_timeout(self, seconds: float) -> None:
+        # Quantized so the port is not reconfigured on every read
+        timeout = math.ceil(seconds * 100) / 100
+        if self.ser.timeout != timeout:
+            self.ser.timeout = timeout
+
+    def read_batch(self, commands: List[bytes]) -> Dict[bytes, bytes]:
+        """Send several query commands back to back and return {command: raw reply frame}.
+
+        The station answers each query in turn, so the whole batch costs
+        roughly the line time of all frames plus a single turnaround.
+        """
+        return self._serial_worker.submit(SerialWorker.PRIORITY_QUERY, self._transact_batch, list(commands)).result()
+
+    def enable_remote(self):
+        self.send_command(b"remote1")
+        self.remote_mode = RemoteMode.ENABLED
+        
+    def disable_remote(self):
+        self.send_command(b"remote0", expect_response=False)
+        self.remote_mode = RemoteMode.DISABLED
+        
+    def read_status(self):
+        status = WellerResponse.decode_status(self.query(b"Q"))
+        self._check_status_change(status)
+        return status
+
+    def read_temperature(self) -> Dict[str, float]:
+        """Read temperature with enhanced error handling"""
+        return WellerResponse.decode_channel_pair(self.query(b"R"))
+        
+    def set_temperature(self, channel: int, temp: float) -> None:
+        """Set temperature with enhanced validation"""
+        self.send_command(WellerCommand.temp_frame(b's', channel, temp), expect_response=False,
+                          priority=SerialWorker.PRIORITY_CONTROL)
+        
+    def set_status(self, ch1_status, ch2_status):
+        self.send_command(WellerCommand.status_frame(ch1_status, ch2_status), expect_response=False,
+                          priority=SerialWorker.PRIORITY_CONTROL)
+        
+    def read_tool_type(self):
+        """Read the tool type of both channels (cached, see MetadataCache)"""
+        return self.metadata_cache.fetch('tools', lambda: WellerResponse.decode_tool_names(self.query(b"Y")))
+
+    def close(self):
+        if self.web_server:
+            self.web_server.stop()
+            self.web_server = None
+        if self.sampler:
+            self.sampler.stop()
+        if self.poller:
+            self.poller.stop()
+        self._serial_worker.stop()
+        self.ser.close()
+        if self.store:
+            self.store.close()
+
+    def enable_remote_with_lock(self):
+        """Enable remote control with front button lock"""
+        response = self.send_command(b"remote2")
+        self.remote_mode = RemoteMode.ENABLED_WITH_LOCK
+        return response
+
+    def read_unit_id(self):
+        """Read the unit ID and return model information (cached)"""
+        return self.metadata_cache.fetch('unit_id', lambda: WellerResponse.parse_unit_id(self.send_command(b"?")))
+
+    def read_set_temperature(self):
+        """Read the set temperature for both channels"""
+        return WellerResponse.decode_channel_pair(self.query(b"S"))
+
+    def read_preset_temperature1(self):
+        """Read preset temperature 1 for both channels (cached)"""
+        return self.metadata_cache.fetch('preset1', lambda: WellerResponse.decode_channel_pair(self.query(b"T")))
+
+    def read_preset_temperature2(self):
+        """Read preset temperature 2 for both channels (cached)"""
+        return self.metadata_cache.fetch('preset2', lambda: WellerResponse.decode_channel_pair(self.query(b"U")))
+
+    def set_preset_temperature1(self, channel, temp):
+        """Set preset temperature 1 for specified channel"""
+        self.send_command(WellerCommand.temp_frame(b't', channel, temp), expect_response=False,
+                          priority=SerialWorker.PRIORITY_CONTROL)
+        self.metadata_cache.invalidate('preset1')
+
+    def set_preset_temperature2(self, channel, temp):
+        """Set preset temperature 2 for specified channel"""
+        self.send_command(WellerCommand.temp_frame(b'u', channel, temp), expect_response=False,
+                          priority=SerialWorker.PRIORITY_CONTROL)
+        self.metadata_cache.invalidate('preset2')
+
+    def read_firmware_version(self):
+        """Read the firmware version (cached)"""
+        return self.metadata_cache.fetch('firmware', lambda: WellerResponse.parse_firmware_version(self.send_command(b"V")))
+
+    def verify_firmware_compatibility(self):
+        """Check if firmware version is compatible (>= 0.64)"""
+        version = self.read_firmware_version()
+        if version:
+            try:
+                version_num = float(version) / 100  # Convert format like "0064" to 0.64
+                if version_num < 0.64:
+                    self.logger.warning(f"Firmware version {version_num} might not support all features")
+                return version_num >= 0.64
+            except ValueError:
+                return False
+        return False
+
+    def log_temperature_data(self, temps: Optional[Dict[str, float]] = None):
+        """Log temperature data (read now unless given) to file if logging is enabled"""
+        temps = temps or self.read_temperature()
+        if temps:
+            self.logger.info(f"Temperature data: CH1={temps['channel1']}°C, CH2={temps['channel2']}°C")
+
+    def fingerswitch_action(self, channel, seconds):
+        """Trigger fingerswitch action for specified channel"""
+        self.send_command(WellerCommand.frame(b'x', channel, int(seconds)), expect_response=False,
+                          priority=SerialWorker.PRIORITY_CONTROL)
+
+    def read_all_status(self):
+        """Read comprehensive status of the station.
+
+        Q, R and (unless the tool types are cached) Y go out as one
+        pipelined burst, see read_batch.
+        """
+        commands = [b"Q", b"R"]
+        if self.metadata_cache.get('tools') is None:
+            commands.append(b"Y")
+        responses = self._read_queries(commands)
+
+        status = WellerResponse.decode_status(responses[b"Q"])
+        self._check_status_change(status)
+        temps = WellerResponse.decode_channel_pair(responses[b"R"])
+        if b"Y" in responses:
+            self.metadata_cache.put('tools', WellerResponse.decode_tool_names(responses[b"Y"]))
+        tools = self.read_tool_type()  # Cached unless a status change just invalidated it
+        
+        if all([status, temps, tools]):
+            return {
+                'channel1': {
+                    'status': self.get_status_string(status['channel1']),
+                    'temperature': temps['channel1'],
+                    'tool': tools['channel1']
+                },
+                'channel2': {
+                    'status': self.get_status_string(status['channel2']),
+                    'temperature': temps['channel2'],
+                    'tool': tools['channel2']
+                }
+            }
+        return None
+
+    def _read_queries(self, commands: List[bytes]) -> Dict[bytes, bytes]:
+        """Pipelined read of commands, falling back to one at a time if the station cannot keep up"""
+        if self.pipelining:
+            try:
+                responses = self.read_batch(commands)
+                self._pipeline_failures = 0
+                return responses
+            except StationOfflineError:
+                raise
+            except WellerError as e:
+                responses = {command: self.query(command) for command in commands}
+                self._pipeline_failed(e)
+                return responses
+        return {command: self.query(command) for command in commands}
+
+    def set_channel_mode(self, channel, mode):
+        """Set channel mode (ON/OFF/STANDBY/AUTOOFF)"""
+        if not isinstance(mode, StationStatus):
+            raise ValueError("Mode must be a StationStatus enum value")
+        
+        current_status = self.read_status()
+        if current_status:
+            if channel == 1:
+                self.set_status(mode.value, current_status['channel2'])
+            else:
+                self.set_status(current_status['channel1'], mode.value)
+
+    def monitor_status(self, interval=1.0):
+        """Monitor station status continuously"""
+        try:
+            while True:
+                status = self.read_all_status()
+                if status:
+                    print("\033[2J\033[H")  # Clear screen
+                    print("=== Weller Station Status ===")
+                    for channel in ['channel1', 'channel2']:
+                        print(f"\n{channel.upper()}:")
+                        print(f"Status: {status[channel]['status']}")
+                        print(f"Temperature: {status[channel]['temperature']}°C")
+                        print(f"Tool: {status[channel]['tool']}")
+                    print("\nPress Ctrl+C to stop monitoring")
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            print("\nMonitoring stopped")
+
+    def enhanced_monitor(self, interval=1.0, log_data=True, sampler_config: Optional[SamplerConfig] = None):
+        """Enhanced monitoring with additional features.
+
+        Readings come from the telemetry sampler, so the history is sampled at
+        the configured rates regardless of how often the screen is redrawn.
+        """
+        try:
+            print("Initializing enhanced monitoring...")
+            
+            # Try legacy mode if modern fails
+            try:
+                self.enable_remote()
+            except WellerError:
+                print("Trying legacy remote mode...")
+                self.enable_remote_legacy()
+            
+            connection = self.connection_type.name if self.connection_type else 'Unknown'
+            sampler = self.start_sampler(sampler_config)
+            sampler.request_presets()
+            next_redraw = time.monotonic()
+            
+            while True:
+                latest = sampler.get_latest()
+                temps, status, tools, presets = (
+                    (latest[field] or {}).get('value') for field in ('temperature', 'status', 'tools', 'presets')
+                )
+                
+                if temps and status and tools:
+                    rates = sampler.get_rates()
+                    print("\033[2J\033[H")  # Clear screen
+                    print(f"=== Weller Station Enhanced Status ({connection} Connection) ===")
+                    print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+                    print(f"Sample rates: temperature {rates['temperature']['rate']:.1f} Hz, "
+                          f"status {rates['status']['rate']:.1f} Hz, tools {rates['tools']['rate']:.2f} Hz")
+                    
+                    for channel in ['channel1', 'channel2']:
+                        print(f"\n{channel.upper()}:")
+                        print(f"Status: {self.get_status_string(status[channel])}")
+                        print(f"Current Temp: {temps[channel]}°C")
+                        
+                        # Add temperature statistics
+                        stats = self.get_temperature_statistics(channel)
+                        if stats:
+                            print(f"Min/Max/Avg: {stats['min']:.1f}°C / {stats['max']:.1f}°C / {stats['avg']:.1f}°C")
+                        
+                        # Show presets and tool info
+                        if presets:
+                            print(f"Preset 1: {presets[channel]['preset1']}°C")
+                            print(f"Preset 2: {presets[channel]['preset2']}°C")
+                        print(f"Tool: {tools[channel]}")
+                    
+                    print(f"\nTemperature Limits: {self.temp_limits['min']}°C - {self.temp_limits['max']}°C")
+                    print("\nPress Ctrl+C to stop monitoring")
+                
+                    if log_data:
+                        self.log_temperature_data(temps)
+                
+                # Redraw on a fixed grid so slow redraws do not stretch the interval
+                next_redraw += interval
+                time.sleep(max(0.0, next_redraw - time.monotonic()))
+                
+        except KeyboardInterrupt:
+            print("\nMonitoring stopped")
+        except WellerError as e:
+            print(f"\nError: {e}")
+        finally:
+            if self.sampler:
+                self.sampler.stop()
+
+    def set_temperature_limits(self, min_temp: int, max_temp: int) -> None:
+        """Set safety temperature limits"""
+        if not (0 <= min_temp < max_temp <= 550):
+            raise ValueError("Invalid temperature limits")
+        self.temp_limits = {'min': min_temp, 'max': max_temp}
+
+    def detect_connection_type(self) -> Optional[ConnectionType]:
+        """Front or rear connection, or None when it is not known.
+
+        The station answers remote1 with a fixed ?1 frame carrying the unit
+        id, not the connection side, so the side cannot be read from it;
+        connection_type stays None unless it was set explicitly.
+        """
+        return self.connection_type
+
+    def save_temperature_profile(self, name: str) -> None:
+        """Save current temperature settings as a profile"""
+        profile = {
+            'set_temps': self.read_set_temperature(),
+            'preset1': self.read_preset_temperature1(),
+            'preset2': self.read_preset_temperature2(),
+            'timestamp': datetime.now().isoformat()
+        }
+        
+        try:
+            with open(f"{name}_profile.json", 'w') as f:
+                json.dump(profile, f, indent=2)
+        except Exception as e:
+            self.logger.error(f"Failed to save profile: {e}")
+
+    def load_temperature_profile(self, name: str) -> bool:
+        """Load and apply a saved temperature profile"""
+        try:
+            with open(f"{name}_profile.json", 'r') as f:
+                profile = json.load(f)
+                
+            # Apply temperatures with safety checks
+            for channel in [1, 2]:
+                if 'set_temps' in profile:
+                    temp = profile['set_temps'][f'channel{channel}']
+                    if self.temp_limits['min'] <= temp <= self.temp_limits['max']:
+                        self.set_temperature(channel, temp)
+                
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to load profile: {e}")
+            return False
+
+    def update_history(self) -> None:
+        """Update temperature history"""
+        temps = self.read_temperature()
+        if temps:
+            self.record_history(temps)
+
+    def enable_remote_legacy(self):
+        """Enable remote control for legacy firmware (<0.52)"""
+        self.send_command(b"REMOTE")
+        return self.read_unit_id()
+
+    def export_temperature_log(self, filename: str, start_ms: Optional[int] = None,
+                               end_ms: Optional[int] = None) -> None:
+        """Export time-aligned temperature history to CSV file"""
+        try:
+            with open(filename, 'wb') as f:
+                for chunk in iter_export_chunks(self.iter_export_rows(start_ms, end_ms), 'csv'):
+                    f.write(chunk)
+        except Exception as e:
+            self.logger.error(f"Failed to export temperature log: {e}")
+
+    def start_poller(self) -> 'StationPoller':
+        """Start the background poller that feeds the web interface"""
+        if self.poller is None:
+            self.poller = StationPoller(
+                self,
+                poll_interval=self.web_config.poll_interval,
+                metadata_interval=self.web_config.metadata_interval
+            )
+        self.poller.start()
+        return self.poller
+
+    def start_sampler(self, config: Optional[SamplerConfig] = None) -> TelemetrySampler:
+        """Start the telemetry sampler; while it runs it records the temperature history"""
+        if self.sampler is None:
+            self.sampler = TelemetrySampler(self, config)
+        self.sampler.start()
+        return self.sampler
+
+    def get_snapshot(self) -> Dict:
+        """Latest poller snapshot; starts the poller on first use"""
+        if self.poller is None:
+            self.start_poller()
+        return self.poller.get_snapshot()
+
+    def create_web_app(self) -> Flask:
+        """Create the Flask app serving this station"""
+        app = Flask(__name__)
+        configure_basic_auth(app, self.web_config)
+        self.register_web_routes(app)
+        return app
+
+    # Route handlers shared by the Flask (register_web_routes) and aiohttp (add_web_routes)
+    # front ends, which only adapt requests and replies. Read-only handlers return
+    # (status, headers, body); control handlers validate and return a WebAction.
+
+    def register_web_routes(self, app) -> None:
+        """Register all dashboard and API routes on a Flask app.
+
+        Read-only routes serve the poller snapshot and never touch the serial
+        port; control routes write through and ask the poller to refresh.
+        """
+        def send(reply) -> Response:
+            status, headers, body = reply
+            return Response(body, status=status, headers=headers)
+
+        def run(build, *args) -> Response:
+            try:
+                action = build(*args)
+                action.call(*action.args)
+                return send(self.complete_web_action(action))
+            except Exception as e:
+                self.logger.error(f"Control request failed: {str(e)}")
+                return send(error_reply(e))
+
+        @app.route('/')
+        def home():
+            return send(self.web_home(request.headers))
+
+        @app.route('/api/bootstrap')
+        def api_bootstrap():
+            return send(self.web_bootstrap())
+
+        @app.route('/api/set_temperature/<int:channel>/<float:temp>', methods=['POST', 'OPTIONS'])
+        def set_temperature_handler(channel, temp):
+            if request.method == 'OPTIONS':
+                return '', 204
+            return run(self.web_set_temperature, channel, temp)
+
+        @app.route('/api/set_mode/<int:channel>/<string:mode>', methods=['POST', 'OPTIONS'])
+        def set_mode_handler(channel, mode):
+            if request.method == 'OPTIONS':
+                return '', 204
+            return run(self.web_set_mode, channel, mode)
+
+        @app.route('/api/status')
+        def api_status():
+            return send(self.web_status(request.args, request.headers))
+
+        @app.route('/api/stream')
+        def api_stream():
+            self.get_snapshot()
+            poller = self.poller
+            stream_slots = self.web_config.stream_slots
+            # Each stream holds a server worker; past the limit, clients fall back to polling
+            if not stream_slots.acquire(blocking=False):
+                return send(error_reply('Too many event streams', 503))
+            last_seq = last_event_id(request.headers)
+            stopping = request.environ.get('weller.server_stopping') or threading.Event()
+
+            def generate():
+                seq = last_seq
+                yield STREAM_RETRY
+                while not stopping.is_set():
+                    chunk, seq = stream_chunk(poller.wait_for_event(seq, timeout=15.0), seq)
+                    yield chunk
+
+            return Response(SlotHoldingIterator(generate(), stream_slots), headers=STREAM_HEADERS)
+
+        @app.route('/api/temperature_history/<channel>')
+        def api_temperature_history(channel):
+            return send(self.web_temperature_history(channel, request.args, request.headers))
+
+        @app.route('/api/export')
+        def api_export():
+            return send(self.web_export(request.args, request.headers))
+
+        @app.route('/api/set_preset/<int:channel>/<int:presetNum>/<float:temp>', methods=['POST'])
+        def set_preset(channel, presetNum, temp):
+            return run(self.web_set_preset, channel, presetNum, temp)
+
+        @app.route('/api/activate_preset/<int:channel>/<int:presetNum>', methods=['POST'])
+        def activate_preset(channel, presetNum):
+            return run(self.web_activate_preset, channel, presetNum)
+
+        @app.route('/api/fingerswitch/<int:channel>/<int:seconds>', methods=['POST'])
+        def trigger_fingerswitch(channel, seconds):
+            return run(self.web_fingerswitch, channel, seconds)
+
+        @app.route('/api/remote_mode/<int:mode>', methods=['POST'])
+        def set_remote_mode(mode):
+            return run(self.web_remote_mode, mode)
+
+        @app.route('/api/tool_info/<int:channel>')
+        def api_tool_info(channel):
+            return send(self.web_tool_info(channel))
+
+        @app.route('/api/connection_details')
+        def get_connection_details():
+            return send(self.web_connection_details())
+
+    def start_web_interface(self):
+        """Start enhanced web interface with full control"""
+        self.start_poller()
+        app = self.create_web_app()
+
+        self.web_server = WebServer(app, self.web_config).start()
+
+    def get_preset_temperatures(self):
+        """Helper method to get all preset temperatures"""
+        preset1 = self.read_preset_temperature1() or {'channel1': None, 'channel2': None}
+        preset2 = self.read_preset_temperature2() or {'channel1': None, 'channel2': None}
+        return {
+            'channel1': {
+                'preset1': preset1['channel1'],
+                'preset2': preset2['channel1']
+            },
+            'channel2': {
+                'preset1': preset1['channel2'],
+                'preset2': preset2['channel2']
+            }
+        }
+
+    def set_remote_mode(self, mode: RemoteMode) -> None:
+        """Set remote control mode"""
+        response = self.send_command(WellerCommand.REMOTE_FRAMES[mode], expect_response=mode != RemoteMode.DISABLED)
+        if mode != RemoteMode.DISABLED:
+            # Verify response contains unit ID
+            if not response or not response.startswith('?1'):
+                raise WellerError("Invalid response for remote mode setting")
+        self.remote_mode = mode
+
+    def get_tool_type(self, channel: int) -> Optional[ToolType]:
+        """Get the tool type connected to a channel"""
+        tools = self.read_tool_type()
+        if not tools:
+            return None
+        return ToolType.__members__.get(tools[f'channel{channel}'])
+
+    def get_detailed_tool_info(self, channel: int, tool_type: Optional[ToolType] = None) -> dict:
+        """Get detailed information about connected tool (reads the tool type if not given)"""
+        if tool_type is None:
+            tool_type = self.get_tool_type(channel)
+        return TOOL_DETAILS.get(tool_type, UNKNOWN_TOOL_DETAILS)
+
+    def get_connection_details(self, firmware_version: Optional[str] = None) -> Dict[str, str]:
+        """Get detailed connection information (reads the firmware version if not given)"""
+        if firmware_version is None:
+            firmware_version = self.read_firmware_version()
+        return self.describe_connection(firmware_version)
+
+class DemoWellerStation(WellerStation):
+    """Simulated Weller station for demo purposes"""
+    def __init__(self, *args, **kwargs):
+        self.status_map = {
+            StationStatus.OFF: "OFF",
+            StationStatus.ON: "ON",
+            StationStatus.STANDBY: "STANDBY",
+            StationStatus.AUTOOFF: "AUTO-OFF"
+        }
+        self.logger = logging.getLogger('DemoWellerStation')
+        self.max_history_points = 100  # Begränsa antalet datapunkter i grafen
+        self.temperature_history = {
+            'channel1': TemperatureRingBuffer(self.max_history_points),
+            'channel2': TemperatureRingBuffer(self.max_history_points)
+        }
+        self.connection_type = ConnectionType.FRONT
+        self.temp_limits = {'min': 50, 'max': 450}
+        self.current_temps = {'channel1': 250, 'channel2': 200}
+        self.set_temps = {'channel1': 250, 'channel2': 200}
+        self.current_status = {'channel1': StationStatus.ON, 'channel2': StationStatus.STANDBY}
+        self.tools = {'channel1': 'WXP120', 'channel2': 'WXMP'}
+        self.start_time = datetime.now()
+        self.web_config = kwargs.get('web_config') or WebConfig()
+        self.port = kwargs.get('port') or 'DEMO'
+        self.poller = None
+        self.sampler = None
+        self.web_server = None
+        self.response_cache = ResponseCache()
+        self.metadata_cache = MetadataCache()
+        self.store = self.open_store(kwargs.get('storage_config'))
+        self.last_temps = {'channel1': None, 'channel2': None}
+        self.presets = {
+            'channel1': {'preset1': 200, 'preset2': 300},
+            'channel2': {'preset1': 200, 'preset2': 300}
+        }
+        self.remote_mode = RemoteMode.ENABLED
+        self.button_lock = False
+        # The shared poller drives the simulation and records history
+        self.start_poller()
+
+    def close(self):
+        if self.web_server:
+            self.web_server.stop()
+            self.web_server = None
+        if self.sampler:
+            self.sampler.stop()
+        if self.poller:
+            self.poller.stop()
+        if self.store:
+            self.store.close()
+
+    def send_command(self, command, expect_response=True, cmd_type=None, priority=None):
+        """Simulate command sending"""
+        return "OK"
+
+    def read_temperature(self) -> Dict[str, float]:
+        """Simulate temperature readings with realistic variations"""
+        now = datetime.now()
+        for channel in ['channel1', 'channel2']:
+            target_temp = self.set_temps[channel]
+            current_temp = self.current_temps[channel]
+            
+            if self.current_status[channel] == StationStatus.ON:
+                if self.last_temps[channel] is None:
+                    self.last_temps[channel] = current_temp
+                
+                # Mer realistisk temperaturvariation
+                noise = random.uniform(-0.5, 0.5)
+                if abs(current_temp - target_temp) > 1:
+                    # Gradvis närma sig måltemperaturen
+                    direction = 1 if target_temp > current_temp else -1
+                    delta = min(2.0, abs(target_temp - current_temp)) * direction
+                    new_temp = self.last_temps[channel] + delta + noise
+                else:
+                    # Små variationer runt måltemperaturen
+                    new_temp = target_temp + noise
+                
+                self.current_temps[channel] = new_temp
+                self.last_temps[channel] = new_temp
+                
+            elif self.current_status[channel] == StationStatus.STANDBY:
+                # Gradvis nedkylning till standby-temperatur (150°C)
+                if current_temp > 150:
+                    self.current_temps[channel] = max(150, current_temp - 1)
+            elif self.current_status[channel] == StationStatus.OFF:
+                # Snabbare nedkylning när avstängd
+                self.current_temps[channel] = max(25, current_temp - 2)
+        
+        return self.current_temps.copy()
+
+    def read_status(self):
+        return {
+            'channel1': self.current_status['channel1'].value,
+            'channel2': self.current_status['channel2'].value
+        }
+
+    def set_temperature(self, channel: int, temp: float) -> None:
+        """Set temperature with proper conversion in demo mode"""
+        try:
+            internal_temp = TemperatureConverter.to_internal(temp)
+            if not (self.temp_limits['min'] <= temp <= self.temp_limits['max']):
+                raise ValueError(
+                    f"Temperature must be between {self.temp_limits['min']} "
+                    f"and {self.temp_limits['max']}°C"
+                )
+            
+            channel_key = f'channel{channel}'
+            self.set_temps[channel_key] = temp
+            self.current_temps[channel_key] = temp
+            
+            # Uppdatera temperaturhistorik
+            self.temperature_history[channel_key].append(to_epoch_ms(datetime.now()), internal_temp)
+            
+            return True
+        except ValueError as e:
+            raise ValueError(f"Invalid temperature value: {str(e)}")
+
+    def set_status(self, ch1_status, ch2_status):
+        self.current_status['channel1'] = StationStatus(ch1_status)
+        self.current_status['channel2'] = StationStatus(ch2_status)
+
+    def read_tool_type(self):
+        return self.tools.copy()
+
+    def read_set_temperature(self):
+        return dict(self.set_temps)
+
+    def read_firmware_version(self):
+        return "0064"  # Demo firmware version
+
+    def read_unit_id(self):
+        return "WX 2 (Demo)"
+
+    def read_all_status(self):
+        """Read comprehensive status including temperature history"""
+        temps = self.read_temperature()
+        status = self.read_status()
+        
+        return {
+            'channel1': {
+                'status': self.get_status_string(self.current_status['channel1']),
+                'temperature': temps['channel1'],
+                'tool': self.tools['channel1']
+            },
+            'channel2': {
+                'status': self.get_status_string(self.current_status['channel2']),
+                'temperature': temps['channel2'],
+                'tool': self.tools['channel2']
+            }
+        }
+
+    def create_web_app(self) -> Flask:
+        """Create the Flask app with permissive CORS for demo use"""
+        app = super().create_web_app()
+
+        @app.after_request
+        def after_request(response):
+            headers = {
+                'Access-Control-Allow-Origin': '*',
+                'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS',
+                'Access-Control-Allow-Headers': 'Content-Type, Authorization',
+                'Access-Control-Max-Age': '3600'
+            }
+            for key, value in headers.items():
+                response.headers.add(key, value)
+            return response
+
+        return app
+
+    def get_preset_temperatures(self):
+        """Helper method to get all preset temperatures"""
+        return {
+            'channel1': {
+                'preset1': self.presets['channel1']['preset1'],
+                'preset2': self.presets['channel1']['preset2']
+            },
+            'channel2': {
+                'preset1': self.presets['channel2']['preset1'],
+                'preset2': self.presets['channel2']['preset2']
+            }
+        }
+
+    def read_preset_temperature1(self):
+        """Simulated read of preset temperature 1"""
+        return {
+            'channel1': self.presets['channel1']['preset1'],
+            'channel2': self.presets['channel2']['preset1']
+        }
+
+    def read_preset_temperature2(self):
+        """Simulated read of preset temperature 2"""
+        return {
+            'channel1': self.presets['channel1']['preset2'],
+            'channel2': self.presets['channel2']['preset2']
+        }
+
+    def set_preset_temperature1(self, channel, temp):
+        """Set preset temperature 1"""
+        channel_key = f'channel{channel}'
+        self.presets[channel_key]['preset1'] = temp
+
+    def set_preset_temperature2(self, channel, temp):
+        """Set preset temperature 2"""
+        channel_key = f'channel{channel}'
+        self.presets[channel_key]['preset2'] = temp
+
+    def set_remote_mode(self, mode: RemoteMode) -> None:
+        """Simulate remote mode setting"""
+        self.remote_mode = mode
+        self.button_lock = (mode == RemoteMode.ENABLED_WITH_LOCK)
+
+class StationManager:
+    """Drive many stations from one process and serve them from one web app.
+
+    Every station keeps its own serial worker and poller thread, so a slow
+    or unplugged bench never delays the others. Each station's dashboard
+    and API live under /stations/<station_id>/, and /api/fleet/status
+    aggregates all snapshots without any serial I/O.
+    """
+    def __init__(self, web_config=None, storage_config=None, station_class=None, **station_kwargs):
+        self.web_config = web_config or WebConfig()
+        self.storage_config = storage_config  # Each station gets a subdirectory
+        self.station_class = station_class or WellerStation
+        self.station_kwargs = station_kwargs
+        self.stations = {}
+        self.errors = {}
+        self.supervisor = PortSupervisor()  # Reconnects unplugged stations
+        self.web_server = None
+        self.logger = logging.getLogger('StationManager')
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def station_id_for(port: str) -> str:
+        """Stable, URL-safe station id derived from the port name"""
+        name = os.path.basename(port.rstrip('/\\')) or port
+        return ''.join(c if c.isalnum() or c in '-_' else '_' for c in name)
+
+    def open_station(self, port: str, enable_remote=True) -> 'WellerStation':
+        """Open one station and register it under its station id"""
+        station_id = self.station_id_for(port)
+        storage_config = None
+        if self.storage_config:
+            storage_config = StorageConfig(
+                os.path.join(self.storage_config.directory, station_id),
+                segment_seconds=self.storage_config.segment_seconds,
+                retention_days=self.storage_config.retention_days
+            )
+        station = self.station_class(
+            port=port,
+            web_config=self.web_config,
+            storage_config=storage_config,
+            **self.station_kwargs
+        )
+        if enable_remote:
+            try:
+                station.enable_remote()
+            except WellerError:
+                station.close()
+                raise
+        with self._lock:
+            self.stations[station_id] = station
+            self.errors.pop(station_id, None)
+        station.start_poller()
+        if not isinstance(station, DemoWellerStation):
+            self.supervisor.watch(station)
+            self.supervisor.start()
+        return station
+
+    def open_stations(self, ports: Optional[List[str]] = None, enable_remote=True) -> Dict[str, 'WellerStation']:
+        """Open all given (or discovered) ports in parallel.
+
+        Ports that fail to open or do not answer like a Weller station are
+        recorded in self.errors and skipped.
+        """
+        if ports is None:
+            ports = WellerStation.find_weller_ports()
+        ports = [port for port in ports if self.station_id_for(port) not in self.stations]
+        if not ports:
+            return dict(self.stations)
+
+        with ThreadPoolExecutor(max_workers=len(ports)) as executor:
+            futures = {executor.submit(self.open_station, port, enable_remote): port for port in ports}
+            for future in as_completed(futures):
+                port = futures[future]
+                try:
+                    future.result()
+                    self.logger.info(f"Opened station on {port}")
+                except Exception as e:
+                    self.errors[self.station_id_for(port)] = str(e)
+                    self.logger.error(f"Failed to open station on {port}: {e}")
+        return dict(self.stations)
+
+    def remove_station(self, station_id: str) -> None:
+        """Stop polling and close one station"""
+        with self._lock:
+            station = self.stations.pop(station_id, None)
+        if station:
+            self.supervisor.unwatch(station)
+            if station.poller:
+                station.poller.stop()
+            station.close()
+
+    def close(self) -> None:
+        if self.web_server:
+            self.web_server.stop()
+            self.web_server = None
+        self.supervisor.stop()
+        for station_id in list(self.stations):
+            self.remove_station(station_id)
+
+    def fleet_status(self) -> Dict:
+        """Summary of every station's latest snapshot"""
+        stations = {}
+        for station_id, station in list(self.stations.items()):
+            snapshot = station.get_snapshot()
+            stations[station_id] = {
+                'port': station.port,
+                'connected': snapshot['status'] is not None and not snapshot['stale'],
+                'stale': snapshot['stale'],
+                'model': snapshot['station_info']['model'],
+                'status': snapshot['status'],
+                'temperatures': snapshot['temperatures'],
+                'timestamp': snapshot['timestamp'],
+                'error': snapshot['error'],
+                'url': f'/stations/{station_id}/'
+            }
+        return {
+            'stations': stations,
+            'errors': dict(self.errors),
+            'count': len(stations),
+            'connected': sum(1 for info in stations.values() if info['connected']),
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def create_web_app(self) -> Flask:
+        """One Flask app with per-station blueprints and fleet endpoints"""
+        app = Flask(__name__)
+        configure_basic_auth(app, self.web_config)
+
+        for station_id, station in list(self.stations.items()):
+            blueprint = Blueprint(f'station_{station_id}', __name__, url_prefix=f'/stations/{station_id}')
+            station.register_web_routes(blueprint)
+            app.register_blueprint(blueprint)
+
+        @app.route('/')
+        def fleet_home():
+            rows = ''.join(
+                f'<li><a href="{info["url"]}">{station_id}</a> ({info["port"]}): '
+                f'{"Connected" if info["connected"] else "Disconnected"}</li>'
+                for station_id, info in self.fleet_status()['stations'].items()
+            )
+            return f'<!DOCTYPE html><html><head><title>Weller Fleet</title></head>' \
+                   f'<body><h1>Weller Stations</h1><ul>{rows}</ul></body></html>'
+
+        @app.route('/api/fleet/status')
+        def api_fleet_status():
+            try:
+                return jsonify({'success': True, **self.fleet_status()})
+            except Exception as e:
+                return jsonify({'success': False, 'error': str(e)}), 500
+
+        return app
+
+    def start_web_interface(self):
+        """Serve all stations from one web server in a background thread"""
+        self.web_server = WebServer(self.create_web_app(), self.web_config).start()
+
+class AsyncSerialTransport:
+    """Non-blocking Weller protocol transport on an asyncio event loop.
+
+    The port is opened with timeout=0 and drained from an event loop reader
+    callback (or a short polling task where the loop cannot watch the
+    handle, e.g. the Windows proactor loop), so one thread can serve any
+    number of ports. Transactions on a port are serialized; each has its
+    own timeout and can be cancelled without leaving a stale reply behind,
+    because replies are located by their expected prefix and length.
+    Without an explicit timeout, the AdaptiveTimeout for the port is used.
+    """
+    POLL_INTERVAL = 0.005
+
+    def __init__(self, ser):
+        self.ser = ser
+        self.reply_timeout = AdaptiveTimeout(ser.baudrate)
+        self.logger = logging.getLogger('AsyncSerialTransport')
+        self._buffer = bytearray()
+        self._lock = asyncio.Lock()
+        self._waiter = None
+        self._expected = {}
+        self._frames = {}
+        self._loop = None
+        self._fd = None
+        self._poll_task = None
+
+    @classmethod
+    async def open(cls, port: str, baudrate=1200) -> 'AsyncSerialTransport':
+        loop = asyncio.get_running_loop()
+        try:
+            ser = await loop.run_in_executor(None, partial(
+                serial.Serial,
+                port=port,
+                baudrate=baudrate,
+                bytesize=8,
+                parity=serial.PARITY_NONE,
+                stopbits=serial.STOPBITS_ONE,
+                timeout=0
+            ))
+        except serial.SerialException as e:
+            raise WellerError(f"Failed to open port {port}. Error: {str(e)}")
+        transport = cls(ser)
+        transport.attach(loop)
+        return transport
+
+    def attach(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Start receiving bytes on loop"""
+        self._loop = loop
+        try:
+            self._fd = self.ser.fileno()
+            loop.add_reader(self._fd, self._on_readable)
+        except (AttributeError, NotImplementedError):
+            self._fd = None
+            self._poll_task = loop.create_task(self._poll())
+
+    def close(self) -> None:
+        if self._fd is not None:
+            self._loop.remove_reader(self._fd)
+            self._fd = None
+        if self._poll_task:
+            self._poll_task.cancel()
+            self._poll_task = None
+        if self._waiter and not self._waiter.done():
+            self._waiter.set_exception(WellerError("Port closed"))
+        self.ser.close()
+
+    async def _poll(self):
+        while True:
+            await asyncio.sleep(self.POLL_INTERVAL)
+            self._on_readable()
+
+    def _on_readable(self):
+        try:
+            data = self.ser.read(max(1, self.ser.in_waiting))
+        except (serial.SerialException, OSError) as e:
+            # The device went away; stop watching it so the loop does not spin
+            self.logger.error(f"Serial communication error: {e}")
+            if self._fd is not None:
+                self._loop.remove_reader(self._fd)
+                self._fd = None
+            if self._waiter and not self._waiter.done():
+                self._waiter.set_exception(WellerError(f"Serial communication error: {e}"))
+            return
+        if data:
+            self._buffer += data
+            self._match_frame()
+
+    def _match_frame(self):
+        if self._waiter is None or self._waiter.done():
+            return
+        try:
+            demux_frames(self._buffer, self._expected, self._frames)
+        except WellerError as e:
+            self._waiter.set_exception(e)
+            return
+        if len(self._frames) == len(self._expected):
+            self._waiter.set_result(self._frames)
+
+    async def transact(self, command: bytes, response_prefix: Optional[bytes] = None,
+                       response_length: int = 0, timeout: Optional[float] = None,
+                       deadline: Optional[float] = None) -> Optional[bytes]:
+        """Write command and, if response_prefix is given, wait up to timeout for the reply frame.
+
+        The wait is also capped by deadline (time.monotonic()) if given.
+        """
+        if response_prefix is None:
+            async with self._lock:
+                if not self.ser.is_open:
+                    raise WellerError("Port closed")
+                try:
+                    self.ser.write(command)
+                except (serial.SerialException, OSError) as e:
+                    raise WellerError(f"Serial communication error: {e}")
+                return None
+        frames = await self.transact_batch(command, {response_prefix: response_length}, timeout, deadline)
+        return frames[response_prefix]
+
+    async def transact_batch(self, request: bytes, expected: Dict[bytes, int], timeout: Optional[float] = None,
+                             deadline: Optional[float] = None) -> Dict[bytes, bytes]:
+        """Write request (one or more queries) and wait for one reply frame per expected prefix"""
+        async with self._lock:
+            if not self.ser.is_open:
+                raise WellerError("Port closed")
+            self._buffer.clear()
+            reply_length = sum(expected.values())
+            try:
+                self._waiter = self._loop.create_future()
+                self._expected, self._frames = expected, {}
+                started = time.monotonic()
+                reply_timeout = timeout or self.reply_timeout.timeout(len(request), reply_length)
+                wait = min(reply_timeout, deadline - started) if deadline else reply_timeout
+                self.ser.write(request)
+                frames = await asyncio.wait_for(self._waiter, max(0.0, wait))
+                self.reply_timeout.observe(len(request), reply_length, time.monotonic() - started)
+                return frames
+            except asyncio.TimeoutError:
+                if wait == reply_timeout:
+                    self.reply_timeout.expired()
+                raise WellerError("No response received")
+            except (serial.SerialException, OSError) as e:
+                raise WellerError(f"Serial communication error: {e}")
+            finally:
+                self._waiter = None
+
+class AsyncStationPoller(StationPoller):
+    """StationPoller running as a task on the event loop instead of a thread"""
+    def __init__(self, station, poll_interval=1.0, metadata_interval=30.0):
+        super().__init__(station, poll_interval, metadata_interval)
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    def start(self):
+        """Start the polling task (no-op if already running); call from the event loop"""
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self, timeout=None):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def wait_for_event(self, last_seq: Optional[int], timeout: float) -> Dict:
+        """Wait until a snapshot newer than last_seq is published or timeout expires"""
+        if self._stream_event['seq'] == last_seq:
+            try:
+                await asyncio.wait_for(self._published.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self._stream_event
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            started = time.monotonic()
+            try:
+                await self.refresh()
+            except Exception as e:
+                # Keep polling: a dead task would leave every client on a frozen snapshot
+                self.logger.error(f"Refresh failed: {e}")
+            remaining = self.poll_interval - (time.monotonic() - started)
+            if remaining > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def refresh(self) -> Dict:
+        """Poll the station once and publish a new snapshot"""
+        now = time.monotonic()
+        if self._metadata_time is None or now - self._metadata_time >= self.metadata_interval:
+            try:
+                self._metadata = await self._read_metadata()
+                self._metadata_time = now
+            except Exception as e:
+                self.logger.error(f"Metadata refresh failed: {e}")
+
+        status, error = None, None
+        try:
+            status = await self.station.read_all_status()
+        except Exception as e:
+            error = str(e)
+            self.logger.error(f"Status poll failed: {e}")
+
+        if status:
+            # The store write is blocking file I/O; keep it off the event loop
+            await asyncio.get_running_loop().run_in_executor(None, self._record_status, status)
+        return self._publish_status(status, error)
+
+    def _publish(self, snapshot: Dict) -> None:
+        super()._publish(snapshot)
+        # Waiters hold the previous event; setting it wakes them, new waiters get a fresh one
+        published, self._published = getattr(self, '_published', None), asyncio.Event()
+        if published:
+            published.set()
+
+    async def _read_metadata(self) -> Dict:
+        firmware = await self.station.read_firmware_version()
+        return {
+            'model': await self.station.read_unit_id(),
+            'firmware': firmware,
+            'presets': await self.station.get_preset_temperatures(),
+            'set_temperatures': await self.station.read_set_temperature(),
+            'connection_details': self.station.describe_connection(firmware)
+        }
+
+class AsyncPortSupervisor(PortSupervisor):
+    """PortSupervisor running as a task on the event loop, for AsyncWellerStation.
+
+    Ports are listed on the default executor; disconnect() and reconnect()
+    are awaited on the loop, so reattaching a station never blocks it.
+    """
+    def __init__(self, interval=0.25, reconnect_interval=1.0):
+        super().__init__(interval, reconnect_interval)
+        self._task = None
+
+    def start(self):
+        """Start the watcher task (no-op if already running); call from the event loop"""
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self, timeout=None):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.check()
+            except Exception as e:
+                self.logger.error(f"Port check failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def check(self) -> None:
+        """Compare the current ports with every watched station once"""
+        comports = await asyncio.get_running_loop().run_in_executor(None, serial.tools.list_ports.comports)
+        for station, device in self._plan({port.device: port for port in comports}):
+            if device is None:
+                self.logger.warning(f"Port {station.port} removed")
+                await station.disconnect()
+                continue
+            try:
+                await station.reconnect(device)
+                self.logger.info(f"Reconnected station on {device}")
+            except WellerError as e:
+                self.logger.debug(f"Reconnect on {device} failed: {e}")
+
+class AsyncWellerStation(StationBase):
+    """asyncio counterpart of WellerStation.
+
+    Every command is a coroutine with its own timeout that can be cancelled,
+    so a single event loop can drive many stations and serve many dashboard
+    connections through the aiohttp front end (create_web_app). Retries and
+    the circuit breaker work as in WellerStation. History, statistics,
+    storage and snapshot handling are shared with WellerStation. After an
+    unplug the station is reattached by AsyncPortSupervisor (started by
+    AsyncStationManager) through disconnect() and reconnect().
+    """
+
+    def __init__(self, transport: AsyncSerialTransport, port=None, max_history=1000, web_config=None,
+                 storage_config=None, command_timeout=None):
+        self.transport = transport
+        self.port = port
+        self.port_identity = None  # Set by open(); lets AsyncPortSupervisor follow a renamed adapter
+        self.baudrate = transport.ser.baudrate
+        self.remote_mode = RemoteMode.DISABLED
+        self.command_timeout = command_timeout  # None: adapt to the measured line latency
+        self.retry_policies = {
+            'control': RetryPolicy(attempts=3, deadline=0.3),
+            'query': RetryPolicy(attempts=3, deadline=0.6)
+        }
+        self.circuit_breaker = CircuitBreaker()
+        self.metadata_cache = MetadataCache()
+        self._last_status_codes = None
+        self.pipelining = True
+        self._pipeline_failures = 0
+        self.logger = logging.getLogger('AsyncWellerStation')
+        self.status_map = {
+            StationStatus.OFF: "OFF",
+            StationStatus.ON: "ON",
+            StationStatus.STANDBY: "STANDBY",
+            StationStatus.AUTOOFF: "AUTO-OFF"
+        }
+        self.temperature_history = {
+            'channel1': TemperatureRingBuffer(max_history),
+            'channel2': TemperatureRingBuffer(max_history)
+        }
+        self.connection_type = None
+        self.temp_limits = {'min': 50, 'max': 450}
+        self.web_config = web_config or WebConfig()
+        self.start_time = datetime.now()
+        self.poller = None
+        self.sampler = None  # The async poller records the history itself
+        self.response_cache = ResponseCache()
+        self.store = self.open_store(storage_config)
+
+    @classmethod
+    async def open(cls, port: str, baudrate=1200, **kwargs) -> 'AsyncWellerStation':
+        """Open port on the running event loop"""
+        transport = await AsyncSerialTransport.open(port, baudrate)
+        station = cls(transport, port=port, **kwargs)
+        station.port_identity = await asyncio.get_running_loop().run_in_executor(
+            None, WellerStation._port_identity, port
+        )
+        return station
+
+    async def close(self) -> None:
+        if self.poller:
+            self.poller.stop()
+        self._close_transport()
+        if self.store:
+            self.store.close()
+
+    @property
+    def is_connected(self) -> bool:
+        """True while the serial port is open"""
+        return self.transport.ser.is_open
+
+    async def disconnect(self) -> None:
+        """Close the port after the adapter was unplugged; commands fail fast until reconnect()"""
+        self._close_transport()
+
+    def _close_transport(self) -> None:
+        try:
+            self.transport.close()
+        except (serial.SerialException, OSError):
+            pass
+
+    async def reconnect(self, port: Optional[str] = None) -> None:
+        """Reopen the port (optionally under a new device name) and restore the remote mode.
+
+        History, statistics and the poller carry on; the poller is asked to
+        refresh at once so the first fresh snapshot follows immediately.
+        """
+        port = port or self.port
+        transport = await AsyncSerialTransport.open(port, self.baudrate)
+        self._close_transport()
+        self.transport = transport
+        self.port = port
+        self.circuit_breaker.reset()
+        self.metadata_cache.clear()  # The adapter may now lead to a different station
+        if self.remote_mode != RemoteMode.DISABLED:
+            await self.set_remote_mode(self.remote_mode)
+        else:
+            # Any verified reply proves the station is back
+            await self.query(b"?")
+        if self.poller:
+            self.poller.request_refresh(metadata=True)
+
+    async def query(self, command: bytes, timeout: Optional[float] = None) -> bytes:
+        """Send a query and await its raw, checksum-verified reply frame"""
+        return await self._send(command, True, timeout)
+
+    async def send_command(self, command: bytes, expect_response=True, timeout: Optional[float] = None) -> Optional[str]:
+        """Send a command and await its checksum-verified response"""
+        frame = await self._send(command, expect_response, timeout)
+        return frame.decode('latin-1') if frame is not None else None
+
+    async def _send(self, command: bytes, expect_response: bool, timeout: Optional[float]) -> Optional[bytes]:
+        expected = WellerCommand.expected_response(command) if expect_response else None
+        if expect_response and expected is None:
+            raise WellerError(f"Unknown response format for {command!r}")
+        prefix, length = expected or (None, 0)
+        return await self._with_retries(
+            expect_response,
+            lambda deadline: self.transport.transact(command, prefix, length, timeout or self.command_timeout, deadline)
+        )
+
+    async def read_batch(self, commands: List[bytes], timeout: Optional[float] = None) -> Dict[bytes, bytes]:
+        """Send several query commands back to back and return {command: raw reply frame}"""
+        expected = {}
+        for command in commands:
+            reply = WellerCommand.expected_response(command)
+            if reply is None:
+                raise WellerError(f"Cannot pipeline {command!r}: no known reply")
+            expected[reply[0]] = reply[1]
+        frames = await self._with_retries(
+            True,
+            lambda deadline: self.transport.transact_batch(
+                b''.join(commands), expected, timeout or self.command_timeout, deadline
+            ),
+            extension=self.transport.reply_timeout.line_time(batch_length(commands))
+        )
+        return {command: frames[WellerCommand.expected_response(command)[0]] for command in commands}
+
+    async def _with_retries(self, expect_response: bool, attempt, extension: float = 0.0):
+        """Await attempt(deadline) until it succeeds, following the retry policy and circuit breaker"""
+        # Only a verified reply can probe an offline station; blind writes are rejected
+        if not (self.circuit_breaker.allow() if expect_response else not self.circuit_breaker.is_open):
+            raise StationOfflineError(f"Station on {self.port} is offline")
+
+        last_error = None
+        for delay, deadline in self.retry_policies['query' if expect_response else 'control'].schedule(extension):
+            if delay:
+                await asyncio.sleep(delay)
+            try:
+                result = await attempt(deadline)
+            except WellerError as e:
+                last_error = e
+                self.logger.debug(f"Attempt failed: {e}")
+                continue
+            if expect_response:
+                self.circuit_breaker.record_success()
+            return result
+
+        self.circuit_breaker.record_failure()
+        raise last_error
+
+    async def enable_remote(self):
+        await self.set_remote_mode(RemoteMode.ENABLED)
+
+    async def disable_remote(self):
+        await self.set_remote_mode(RemoteMode.DISABLED)
+
+    async def set_remote_mode(self, mode: RemoteMode) -> None:
+        response = await self.send_command(WellerCommand.REMOTE_FRAMES[mode], expect_response=mode != RemoteMode.DISABLED)
+        if mode != RemoteMode.DISABLED and not response.startswith('?1'):
+            raise WellerError("Invalid response for remote mode setting")
+        self.remote_mode = mode
+
+    async def _cached_query(self, key: str, command: bytes, parse):
+        """Query through the metadata cache"""
+        value = self.metadata_cache.get(key)
+        if value is None:
+            value = self.metadata_cache.put(key, parse(await self.query(command)))
+        return value
+
+    async def read_status(self):
+        status = WellerResponse.decode_status(await self.query(b"Q"))
+        self._check_status_change(status)
+        return status
+
+    async def read_temperature(self) -> Dict[str, float]:
+        return WellerResponse.decode_channel_pair(await self.query(b"R"))
+
+    async def read_set_temperature(self):
+        return WellerResponse.decode_channel_pair(await self.query(b"S"))
+
+    async def read_preset_temperature1(self):
+        return await self._cached_query('preset1', b"T", WellerResponse.decode_channel_pair)
+
+    async def read_preset_temperature2(self):
+        return await self._cached_query('preset2', b"U", WellerResponse.decode_channel_pair)
+
+    async def read_tool_type(self):
+        return await self._cached_query('tools', b"Y", WellerResponse.decode_tool_names)
+
+    async def read_unit_id(self):
+        return await self._cached_query('unit_id', b"?", lambda frame: WellerResponse.parse_unit_id(frame.decode('latin-1')))
+
+    async def read_firmware_version(self):
+        return await self._cached_query(
+            'firmware', b"V", lambda frame: WellerResponse.parse_firmware_version(frame.decode('latin-1'))
+        )
+
+    async def get_preset_temperatures(self):
+        preset1 = await self.read_preset_temperature1() or {'channel1': None, 'channel2': None}
+        preset2 = await self.read_preset_temperature2() or {'channel1': None, 'channel2': None}
+        return {
+            channel: {'preset1': preset1[channel], 'preset2': preset2[channel]}
+            for channel in ('channel1', 'channel2')
+        }
+
+    async def read_all_status(self):
+        """Read status, temperatures and tools of both channels in one pipelined burst"""
+        commands = [b"Q", b"R"]
+        if self.metadata_cache.get('tools') is None:
+            commands.append(b"Y")
+        if self.pipelining:
+            try:
+                responses = await self.read_batch(commands)
+                self._pipeline_failures = 0
+            except StationOfflineError:
+                raise
+            except WellerError as e:
+                responses = {command: await self.query(command) for command in commands}
+                self._pipeline_failed(e)
+        else:
+            responses = {command: await self.query(command) for command in commands}
+
+        status = WellerResponse.decode_status(responses[b"Q"])
+        self._check_status_change(status)
+        temps = WellerResponse.decode_channel_pair(responses[b"R"])
+        if b"Y" in responses:
+            self.metadata_cache.put('tools', WellerResponse.decode_tool_names(responses[b"Y"]))
+        tools = await self.read_tool_type()
+        if all([status, temps, tools]):
+            return {
+                channel: {
+                    'status': self.get_status_string(status[channel]),
+                    'temperature': temps[channel],
+                    'tool': tools[channel]
+                } for channel in ('channel1', 'channel2')
+            }
+        return None
+
+    async def set_temperature(self, channel: int, temp: float) -> None:
+        await self.send_command(WellerCommand.temp_frame(b's', channel, temp), expect_response=False)
+
+    async def set_status(self, ch1_status, ch2_status):
+        await self.send_command(WellerCommand.status_frame(ch1_status, ch2_status), expect_response=False)
+
+    async def set_channel_mode(self, channel, mode):
+        if not isinstance(mode, StationStatus):
+            raise ValueError("Mode must be a StationStatus enum value")
+        current_status = await self.read_status()
+        if current_status:
+            if channel == 1:
+                await self.set_status(mode.value, current_status['channel2'])
+            else:
+                await self.set_status(current_status['channel1'], mode.value)
+
+    async def set_preset_temperature1(self, channel, temp):
+        await self.send_command(WellerCommand.temp_frame(b't', channel, temp), expect_response=False)
+        self.metadata_cache.invalidate('preset1')
+
+    async def set_preset_temperature2(self, channel, temp):
+        await self.send_command(WellerCommand.temp_frame(b'u', channel, temp), expect_response=False)
+        self.metadata_cache.invalidate('preset2')
+
+    async def fingerswitch_action(self, channel, seconds):
+        await self.send_command(WellerCommand.frame(b'x', channel, int(seconds)), expect_response=False)
+
+    def start_poller(self) -> AsyncStationPoller:
+        """Start the poller task; call from the event loop"""
+        if self.poller is None:
+            self.poller = AsyncStationPoller(
+                self,
+                poll_interval=self.web_config.poll_interval,
+                metadata_interval=self.web_config.metadata_interval
+            )
+        self.poller.start()
+        return self.poller
+
+    def get_snapshot(self) -> Dict:
+        if self.poller is None:
+            self.start_poller()
+        return self.poller.get_snapshot()
+
+    def create_web_app(self) -> 'web.Application':
+        """Create the aiohttp app serving this station"""
+        app = create_async_app(self.web_config)
+        self.add_web_routes(app)
+        return app
+
+    def add_web_routes(self, app: 'web.Application', prefix: str = '') -> None:
+        """Register the dashboard and API routes (same URLs and payloads as the Flask app) under prefix"""
+        def send(reply) -> 'web.Response':
+            status, headers, body = reply
+            return web.Response(body=body, status=status, headers=headers)
+
+        async def run(build, *args) -> 'web.Response':
+            try:
+                action = build(*args)
+                await action.call(*action.args)
+                return send(self.complete_web_action(action))
+            except Exception as e:
+                self.logger.error(f"Control request failed: {str(e)}")
+                return send(error_reply(e))
+
+        def path_int(request, name):
+            return int(request.match_info[name])
+
+        async def home(request):
+            return send(self.web_home(request.headers))
+
+        async def api_bootstrap(request):
+            return send(self.web_bootstrap())
+
+        async def api_status(request):
+            return send(self.web_status(request.query, request.headers))
+
+        async def api_stream(request):
+            self.get_snapshot()
+            poller = self.poller
+            seq = last_event_id(request.headers)
+            response = web.StreamResponse(headers=STREAM_HEADERS)
+            await response.prepare(request)
+            try:
+                await response.write(STREAM_RETRY)
+                while True:
+                    chunk, seq = stream_chunk(await poller.wait_for_event(seq, timeout=15.0), seq)
+                    await response.write(chunk)
+            except ConnectionResetError:
+                pass
+            return response
+
+        async def api_temperature_history(request):
+            return send(self.web_temperature_history(request.match_info['channel'], request.query, request.headers))
+
+        async def api_export(request):
+            status, headers, chunks = self.web_export(request.query, request.headers)
+            if status != 200:
+                return send((status, headers, chunks))
+            response = web.StreamResponse(headers=headers)
+            await response.prepare(request)
+            # Chunks are read from disk and compressed off the event loop
+            loop = asyncio.get_running_loop()
+            while True:
+                chunk = await loop.run_in_executor(None, next, chunks, None)
+                if chunk is None:
+                    break
+                await response.write(chunk)
+            await response.write_eof()
+            return response
+
+        async def set_temperature_handler(request):
+            return await run(self.web_set_temperature, path_int(request, 'channel'), float(request.match_info['temp']))
+
+        async def set_mode_handler(request):
+            return await run(self.web_set_mode, path_int(request, 'channel'), request.match_info['mode'])
+
+        async def set_preset(request):
+            return await run(self.web_set_preset, path_int(request, 'channel'), path_int(request, 'preset'),
+                             float(request.match_info['temp']))
+
+        async def activate_preset(request):
+            return await run(self.web_activate_preset, path_int(request, 'channel'), path_int(request, 'preset'))
+
+        async def trigger_fingerswitch(request):
+            return await run(self.web_fingerswitch, path_int(request, 'channel'), path_int(request, 'seconds'))
+
+        async def set_remote_mode(request):
+            return await run(self.web_remote_mode, path_int(request, 'mode'))
+
+        async def api_tool_info(request):
+            return send(self.web_tool_info(path_int(request, 'channel')))
+
+        async def api_connection_details(request):
+            return send(self.web_connection_details())
+
+        number = r'{%s:\d+(?:\.\d+)?}'
+        router = app.router
+        router.add_get(prefix + '/', home)
+        router.add_get(prefix + '/api/bootstrap', api_bootstrap)
+        router.add_get(prefix + '/api/status', api_status)
+        router.add_get(prefix + '/api/stream', api_stream)
+        router.add_get(prefix + r'/api/temperature_history/{channel}', api_temperature_history)
+        router.add_get(prefix + '/api/export', api_export)
+        router.add_post(prefix + r'/api/set_temperature/{channel:\d+}/' + number % 'temp', set_temperature_handler)
+        router.add_post(prefix + r'/api/set_mode/{channel:\d+}/{mode}', set_mode_handler)
+        router.add_post(prefix + r'/api/set_preset/{channel:\d+}/{preset:\d+}/' + number % 'temp', set_preset)
+        router.add_post(prefix + r'/api/activate_preset/{channel:\d+}/{preset:\d+}', activate_preset)
+        router.add_post(prefix + r'/api/fingerswitch/{channel:\d+}/{seconds:\d+}', trigger_fingerswitch)
+        router.add_post(prefix + r'/api/remote_mode/{mode:\d+}', set_remote_mode)
+        router.add_get(prefix + r'/api/tool_info/{channel:\d+}', api_tool_info)
+        router.add_get(prefix + '/api/connection_details', api_connection_details)
+
+@lru_cache(maxsize=None)
+def dashboard_page() -> EncodedResponse:
+    """Dashboard shell, rendered once; the page loads station data from /api/bootstrap"""
+    html = jinja2.Environment(autoescape=True).from_string(html_template).render(channels=(1, 2))
+    return EncodedResponse(html.encode('utf-8'), 'text/html; charset=utf-8')
+
+def create_async_app(web_config: WebConfig) -> 'web.Application':
+    """Empty aiohttp app, protected with basic auth if credentials are configured"""
+    if web is None:
+        raise WellerError("The asyncio web front end requires aiohttp (pip install aiohttp)")
+
+    middlewares = []
+    if web_config.username and web_config.password:
+        expected = 'Basic ' + base64.b64encode(f"{web_config.username}:{web_config.password}".encode()).decode()
+
+        @web.middleware
+        async def basic_auth(request, handler):
+            if not hmac.compare_digest(request.headers.get('Authorization', ''), expected):
+                return web.Response(status=401, headers={'WWW-Authenticate': 'Basic realm=""'})
+            return await handler(request)
+
+        middlewares.append(basic_auth)
+    return web.Application(middlewares=middlewares)
+
+class AsyncStationManager:
+    """Drive many stations from a single event loop and serve them from one aiohttp app.
+
+    The asyncio counterpart of StationManager: same station ids, URL layout
+    (/stations/<station_id>/...) and /api/fleet/status payload, but no
+    thread per port, poller or request.
+    """
+    station_id_for = staticmethod(StationManager.station_id_for)
+    fleet_status = StationManager.fleet_status
+
+    def __init__(self, web_config=None, storage_config=None, **station_kwargs):
+        self.web_config = web_config or WebConfig()
+        self.storage_config = storage_config
+        self.station_kwargs = station_kwargs
+        self.stations = {}
+        self.errors = {}
+        self.supervisor = AsyncPortSupervisor()  # Reconnects unplugged stations
+        self.logger = logging.getLogger('AsyncStationManager')
+        self._runner = None
+
+    async def open_station(self, port: str, enable_remote=True) -> AsyncWellerStation:
+        station_id = self.station_id_for(port)
+        storage_config = None
+        if self.storage_config:
+            storage_config = StorageConfig(
+                os.path.join(self.storage_config.directory, station_id),
+                segment_seconds=self.storage_config.segment_seconds,
+                retention_days=self.storage_config.retention_days
+            )
+        station = await AsyncWellerStation.open(
+            port, web_config=self.web_config, storage_config=storage_config, **self.station_kwargs
+        )
+        if enable_remote:
+            try:
+                await station.enable_remote()
+            except WellerError:
+                await station.close()
+                raise
+        self.stations[station_id] = station
+        self.errors.pop(station_id, None)
+        station.start_poller()
+        self.supervisor.watch(station)
+        self.supervisor.start()
+        return station
+
+    async def open_stations(self, ports: Optional[List[str]] = None, enable_remote=True) -> Dict[str, AsyncWellerStation]:
+        """Open all given (or discovered) ports concurrently; failures are recorded in self.errors"""
+        if ports is None:
+            ports = WellerStation.find_weller_ports()
+        ports = [port for port in ports if self.station_id_for(port) not in self.stations]
+        results = await asyncio.gather(*(self.open_station(port, enable_remote) for port in ports),
+                                       return_exceptions=True)
+        for port, result in zip(ports, results):
+            if isinstance(result, Exception):
+                self.errors[self.station_id_for(port)] = str(result)
+                self.logger.error(f"Failed to open station on {port}: {result}")
+            else:
+                self.logger.info(f"Opened station on {port}")
+        return dict(self.stations)
+
+    async def remove_station(self, station_id: str) -> None:
+        station = self.stations.pop(station_id, None)
+        if station:
+            self.supervisor.unwatch(station)
+            await station.close()
+
+    async def close(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+        self.supervisor.stop()
+        for station_id in list(self.stations):
+            await self.remove_station(station_id)
+
+    def create_web_app(self) -> 'web.Application':
+        app = create_async_app(self.web_config)
+        for station_id, station in self.stations.items():
+            station.add_web_routes(app, prefix=f'/stations/{station_id}')
+
+        async def fleet_home(request):
+            rows = ''.join(
+                f'<li><a href="{info["url"]}">{station_id}</a> ({info["port"]}): '
+                f'{"Connected" if info["connected"] else "Disconnected"}</li>'
+                for station_id, info in self.fleet_status()['stations'].items()
+            )
+            return web.Response(
+                text=f'<!DOCTYPE html><html><head><title>Weller Fleet</title></head>'
+                     f'<body><h1>Weller Stations</h1><ul>{rows}</ul></body></html>',
+                content_type='text/html'
+            )
+
+        async def api_fleet_status(request):
+            try:
+                return web.json_response({'success': True, **self.fleet_status()})
+            except Exception as e:
+                return web.json_response({'success': False, 'error': str(e)}, status=500)
+
+        app.router.add_get('/', fleet_home)
+        app.router.add_get('/api/fleet/status', api_fleet_status)
+        return app
+
+    async def start_web_interface(self, host='0.0.0.0') -> None:
+        """Serve all stations on web_config.port from the running event loop"""
+        self._runner = web.AppRunner(self.create_web_app())
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, self.web_config.port).start()
+
+async def run_async_fleet(ports: Optional[List[str]] = None, web_config=None, storage_config=None) -> None:
+    """Open stations and serve them until cancelled"""
+    manager = AsyncStationManager(web_config=web_config, storage_config=storage_config)
+    try:
+        stations = await manager.open_stations(ports)
+        for station_id, error in manager.errors.items():
+            print(f"{station_id}: {error}")
+        if not stations:
+            raise WellerError("No Weller stations found")
+        await manager.start_web_interface()
+        print(f"Serving {len(stations)} station(s) at http://localhost:{manager.web_config.port}")
+        await asyncio.Event().wait()
+    finally:
+        for station in manager.stations.values():
+            try:
+                await station.disable_remote()
+            except WellerError:
+                pass
+        await manager.close()
+
+def show_menu():
+    """Display the main menu"""
+    print("\n=== Weller Station Control ===")
+    print("1. Start Monitor Mode")
+    print("2. Start Enhanced Monitor Mode")
+    print("3. Set Temperature")
+    print("4. Set Channel Mode (ON/OFF/STANDBY)")
+    print("5. Save Temperature Profile")
+    print("6. Load Temperature Profile")
+    print("7. Configure Web Interface")
+    print("8. Start Web Interface")
+    print("9. Export Temperature Log")
+    print("10. Exit")
+    return input("Select option (1-10): ")
+
+def handle_set_temperature(station):
+    """Handle temperature setting menu"""
+    channel = input("Enter channel (1/2): ")
+    if channel not in ['1', '2']:
+        print("Invalid channel")
+        return
+    
+    try:
+        temp = float(input("Enter temperature (50-450°C): "))
+        station.set_temperature(int(channel), temp)
+        print(f"Temperature for channel {channel} set to {temp}°C")
+    except ValueError:
+        print("Invalid temperature value")
+
+def handle_set_mode(station):
+    """Handle mode setting menu"""
+    print("\nAvailable modes:")
+    for mode in StationStatus:
+        print(f"{mode.value}: {mode.name}")
+    
+    channel = input("Enter channel (1/2): ")
+    if channel not in ['1', '2']:
+        print("Invalid channel")
+        return
+    
+    try:
+        mode = int(input("Enter mode number: "))
+        station.set_channel_mode(int(channel), StationStatus(mode))
+        print(f"Channel {channel} mode set to {StationStatus(mode).name}")
+    except ValueError:
+        print("Invalid mode value")
+
+def configure_web_interface():
+    """Configure web interface settings"""
+    print("\n=== Web Interface Configuration ===")
+    port = input("Enter port number (default 5000): ") or "5000"
+    use_auth = input("Enable authentication? (y/n): ").lower() == 'y'
+    
+    username = None
+    password = None
+    if use_auth:
+        username = input("Enter username: ")
+        password = input("Enter password: ")
+    server = input(f"Web server ({'/'.join(WebConfig.SERVERS)}, default waitress): ") or "waitress"
+    
+    return WebConfig(int(port), username, password, server=server)
+
+# Lägg till en ny funktion i det globala scopet (utanför klasserna)
+def get_tool_info(tool_type):
+    """Helper function for getting tool information in templates"""
+    tool_info = {
+        'NOTOOL': {'max_temp': 0},
+        'WXP120': {'max_temp': 450},
+        'WXP200': {'max_temp': 450},
+        'WXMP': {'max_temp': 450},
+        'WXMT': {'max_temp': 450},
+        'WXP65': {'max_temp': 450},
+        'WXP80': {'max_temp': 450},
+        'WXB200': {'max_temp': 450}
+    }
+    return tool_info.get(str(tool_type), {'max_temp': 450})
+
+# Add new command validation class
+class WellerCommand:
+    """Command validator and builder for Weller protocol"""
+    COMMANDS = {
+        'read_unit_id': {'cmd': '?', 'response_len': 7},
+        'read_status': {'cmd': 'Q', 'response_len': 7},
+        'read_temperature': {'cmd': 'R', 'response_len': 14},
+        'read_set_temp': {'cmd': 'S', 'response_len': 14},
+        'read_preset1': {'cmd': 'T', 'response_len': 14},
+        'read_preset2': {'cmd': 'U', 'response_len': 14},
+        'read_firmware': {'cmd': 'V', 'response_len': 7},
+        'read_tool': {'cmd': 'Y', 'response_len': 14},
+    }
+
+    @staticmethod
+    def validate_response_length(cmd_type: str, response: str) -> bool:
+        """Validate response length for command type"""
+        if cmd_type not in WellerCommand.COMMANDS:
+            raise WellerError(f"Unknown command type: {cmd_type}")
+        expected_len = WellerCommand.COMMANDS[cmd_type]['response_len']
+        return len(response) >= expected_len
+
+    TEMP_COMMANDS = (b's', b't', b'u')
+    # Ready frames for the fixed commands; queries are sent as their single command byte
+    REMOTE_FRAMES = {mode: f"remote{mode.value}".encode() for mode in RemoteMode}
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def expected_response(command: bytes) -> Optional[tuple]:
+        """(prefix, length) of the station's reply to a raw command, or None if it does not reply (cached)"""
+        if command.startswith(b'remote'):
+            return None if command == b'remote0' else (b'?1', 7)
+        for info in WellerCommand.COMMANDS.values():
+            if command == info['cmd'].encode():
+                return info['cmd'].encode() + b'1', info['response_len']
+        return None
+
+    @staticmethod
+    def with_checksum(command: str) -> bytes:
+        """Append the modulo-256 checksum to a command"""
+        data = command.encode('latin-1')
+        return data + bytes([sum(data) % 256])
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def frame(cmd: bytes, channel: int, value: int) -> bytes:
+        """Checksummed 7-byte set command: cmd, channel digit, 4-digit value, checksum (cached)"""
+        if not 0 <= value <= 9999:
+            raise WellerError(f"Value out of range: {value}")
+        data = b'%s%d%04d' % (cmd, channel, value)
+        return data + bytes((sum(data) % 256,))
+
+    @staticmethod
+    def temp_frame(cmd: bytes, channel: int, temp: float) -> bytes:
+        """Validated set/preset temperature frame (cmd b's', b't' or b'u', temp in °C)"""
+        if cmd not in WellerCommand.TEMP_COMMANDS:
+            raise WellerError(f"Invalid temperature command: {cmd!r}")
+        if not (1 <= channel <= 2):
+            raise WellerError(f"Invalid channel: {channel}")
+        temp_int = TemperatureConverter.to_internal(temp)
+        if not (0 <= temp_int <= 9999):
+            raise WellerError(f"Temperature out of range: {temp}")
+        return WellerCommand.frame(cmd, channel, temp_int)
+
+    @staticmethod
+    def status_frame(ch1_status: int, ch2_status: int) -> bytes:
+        """Checksummed frame setting the status of both channels"""
+        return WellerCommand.frame(b'q', 1, int(ch1_status) * 1000 + int(ch2_status) * 100)
+
+    @staticmethod
+    def build_temp_command(cmd: str, channel: int, temp: float) -> str:
+        """Build temperature related command with validation"""
+        if cmd not in ['s', 't', 'u']:
+            raise WellerError(f"Invalid temperature command: {cmd}")
+        if not (1 <= channel <= 2):
+            raise WellerError(f"Invalid channel: {channel}")
+            
+        temp_int = TemperatureConverter.to_internal(temp)
+        if not (0 <= temp_int <= 9999):
+            raise WellerError(f"Temperature out of range: {temp}")
+            
+        command = f"{cmd}{channel}{temp_int:04d}"
+        return command
+
+# Add new response parser class
+class WellerResponse:
+    """Enhanced response parser for Weller protocol"""
+    @staticmethod
+    def build_frame(command: str, data1: str, data2: Optional[str] = None) -> bytes:
+        """Build a checksummed response frame, as sent by a station.
+
+        A 7-byte frame is '<cmd>1' + 4 data chars + checksum; a 14-byte frame
+        appends '<cmd>2' + 4 data chars + a checksum over everything before it.
+        Used by the station simulators and benchmarks.
+        """
+        frame = f"{command}1{data1}"
+        frame += chr(sum(frame.encode('latin-1')) % 256)
+        if data2 is not None:
+            frame += f"{command}2{data2}"
+            frame += chr(sum(frame.encode('latin-1')) % 256)
+        return frame.encode('latin-1')
+
+    TOOL_NAMES = {
+        '0': 'NOTOOL',
+        '1': 'WXP120',
+        '2': 'WXP200',
+        '3': 'WXMP',
+        '4': 'WXMT',
+        '5': 'WXP65',
+        '6': 'WXP80',
+        '7': 'WXB200'
+    }
+    UNIT_MODELS = {
+        '1': 'WX 1',
+        '2': 'WX 2',
+        '3': 'WX 2D',
+        '4': 'WX 2A',
+        '5': 'WX 1D',
+        '6': 'WX 1A'
+    }
+
+    TOOL_NAMES_BY_CODE = dict(zip(map(int, TOOL_NAMES), TOOL_NAMES.values()))
+
+    # A frame unpacked into its byte values: one tuple of small ints, no slices or strings
+    _FRAME7 = struct.Struct('7B')
+    _FRAME14 = struct.Struct('14B')
+    _DIGIT_OFFSET = 1111 * 48  # The '0' offsets of a 4-digit field
+
+    @staticmethod
+    def decode_fields(frame: Union[bytes, memoryview], digits: int = 4) -> tuple:
+        """Decode a raw 7- or 14-byte reply into its 4-digit fields as ints.
+
+        Returns (field1, field2), field2 None for a 7-byte frame. The block
+        checksums and digits are checked on the byte values directly, so no
+        slices or strings are created. digits is how many leading positions
+        of each field the caller uses: only those are checked and decoded,
+        the rest read as 0 (Q and Y replies may pad them with other
+        characters). Raises WellerError on a bad frame.
+        """
+        length = len(frame)
+        if length == 14:
+            c0, c1, a0, a1, a2, a3, k1, c2, c3, b0, b1, b2, b3, k2 = WellerResponse._FRAME14.unpack(frame)
+        elif length == 7:
+            c0, c1, a0, a1, a2, a3, k1 = WellerResponse._FRAME7.unpack(frame)
+        else:
+            raise WellerError(f"Invalid frame length: {length}")
+
+        total = c0 + c1 + a0 + a1 + a2 + a3
+        if total % 256 != k1:
+            raise WellerError("Checksum validation failed")
+        if digits == 4:
+            if not (47 < a0 < 58 and 47 < a1 < 58 and 47 < a2 < 58 and 47 < a3 < 58):
+                raise WellerError("Invalid digits in response")
+            field1 = a0 * 1000 + a1 * 100 + a2 * 10 + a3 - WellerResponse._DIGIT_OFFSET
+        else:
+            field1 = WellerResponse._leading_digits((a0, a1, a2, a3), digits)
+        if length == 7:
+            return field1, None
+
+        # The second checksum covers everything before it, including the first block
+        if (total + k1 + c2 + c3 + b0 + b1 + b2 + b3) % 256 != k2:
+            raise WellerError("Checksum validation failed")
+        if digits == 4:
+            if not (47 < b0 < 58 and 47 < b1 < 58 and 47 < b2 < 58 and 47 < b3 < 58):
+                raise WellerError("Invalid digits in response")
+            return field1, b0 * 1000 + b1 * 100 + b2 * 10 + b3 - WellerResponse._DIGIT_OFFSET
+        return field1, WellerResponse._leading_digits((b0, b1, b2, b3), digits)
+
+    @staticmethod
+    def _leading_digits(field: tuple, digits: int) -> int:
+        """4-digit field value from its first digits byte values, the others taken as 0"""
+        value = 0
+        for byte in field[:digits]:
+            if not 47 < byte < 58:
+                raise WellerError("Invalid digits in response")
+            value = value * 10 + byte - 48
+        return value * 10 ** (4 - digits)
+
+    @staticmethod
+    def decode_channel_pair(frame: Union[bytes, memoryview]) -> Dict[str, float]:
+        """Decode a raw R/S/T/U frame into per-channel temperatures"""
+        field1, field2 = WellerResponse.decode_fields(frame)
+        if field2 is None:
+            raise WellerError("Invalid temperature response length")
+        return {'channel1': field1 / 10.0, 'channel2': field2 / 10.0}
+
+    @staticmethod
+    def decode_status(frame: Union[bytes, memoryview]) -> Dict[str, int]:
+        """Decode a raw Q frame into per-channel status codes"""
+        field1 = WellerResponse.decode_fields(frame, digits=2)[0]
+        return {'channel1': field1 // 1000, 'channel2': field1 // 100 % 10}
+
+    @staticmethod
+    def decode_tool_names(frame: Union[bytes, memoryview]) -> Dict[str, str]:
+        """Decode a raw Y frame into per-channel ToolType names"""
+        field1, field2 = WellerResponse.decode_fields(frame, digits=1)
+        if field2 is None:
+            raise WellerError("Invalid tool response length")
+        names = WellerResponse.TOOL_NAMES_BY_CODE
+        return {'channel1': names.get(field1 // 1000, 'Unknown'), 'channel2': names.get(field2 // 1000, 'Unknown')}
+
+    @staticmethod
+    def parse_status_response(response: str) -> Optional[Dict[str, int]]:
+        """Parse a Q response into per-channel status codes"""
+        if len(response) >= 7:
+            return {'channel1': int(response[2]), 'channel2': int(response[3])}
+        return None
+
+    @staticmethod
+    def parse_channel_pair(response: str) -> Optional[Dict[str, float]]:
+        """Parse an S/T/U response into per-channel temperatures"""
+        if len(response) >= 14:
+            return {'channel1': float(response[2:6]) / 10.0, 'channel2': float(response[9:13]) / 10.0}
+        return None
+
+    @staticmethod
+    def parse_tool_names(response: str) -> Optional[Dict[str, str]]:
+        """Parse a Y response into per-channel ToolType names"""
+        if len(response) >= 14:
+            return {
+                'channel1': WellerResponse.TOOL_NAMES.get(response[2], 'Unknown'),
+                'channel2': WellerResponse.TOOL_NAMES.get(response[9], 'Unknown')
+            }
+        return None
+
+    @staticmethod
+    def parse_unit_id(response: str) -> Optional[str]:
+        """Parse a ? response into the station model name"""
+        if len(response) >= 3:
+            return WellerResponse.UNIT_MODELS.get(response[2], 'Unknown')
+        return None
+
+    @staticmethod
+    def parse_firmware_version(response: str) -> Optional[str]:
+        """Parse a V response into the firmware version string"""
+        if len(response) >= 6:
+            return response[2:6]
+        return None
+
+    @staticmethod
+    def parse_temperature_response(response: str) -> Dict[str, float]:
+        """Parse temperature response with validation"""
+        if len(response) < 14:
+            raise WellerError("Invalid temperature response length")
+            
+        try:
+            temps = {
+                'channel1': float(response[2:6]) / 10.0,
+                'channel2': float(response[9:13]) / 10.0
+            }
+            return temps
+        except ValueError as e:
+            raise WellerError(f"Invalid temperature format: {e}")
+
+    @staticmethod
+    def parse_tool_response(response: str) -> Dict[str, str]:
+        """Parse tool type response with validation"""
+        if len(response) < 14:
+            raise WellerError("Invalid tool response length")
+            
+        try:
+            tools = {
+                'channel1': int(response[2]),
+                'channel2': int(response[9])
+            }
+            return tools
+        except ValueError as e:
+            raise WellerError(f"Invalid tool type format: {e}")
+
+# Example usage:
+if __name__ == "__main__":
+    supervisor = None
+    try:
+        print("=== Weller Station Control ===")
+        print("1. Connect to real station")
+        print("2. Start demo mode")
+        print("3. Fleet mode (all connected stations)")
+        print("4. Async fleet mode (single event loop, requires aiohttp)")
+        mode = input("Select mode (1/2/3/4): ")
+
+        if mode == "4":
+            asyncio.run(run_async_fleet(web_config=configure_web_interface()))
+
+        elif mode == "3":
+            manager = StationManager(web_config=configure_web_interface())
+            stations = manager.open_stations()
+            for station_id, error in manager.errors.items():
+                print(f"{station_id}: {error}")
+            if not stations:
+                raise WellerError("No Weller stations found")
+            manager.start_web_interface()
+            print(f"Serving {len(stations)} station(s) at http://localhost:{manager.web_config.port}")
+            try:
+                while True:
+                    time.sleep(1)
+            finally:
+                for station in stations.values():
+                    try:
+                        station.disable_remote()
+                    except WellerError:
+                        pass
+                manager.close()
+
+        else:
+            if mode == "1":
+                # List available ports
+                print("\nAvailable COM ports:")
+                ports = WellerStation.list_available_ports()
+                for port in ports:
+                    print(f"{port['port']}: {port['description']}")
+            
+                station = WellerStation(log_file="weller_station.log")
+                # Reopen the station automatically if the adapter is unplugged and plugged back in
+                supervisor = PortSupervisor()
+                supervisor.watch(station)
+                supervisor.start()
+            else:
+                print("\nStarting demo mode...")
+                station = DemoWellerStation()
+
+            # Enable remote control
+            if isinstance(station, WellerStation):
+                station.enable_remote()
+
+            web_config = None
+
+            while True:
+                choice = show_menu()
+            
+                if choice == "1":
+                    station.monitor_status()
+                elif choice == "2":
+                    station.enhanced_monitor()
+                elif choice == "3":
+                    handle_set_temperature(station)
+                elif choice == "4":
+                    handle_set_mode(station)
+                elif choice == "5":
+                    name = input("Enter profile name: ")
+                    station.save_temperature_profile(name)
+                elif choice == "6":
+                    name = input("Enter profile name: ")
+                    station.load_temperature_profile(name)
+                elif choice == "7":
+                    web_config = configure_web_interface()
+                    station.web_config = web_config
+                elif choice == "8":
+                    if web_config is None:
+                        web_config = configure_web_interface()
+                        station.web_config = web_config
+                    station.start_web_interface()
+                    print(f"Web interface started at http://localhost:{web_config.port}")
+                elif choice == "9":
+                    filename = f"temp_log_{datetime.now().strftime('%Y%m%d_%H%M')}.csv"
+                    station.export_temperature_log(filename)
+                    print(f"Log exported to {filename}")
+                elif choice == "10":
+                    break
+                else:
+                    print("Invalid option")
+
+    except WellerError as e:
+        print(f"Error: {e}")
+    except KeyboardInterrupt:
+        print("\nProgram terminated by user")
+    finally:
+        if supervisor:
+            supervisor.stop()  # Before closing, so the station is not reopened
+        try:
+            if isinstance(station, WellerStation):
+                station.disable_remote()
+                station.close()
+        except:
+            pass